@@ -9,7 +9,7 @@ and CQ1 (file split) it now re-exports from:
     executor.py — RemoteExecutor, _AutoUpdateHostKeyPolicy
     parsers.py  — _collect_*, parse_graidctl_json, _extract_raid_from_cmd_dir
     monitor.py  — giostat watchdog
-    manager.py  — BenchmarkManager + benchmark_manager singleton
+    manager.py  — BenchmarkManager, Fleet + fleet / benchmark_manager singletons
 
 fastapi_app.py imports from `app`; this shim preserves those names so
 the FastAPI side does not need to change. New code should import from
@@ -25,20 +25,25 @@ from config import (
     LOGS_DIR,
     REMOTE_BASE_DIR,
     RESULTS_DIR,
+    RESUMABLE_FILE,
+    SAFE_NAME_RE,
     SCRIPT_DIR,
     SENSITIVE_CONFIG_KEYS,
     WORKLOAD_MAP,
     _NoopEmitter,
     audit_event,
     audit_logger,
+    clean_name,
     generate_run_id,
     logger,
+    results_relative_path,
     socketio,
     strip_ansi,
 )
 from state import (
     BenchmarkState,
     ConfigManager,
+    ResumableRuns,
     public_config,
     sanitize_config,
 )
@@ -61,8 +66,11 @@ from monitor import (
 )
 from manager import (
     BenchmarkManager,
+    Fleet,
     benchmark_manager,
+    fleet,
     is_remote_benchmark_alive,
+    partial_results_left,
 )
 
 # `json` is referenced via `app.json` by tests/test_state.py to swap
@@ -0,0 +1,279 @@
+"""Persistent, incrementally refreshed catalog of result entries.
+
+list_result_entries used to walk every result folder (`rglob("*.csv")`)
+and stat each entry twice on every /api/results call. ResultsCatalog keeps
+one record per top-level entry of RESULTS_DIR in CACHE_DIR/catalog.json and
+only re-describes an entry when its signature changes:
+
+    archives — (size, mtime_ns) of the file
+    folders  — mtime_ns of the folder and of its direct children, which
+               moves whenever a stage/device subtree is added or replaced
+
+Changes deeper in a tree than that are picked up through invalidate(),
+which the results watcher calls for the affected top-level name.
+
+Runs still in progress (or interrupted) live in the hidden staging area,
+RESULTS_DIR/.test-temp-data/[<staging key>/]<NVME_INFO>-result, which cell
+sync fills as cells finish. Each such dir is listed as a "partial" entry
+named PARTIAL_PREFIX + its path below the staging area with "/" replaced by
+"~", so the name still fits the single-segment /api/results/{name} routes;
+partial_result_path() maps it back.
+
+The expensive part (parsing CSVs for RAID types / model / row count) is
+injected as `describe(name, path) -> dict | None` so this module stays free
+of the FastAPI helpers; returning None drops the entry from the listing.
+
+Once start() is called, refreshes run on a background thread — at startup
+and after every invalidate() — and query() serves the last catalog built
+(the one in catalog.json on a restart) instead of describing entries inline.
+`building` tells callers a newer listing is on its way; refresh() still
+brings the catalog up to date synchronously when a caller needs that.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+
+from config import logger
+
+ARCHIVE_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".json")
+SORT_FIELDS = ("created", "name", "size", "row_count", "type")
+CATALOG_VERSION = 3
+STAGING_DIR_NAME = ".test-temp-data"
+PARTIAL_PREFIX = "in-progress~"
+
+
+def partial_result_name(rel_path):
+    """Catalog name of the staging dir that holds `rel_path` (relative to
+    RESULTS_DIR), or None when it is not under the staging area."""
+    parts = rel_path.split("/")
+    if parts[0] != STAGING_DIR_NAME:
+        return None
+    if len(parts) > 1 and parts[1].endswith("-result"):
+        return PARTIAL_PREFIX + parts[1]
+    if len(parts) > 2 and parts[2].endswith("-result"):
+        return PARTIAL_PREFIX + "~".join(parts[1:3])
+    return None
+
+
+def partial_result_path(root, name):
+    """Staging dir a partial entry name stands for, or None."""
+    if not name.startswith(PARTIAL_PREFIX):
+        return None
+    parts = name[len(PARTIAL_PREFIX):].split("~")
+    if len(parts) > 2 or any(part in ("", ".", "..") or "/" in part for part in parts):
+        return None
+    return root.joinpath(STAGING_DIR_NAME, *parts)
+
+
+def partial_result_dirs(root):
+    """Yield (name, path) for every staging dir under `root`: the legacy
+    single-DUT layout and one level down under a DUT staging key."""
+    staging = root / STAGING_DIR_NAME
+    try:
+        children = sorted(staging.iterdir())
+    except OSError:
+        return
+    for child in children:
+        if not child.is_dir():
+            continue
+        if child.name.endswith("-result"):
+            yield PARTIAL_PREFIX + child.name, child
+            continue
+        try:
+            inner = sorted(child.iterdir())
+        except OSError:
+            continue
+        for path in inner:
+            if path.is_dir() and path.name.endswith("-result"):
+                yield f"{PARTIAL_PREFIX}{child.name}~{path.name}", path
+
+
+class ResultsCatalog:
+    def __init__(self, root, store_path, describe):
+        self.root = root
+        self.store_path = store_path
+        self._describe = describe
+        self._lock = threading.Lock()
+        # Serializes refresh() so concurrent listings do not describe the
+        # same changed entry twice.
+        self._refresh_lock = threading.Lock()
+        # name -> {"signature": [...], "entry": {...} | None}
+        self._records = self._load()
+        self._stale = set()
+        # Background refresh (start()); _wake is set while one is pending.
+        self._wake = threading.Event()
+        self._worker = None
+        self._stopping = False
+
+    def _load(self):
+        try:
+            data = json.loads(self.store_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != CATALOG_VERSION:
+            return {}
+        return data.get("records", {})
+
+    def _save(self):
+        tmp_path = self.store_path.with_name(self.store_path.name + ".tmp")
+        try:
+            tmp_path.write_text(json.dumps({"version": CATALOG_VERSION, "records": self._records}))
+            os.replace(tmp_path, self.store_path)
+        except OSError as exc:
+            logger.warning("results catalog save failed: %s", exc)
+
+    @staticmethod
+    def _signature(path, stat):
+        if not os.path.isdir(path):
+            return ["file", stat.st_size, stat.st_mtime_ns]
+        children = []
+        try:
+            with os.scandir(path) as it:
+                for child in it:
+                    try:
+                        children.append(child.stat().st_mtime_ns)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return ["dir", stat.st_mtime_ns, len(children), max(children, default=0)]
+
+    def invalidate(self, name=None):
+        """Force `name` (or every entry) to be re-described on next refresh,
+        which the background thread (if started) runs right away."""
+        with self._lock:
+            if name is None:
+                self._stale.update(self._records)
+            else:
+                self._stale.add(name)
+        self._wake.set()
+
+    def start(self):
+        """Build the catalog on a background thread now and after every
+        invalidate()."""
+        with self._lock:
+            if self._worker is not None:
+                return
+            self._stopping = False
+            self._worker = threading.Thread(target=self._run, name="results-catalog", daemon=True)
+        self._wake.set()
+        self._worker.start()
+
+    def stop(self):
+        with self._lock:
+            worker, self._worker = self._worker, None
+            self._stopping = True
+        self._wake.set()
+        if worker is not None:
+            worker.join(timeout=5)
+
+    @property
+    def building(self):
+        """True while a background refresh is pending or running."""
+        return self._wake.is_set() or self._refresh_lock.locked()
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            if self._stopping:
+                return
+            with self._refresh_lock:
+                # Cleared under the lock so `building` never reads False
+                # between the wake-up and the refresh.
+                self._wake.clear()
+                try:
+                    self._refresh()
+                except Exception as exc:
+                    logger.warning("results catalog refresh failed: %s", exc)
+
+    def refresh(self):
+        with self._refresh_lock:
+            self._refresh()
+
+    def _refresh(self):
+        changed = False
+        seen = set()
+        with self._lock:
+            stale, self._stale = self._stale, set()
+        if not self.root.exists():
+            return
+        with os.scandir(self.root) as it:
+            entries = [(entry.name, entry.path, False) for entry in it if not entry.name.startswith(".")]
+        entries.extend((name, str(path), True) for name, path in partial_result_dirs(self.root))
+        for name, path, partial in entries:
+            try:
+                stat = os.stat(path)
+                is_dir = os.path.isdir(path)
+                if not (is_dir or name.lower().endswith(ARCHIVE_SUFFIXES)):
+                    continue
+                signature = self._signature(path, stat)
+            except OSError:
+                continue
+            seen.add(name)
+            record = self._records.get(name)
+            if record and record["signature"] == signature and name not in stale:
+                continue
+            try:
+                described = self._describe(name, path)
+            except Exception as exc:
+                logger.warning("results catalog: describe %s failed: %s", name, exc)
+                described = None
+            if described is not None:
+                described = {
+                    "name": name,
+                    "type": "folder" if is_dir else "archive",
+                    "created": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+                    "partial": partial,
+                    **described,
+                }
+            with self._lock:
+                self._records[name] = {"signature": signature, "entry": described}
+            changed = True
+        with self._lock:
+            for name in [name for name in self._records if name not in seen]:
+                del self._records[name]
+                changed = True
+            if changed:
+                self._save()
+
+    def query(self, limit=None, offset=0, sort="-created", filter_text=None):
+        """Return (entries, total) after filtering, sorting and paging.
+
+        `sort` is a SORT_FIELDS name, prefixed with "-" for descending.
+        `filter_text` is a case-insensitive substring matched against the
+        name, type, SSD model, controllers and RAID types. With the
+        background thread running this never describes entries itself.
+        """
+        if self._worker is None:
+            self.refresh()
+        with self._lock:
+            entries = [record["entry"] for record in self._records.values() if record["entry"]]
+
+        if filter_text:
+            needle = filter_text.lower()
+
+            def haystack(entry):
+                parts = [entry.get("name"), entry.get("type"), entry.get("ssd_model")]
+                parts.extend(entry.get("controllers") or [])
+                parts.extend(entry.get("raid_types") or [])
+                return " ".join(str(part) for part in parts if part).lower()
+
+            entries = [entry for entry in entries if needle in haystack(entry)]
+
+        descending = sort.startswith("-")
+        field = sort.lstrip("-+")
+        if field not in SORT_FIELDS:
+            field, descending = "created", True
+        numeric = field in ("size", "row_count")
+        entries.sort(
+            key=lambda entry: (entry.get(field) or 0) if numeric else str(entry.get(field) or ""),
+            reverse=descending,
+        )
+
+        total = len(entries)
+        entries = entries[offset:]
+        if limit is not None:
+            entries = entries[:limit]
+        return entries, total
@@ -0,0 +1,85 @@
+"""Pull each finished cell's results off the DUT while a remote run goes on.
+
+run_benchmark used to copy RESULTS_DIR back only once the whole matrix was
+done. bench.sh now reports every checkpointed cell with
+
+    STATUS: CELL_DONE: <cell> output_dir="<fio dir>"
+
+and BenchmarkManager hands the directory to a CellSyncer, which copies it
+into the same place under the local RESULTS_DIR on its own thread and SSH
+connection, capped at settings.cell_sync_bwlimit MB/s so the transfer does
+not compete with the benchmark's management traffic. bench.sh has already
+refreshed the cell's CSVs, so the run shows up in the results list as a
+partial entry (catalog.partial_result_dirs) while it goes on. Cells of one
+bench.sh invocation share a directory, so repeated submissions collapse
+while it is still waiting. The end-of-run sync still runs and picks up whatever is left.
+"""
+
+import threading
+from collections import deque
+
+from catalog import partial_result_name
+from config import RESULTS_DIR, logger, results_relative_path
+from watcher import results_watcher
+
+
+class CellSyncer:
+    def __init__(self, executor_factory, config, bwlimit_mbps):
+        self._executor_factory = executor_factory
+        self._config = config
+        self._bwlimit = int(bwlimit_mbps * 1024 * 1024)
+        self._pending = deque()
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, output_dir):
+        """Queue a script-side directory ("../results/...") for copying."""
+        try:
+            rel_path = results_relative_path(output_dir)
+        except ValueError:
+            logger.warning("cell sync: ignoring invalid path %s", output_dir)
+            return
+        if not rel_path:
+            return
+        with self._cond:
+            if self._stopped or rel_path in self._pending:
+                return
+            self._pending.append(rel_path)
+            self._cond.notify()
+
+    def stop(self, join_timeout=30):
+        """Drop queued directories and wait for the current copy to end."""
+        with self._cond:
+            self._stopped = True
+            self._pending.clear()
+            self._cond.notify()
+        self._thread.join(timeout=join_timeout)
+        if self._thread.is_alive():
+            logger.warning("cell sync did not finish within %ss", join_timeout)
+
+    def _run(self):
+        executor = None
+        try:
+            while True:
+                with self._cond:
+                    while not self._pending and not self._stopped:
+                        self._cond.wait()
+                    if self._stopped:
+                        return
+                    rel_path = self._pending.popleft()
+                if executor is None:
+                    executor = self._executor_factory(self._config)
+                target = RESULTS_DIR / rel_path
+                try:
+                    executor.sync_from_remote(str(target.parent), str(target), bwlimit=self._bwlimit)
+                    logger.debug("cell sync: pulled %s", rel_path)
+                except Exception as e:
+                    logger.warning("cell sync of %s failed: %s", rel_path, e)
+                # The staging area is hidden from the watcher; name the
+                # partial catalog entry the cell belongs to instead.
+                results_watcher.notify(partial_result_name(rel_path) or rel_path.split('/', 1)[0])
+        finally:
+            if executor is not None:
+                executor.close()
@@ -0,0 +1,147 @@
+"""Columnar chart series for the results view.
+
+Pure functions over the row dicts produced by fastapi_app.collect_result_rows.
+build_chart_series() collapses PD baseline and VD/MD rows into one entry per
+(stage, mode, bs, qd, nj, group, raid, status) cell and returns the numbers
+behind each comparison chart as parallel lists, so the frontend can draw the
+PNG-equivalent charts client-side from a few hundred KB of JSON.
+
+Aggregation mirrors ComparisonDashboard.jsx / fio_plot_renderer.py: IOPS and
+bandwidth are summed across PDs (and per-PD CSV rows), latency and
+percentiles are averaged.
+"""
+
+from collections import OrderedDict
+
+
+KEY_COLUMNS = ("stage", "mode", "bs", "qd", "nj", "group", "raid", "status")
+
+SUM_METRICS = (
+    "IOPS(K)",
+    "Bandwidth (GB/s)",
+    "Bandwidth (GiB/s)",
+)
+
+MEAN_METRICS = (
+    "Read Latency (us)",
+    "Write Latency (us)",
+    "User CPU",
+    "System CPU",
+)
+
+PERCENTILE_COLUMNS = (
+    "1.00th", "5.00th", "10.00th", "20.00th", "30.00th", "40.00th",
+    "50.00th", "60.00th", "70.00th", "80.00th", "90.00th", "95.00th",
+    "99.00th", "99.50th", "99.90th", "99.95th", "99.99th",
+)
+
+_NA = ("", "N/A", "nan", "None")
+
+
+def as_number(value):
+    if value is None:
+        return None
+    try:
+        result = float(value)
+    except (TypeError, ValueError):
+        return None
+    if result != result:  # NaN
+        return None
+    return result
+
+
+def as_label(value, default="N/A"):
+    if value is None:
+        return default
+    text = str(value).strip()
+    if text in _NA:
+        return default
+    number = as_number(text)
+    if number is not None and number.is_integer():
+        return str(int(number))
+    return text
+
+
+def _bs_label(value):
+    kib = as_number(value)
+    if kib is None or kib <= 0:
+        return as_label(value)
+    if kib >= 1024 and (kib / 1024).is_integer():
+        return f"{int(kib / 1024)}m"
+    if kib.is_integer():
+        return f"{int(kib)}k"
+    return f"{kib:g}k"
+
+
+def _row_group(row, side):
+    if side == "baseline":
+        return "PD"
+    source = (row.get("filename") or "").upper()
+    if "/MD/" in source or row.get("controller") == "MDADM":
+        return "MD"
+    return "VD"
+
+
+def _row_key(row, side):
+    return (
+        as_label(row.get("stage")),
+        as_label(row.get("Type"), "unknown").lower(),
+        _bs_label(row.get("BlockSize")),
+        as_label(row.get("Queue Depth")),
+        as_label(row.get("Threads")),
+        _row_group(row, side),
+        "BASELINE" if side == "baseline" else as_label(row.get("RAID_type"), "Unknown"),
+        as_label(row.get("RAID_status"), "Normal"),
+    )
+
+
+def _round(value, digits=4):
+    return None if value is None else round(value, digits)
+
+
+def build_chart_series(baseline_rows, raid_rows):
+    """Return {'length', 'keys', 'metrics', 'percentiles', 'columns'}.
+
+    `columns` maps every key/metric/percentile name to a list of equal
+    length; entry i of each list describes the same chart bar.
+    """
+    cells = OrderedDict()
+    for side, rows in (("baseline", baseline_rows or []), ("graid", raid_rows or [])):
+        for row in rows:
+            key = _row_key(row, side)
+            cell = cells.setdefault(key, {"samples": 0, "sum": {}, "mean": {}})
+            cell["samples"] += 1
+            for metric in SUM_METRICS:
+                value = as_number(row.get(metric))
+                if value is not None:
+                    cell["sum"][metric] = cell["sum"].get(metric, 0.0) + value
+            for metric in MEAN_METRICS + PERCENTILE_COLUMNS:
+                value = as_number(row.get(metric))
+                if value is not None:
+                    cell["mean"].setdefault(metric, []).append(value)
+
+    columns = {name: [] for name in KEY_COLUMNS + ("samples",) + SUM_METRICS + MEAN_METRICS + PERCENTILE_COLUMNS}
+    for key in sorted(cells):
+        cell = cells[key]
+        for name, value in zip(KEY_COLUMNS, key):
+            columns[name].append(value)
+        columns["samples"].append(cell["samples"])
+        for metric in SUM_METRICS:
+            columns[metric].append(_round(cell["sum"].get(metric)))
+        for metric in MEAN_METRICS + PERCENTILE_COLUMNS:
+            values = cell["mean"].get(metric)
+            columns[metric].append(_round(sum(values) / len(values)) if values else None)
+
+    # Drop percentile columns that carry no information (legacy bench-fio
+    # CSVs wrote zeros) so the payload stays small.
+    for name in PERCENTILE_COLUMNS:
+        if not any(columns[name]):
+            del columns[name]
+
+    return {
+        "length": len(cells),
+        "keys": list(KEY_COLUMNS),
+        "metrics": list(SUM_METRICS + MEAN_METRICS),
+        "percentiles": [name for name in PERCENTILE_COLUMNS if name in columns],
+        "columns": columns,
+    }
@@ -21,6 +21,8 @@ logger = logging.getLogger('graid-bench')
 audit_logger = logging.getLogger('graid-bench.audit')
 
 SENSITIVE_CONFIG_KEYS = {'DUT_PASSWORD'}
+# Per-run switches that must not stick in the saved .conf.
+TRANSIENT_CONFIG_KEYS = {'RESUME'}
 
 WORKLOAD_MAP = {
     '00-randread': '4k Random Read',
@@ -81,8 +83,10 @@ if not any(isinstance(handler, logging.FileHandler) and getattr(handler, 'baseFi
 
 REMOTE_BASE_DIR = Path("/tmp/benchmark-gui")
 ACTIVE_STATE_FILE = LOGS_DIR / "active_benchmark.json"
+RESUMABLE_FILE = LOGS_DIR / "resumable_benchmark.json"
 
 ANSI_ESCAPE = re.compile(r'(?:\x1B[@-_][0-?]*[ -/]*[@-~])')
+SAFE_NAME_RE = re.compile(r"[^A-Za-z0-9._-]+")
 
 
 def strip_ansi(text):
@@ -91,6 +95,30 @@ def strip_ansi(text):
     return ANSI_ESCAPE.sub('', text)
 
 
+def clean_name(value, default="item"):
+    cleaned = SAFE_NAME_RE.sub("_", value.strip()).strip("._-")
+    return cleaned[:160] or default
+
+
+def results_relative_path(value):
+    """Map a script-side path ("../results/.test-temp-data/...") onto a
+    path relative to RESULTS_DIR. Raises ValueError on `..` segments."""
+    if not value:
+        return ""
+    normalized = value.replace("\\", "/")
+    for prefix in ("../results/", "./results/", "./"):
+        if normalized.startswith(prefix):
+            normalized = normalized[len(prefix):]
+            break
+    normalized = normalized.strip("/")
+    if not normalized:
+        return ""
+    parts = [part for part in normalized.split("/") if part not in ("", ".")]
+    if any(part == ".." for part in parts):
+        raise ValueError("Invalid path")
+    return "/".join(parts)
+
+
 def generate_run_id():
     return f"run-{uuid4().hex[:12]}"
 
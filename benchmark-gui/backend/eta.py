@@ -0,0 +1,293 @@
+"""Historical ETA model for benchmark runs.
+
+est_time.sh multiplies configured runtimes and guesses preconditioning
+from `nvme id-ctrl` capacity, so its estimate is routinely off by hours on
+large drives. This module learns what each phase actually took on earlier
+runs and predicts the remaining time of a live run phase by phase.
+
+A run is cut into phases by the STATUS markers bench.sh already prints
+(PhaseTracker):
+
+    discard       STATE: DISCARD (device cleanup + VD creation)
+    precondition  STATE: PRECONDITIONING
+    sustain       STATE: SUSTAINING
+    workload      TICK (one per fio / bench-fio cell)
+    parse         STATE: PARSING (fio_parser + log collection)
+    sync          results copied back from the DUT (timed by the manager)
+
+Completed runs are folded into LOGS_DIR/eta_history.json, keyed by SSD
+model, per-drive capacity, drive count and phase. Preconditioning is
+stored per GB of drive capacity so it carries over to other capacities of
+the same model, and workloads are stored as overhead on top of the
+configured runtime. The expected number of occurrences of each phase
+comes from the config (phase_plan), mirroring the loops in graid-bench.sh.
+
+When a phase the plan needs has never been seen, predictions return None
+and the caller falls back to est_time.sh.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+
+from config import LOGS_DIR, logger
+
+HISTORY_FILE = LOGS_DIR / "eta_history.json"
+HISTORY_VERSION = 1
+
+PHASES = ("discard", "precondition", "sustain", "workload", "parse", "sync")
+# Phases whose duration grows with drive capacity.
+CAPACITY_PHASES = ("precondition",)
+
+_TIMESTAMP_RE = re.compile(r"^\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\]")
+_CAPACITY_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(TB|GB|T|G)\b", re.I)
+_STATE_PHASES = {
+    "DISCARD": "discard",
+    "PRECONDITIONING": "precondition",
+    "SUSTAINING": "sustain",
+    "PARSING": "parse",
+}
+
+
+def _as_list(value):
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    if value in (None, ""):
+        return []
+    return str(value).split()
+
+
+def _truthy(value):
+    return value is True or str(value).lower() == "true"
+
+
+def run_profile(config):
+    """Return (model, capacity_gb, drive_count) for a config."""
+    model = str(config.get("NVME_INFO") or "unknown")
+    capacity_gb = 0.0
+    match = _CAPACITY_RE.search(model)
+    if match:
+        capacity_gb = float(match.group(1)) * (1000 if match.group(2).upper().startswith("T") else 1)
+    return model, capacity_gb, len(_as_list(config.get("NVME_LIST")))
+
+
+def stage_runtime(config, stage):
+    key = "PD_RUNTIME" if stage == "PD" else "VD_RUNTIME"
+    try:
+        return float(config.get(key) or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def phase_plan(config, total_steps=0):
+    """Expected occurrences per phase for `config`, following graid-bench.sh.
+
+    Every bench.sh invocation starts with one discard; preconditioning and
+    sustain happen once per invocation (per task in legacy fio-loop mode)
+    for the stages that need them.
+    """
+    stages = _as_list(config.get("TS_LS")) or ["afterdiscard"]
+    qd_count = max(1, len(_as_list(config.get("QD_LS"))))
+    drives = len(_as_list(config.get("NVME_LIST")))
+    per_stage = 0
+    if _truthy(config.get("RUN_PD")):
+        per_stage += qd_count * (1 if _truthy(config.get("RUN_PD_ALL")) else max(1, drives))
+    scan = max(1, drives // 4) if _truthy(config.get("SCAN")) else 1
+    vd_like = sum(1 for key in ("RUN_VD", "RUN_MD") if _truthy(config.get(key)))
+    per_stage += (vd_like * max(1, len(_as_list(config.get("STA_LS"))))
+                  * max(1, len(_as_list(config.get("RAID_TYPE")))) * qd_count * scan)
+
+    tasks = 1
+    if str(config.get("USE_BENCH_FIO", True)).lower() == "false":
+        tasks = 4 if _truthy(config.get("QUICK_TEST")) else 12
+
+    precondition_stages = sum(1 for stage in stages if stage in ("afterprecondition", "aftersustain"))
+    sustain_stages = sum(1 for stage in stages if stage == "aftersustain")
+    return {
+        "discard": per_stage * len(stages),
+        "precondition": per_stage * precondition_stages * tasks,
+        "sustain": per_stage * sustain_stages * tasks,
+        "workload": total_steps,
+        "parse": 1,
+        "sync": 1 if _truthy(config.get("REMOTE_MODE")) else 0,
+    }
+
+
+class PhaseTracker:
+    """Cuts a run's log stream into timed phases."""
+
+    def __init__(self, started_at=None):
+        self.started_at = started_at or time.time()
+        self.current = None
+        self.current_started = None
+        self.current_stage = None
+        self.stage = None
+        self.counts = {phase: 0 for phase in PHASES}
+        # Finished occurrences: (phase, seconds, stage)
+        self.samples = []
+        self._last_ts = None
+
+    def _timestamp(self, msg, now):
+        match = _TIMESTAMP_RE.match(msg)
+        if match:
+            try:
+                self._last_ts = datetime.strptime(match.group(1), "%Y-%m-%d %H:%M:%S").timestamp()
+                return self._last_ts
+            except ValueError:
+                pass
+        return now if now is not None else (self._last_ts or time.time())
+
+    def _start(self, phase, ts):
+        self._close(ts)
+        self.current = phase
+        self.current_started = ts
+        self.current_stage = self.stage
+        self.counts[phase] += 1
+
+    def _close(self, ts):
+        if self.current is not None:
+            self.samples.append((self.current, max(0.0, ts - self.current_started), self.current_stage))
+        self.current = None
+        self.current_started = None
+
+    def feed(self, msg, now=None):
+        """Consume one log line; `now` overrides the line's own timestamp."""
+        if "STATUS:" not in msg:
+            return
+        ts = self._timestamp(msg, now)
+        if "STATUS: STAGE_PD_START" in msg:
+            self.stage = "PD"
+        elif "STATUS: STAGE_VD_START" in msg:
+            self.stage = "VD"
+        elif "STATUS: STAGE_MD_START" in msg:
+            self.stage = "MD"
+        elif "STATUS: TICK" in msg:
+            self._start("workload", ts)
+        elif "STATUS: STATE:" in msg:
+            state = msg.split("STATUS: STATE:", 1)[1].strip().split(":", 1)[0].strip()
+            phase = _STATE_PHASES.get(state)
+            if phase:
+                self._start(phase, ts)
+            elif state == "BENCHMARKING":
+                # Setup before the first cell is not part of any phase.
+                self._close(ts)
+
+    def finish(self, now=None):
+        self._close(now or time.time())
+
+    def add(self, phase, seconds):
+        self.counts[phase] += 1
+        self.samples.append((phase, seconds, self.stage))
+
+    def current_elapsed(self, now=None):
+        if self.current is None:
+            return 0.0
+        return max(0.0, (now or time.time()) - self.current_started)
+
+
+class EtaModel:
+    def __init__(self, path=HISTORY_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._records = self._load()
+
+    def _load(self):
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != HISTORY_VERSION:
+            return {}
+        return data.get("records", {})
+
+    def _save(self):
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            tmp_path.write_text(json.dumps({"version": HISTORY_VERSION, "records": self._records}))
+            os.replace(tmp_path, self.path)
+        except OSError as exc:
+            logger.warning("eta history save failed: %s", exc)
+
+    @staticmethod
+    def _key(profile, phase):
+        model, capacity_gb, drives = profile
+        return f"{model}|{capacity_gb:g}|{drives}|{phase}"
+
+    def record(self, profile, tracker, config):
+        """Fold a finished run's phase samples into the history."""
+        _, capacity_gb, _ = profile
+        with self._lock:
+            for phase, seconds, stage in tracker.samples:
+                if phase == "workload":
+                    # Overhead beyond the configured runtime, so runs with a
+                    # different runtime can reuse it.
+                    seconds = seconds - stage_runtime(config, stage or "VD")
+                record = self._records.setdefault(self._key(profile, phase), {
+                    "phase": phase,
+                    "model": profile[0],
+                    "capacity_gb": capacity_gb,
+                    "drives": profile[2],
+                    "seconds": 0.0,
+                    "count": 0,
+                })
+                record["seconds"] += seconds
+                record["count"] += 1
+                record["updated"] = datetime.now().isoformat()
+            self._save()
+
+    def _per_occurrence(self, profile, phase):
+        model, capacity_gb, drives = profile
+        with self._lock:
+            exact = self._records.get(self._key(profile, phase))
+            candidates = [record for record in self._records.values()
+                          if record["phase"] == phase and record["count"]]
+        if exact and exact["count"]:
+            return exact["seconds"] / exact["count"]
+        # Nearest history: same model first, then any model.
+        for pool in ([r for r in candidates if r["model"] == model], candidates):
+            if not pool:
+                continue
+            if phase in CAPACITY_PHASES and capacity_gb:
+                scaled = [r for r in pool if r.get("capacity_gb")]
+                if scaled:
+                    per_gb = sum(r["seconds"] / r["capacity_gb"] for r in scaled) / sum(r["count"] for r in scaled)
+                    return per_gb * capacity_gb
+            return sum(r["seconds"] for r in pool) / sum(r["count"] for r in pool)
+        return None
+
+    def _phase_seconds(self, profile, phase, config, stage):
+        seconds = self._per_occurrence(profile, phase)
+        if seconds is None:
+            return None
+        if phase == "workload":
+            seconds += stage_runtime(config, stage or "VD")
+        return max(0.0, seconds)
+
+    def estimate(self, profile, plan, config, tracker=None, now=None):
+        """Return {'total': s, 'phases': {phase: s}} still to go, or None.
+
+        Without a tracker this is the whole run. With one, finished
+        occurrences are subtracted and the running one is credited with its
+        elapsed time.
+        """
+        phases = {}
+        for phase in PHASES:
+            expected = plan.get(phase, 0)
+            if not expected:
+                continue
+            stage = tracker.stage if tracker else None
+            per = self._phase_seconds(profile, phase, config, stage)
+            if per is None:
+                return None
+            done = tracker.counts.get(phase, 0) if tracker else 0
+            remaining = max(0, expected - done) * per
+            if tracker is not None and tracker.current == phase:
+                remaining += max(0.0, per - tracker.current_elapsed(now))
+            phases[phase] = int(remaining)
+        return {"total": sum(phases.values()), "phases": phases}
+
+
+eta_model = EtaModel()
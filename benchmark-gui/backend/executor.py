@@ -3,22 +3,72 @@
 When config has REMOTE_MODE=True and SSH credentials, RemoteExecutor SSHes
 into the DUT; otherwise commands run as subprocesses on the host.
 
+Async endpoints use `await arun(...)` / `acall(...)`, which run on a
+dedicated I/O thread pool.
+
 Popen() returns a RemoteProcess wrapping a paramiko channel; it supports
 `text=True` via `_DecodingStream` (B8) and `wait(timeout=...)` via
 `exit_status_ready()` polling (B12).
+
+Directory syncs are deltas over manifests (size, mtime, sha256) built on
+both ends; large pulls come back as one compressed tar stream. SCP is the
+fallback for DUTs without SFTP or python3.
 """
 
+import asyncio
+import functools
+import hashlib
+import json
+import re
 import shlex
+import stat
 import subprocess
+import sys
+import tarfile
 import threading
 import time
-from pathlib import Path
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
 
 import paramiko
 from scp import SCPClient
 
-from config import BASE_DIR, REMOTE_BASE_DIR, logger
-
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+from config import BASE_DIR, LOGS_DIR, REMOTE_BASE_DIR, RESULTS_DIR, logger
+from settings import settings
+import transfer
+
+# Run with python3 on both ends of a sync: prints
+# {relative path: [size, mtime, sha256 or null]} for every regular file
+# under argv[1] (empty when it does not exist).
+_MANIFEST_PY = r"""
+import hashlib, json, os, stat, sys
+root, with_hash = sys.argv[1], sys.argv[2] == "1"
+manifest = {}
+for dirpath, _, filenames in os.walk(root):
+    for name in filenames:
+        path = os.path.join(dirpath, name)
+        try:
+            st = os.stat(path)
+            if not stat.S_ISREG(st.st_mode):
+                continue
+            digest = None
+            if with_hash:
+                h = hashlib.sha256()
+                with open(path, "rb") as f:
+                    for chunk in iter(lambda: f.read(1 << 20), b""):
+                        h.update(chunk)
+                digest = h.hexdigest()
+        except OSError:
+            continue
+        manifest[os.path.relpath(path, root).replace(os.sep, "/")] = [st.st_size, int(st.st_mtime), digest]
+print(json.dumps(manifest))
+"""
 
 class _AutoUpdateHostKeyPolicy(paramiko.MissingHostKeyPolicy):
     """Auto-accept and update host keys for lab/DUT environments without blocking."""
@@ -27,6 +77,72 @@ class _AutoUpdateHostKeyPolicy(paramiko.MissingHostKeyPolicy):
         logger.warning("SSH: auto-accepted host key for %s (%s)", hostname, key.get_name())
 
 
+# Blocking SSH work of async endpoints (arun/acall) runs on this pool rather
+# than Starlette's request threadpool, so a slow DUT cannot starve quick
+# endpoints such as /api/benchmark/status.
+IO_WORKERS = 16
+_io_pool = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="dut-io")
+
+# Pulls with at least this many changed files go through one tar stream
+# instead of one SFTP request per file.
+TAR_BULK_MIN_FILES = 32
+_SHA256_RE = re.compile(r"\b([0-9a-f]{64})\s+-")
+
+
+class _HashingReader:
+    """Read-only file wrapper that hashes (and optionally throttles) a
+    remote byte stream as tarfile / zstandard consume it."""
+
+    def __init__(self, raw, throttle=None):
+        self._raw = raw
+        self._throttle = throttle
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def read(self, size=-1):
+        data = self._raw.read(size)
+        self.sha256.update(data)
+        self.size += len(data)
+        if self._throttle is not None:
+            self._throttle.update('tar', self.size)
+        return data
+
+    def drain(self):
+        while self.read(1 << 20):
+            pass
+
+
+class _Throttle:
+    """Transfer progress callback that sleeps to keep a transfer under
+    `limit` bytes per second. Called SCP-style; stream readers use
+    update(), parallel transfers add() from several threads."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.started = time.monotonic()
+        self.moved = 0
+        self._file = None
+        self._sent = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, filename, size, sent):
+        self.update(filename, sent)
+
+    def update(self, key, sent):
+        if key != self._file:
+            self._file = key
+            self._sent = 0
+        self.add(sent - self._sent)
+        self._sent = sent
+
+    def add(self, nbytes):
+        with self._lock:
+            self.moved += nbytes
+            ahead = self.moved / self.limit - (time.monotonic() - self.started)
+        if ahead > 0:
+            time.sleep(ahead)
+
+
 class RemoteExecutor:
     """Handles command execution locally or remotely via SSH."""
 
@@ -37,6 +153,8 @@ class RemoteExecutor:
         self.is_root = False
         self.has_sudo = False
         self.need_sudo_password = False
+        # which() results on the DUT, e.g. zstd for tar syncs.
+        self._remote_tools = {}
         # Per-instance lock so concurrent RemoteExecutor instances do not
         # serialize unrelated SSH connects through one global lock.
         self._lock = threading.Lock()
@@ -202,6 +320,16 @@ class RemoteExecutor:
             stderr=stderr.read().decode('utf-8') if text else stderr.read()
         )
 
+    async def acall(self, fn, *args, **kwargs):
+        """Await a blocking call (usually one taking this executor) on the
+        DUT I/O pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_io_pool, functools.partial(fn, *args, **kwargs))
+
+    async def arun(self, cmd, cwd=None, env=None, capture_output=True, text=True):
+        """Awaitable run() for async endpoints."""
+        return await self.acall(self.run, cmd, cwd=cwd, env=env, capture_output=capture_output, text=text)
+
     def Popen(self, cmd, cwd=None, env=None, **kwargs):
         if not self.is_remote:
             return subprocess.Popen(cmd, cwd=cwd, env=env, **kwargs)
@@ -409,7 +537,146 @@ class RemoteExecutor:
         
         return results
 
+    def _exec_binary(self, cmd):
+        """exec_command without a pty, so stdout stays binary-safe; sudo is
+        applied as in run()."""
+        ssh = self._get_ssh_client()
+        password = self.config.get('DUT_PASSWORD')
+        target_cmd = list(cmd)
+        if not self.is_root and self.has_sudo:
+            target_cmd = ['sudo', '-S' if self.need_sudo_password else '-n'] + target_cmd
+        stdin, stdout, stderr = ssh.exec_command(" ".join(shlex.quote(str(c)) for c in target_cmd))
+        if self.need_sudo_password and password:
+            stdin.write(password + '\n')
+            stdin.flush()
+        return stdin, stdout, stderr
+
+    def _remote_has(self, tool):
+        if tool not in self._remote_tools:
+            self._remote_tools[tool] = self.run(['which', tool], capture_output=True).returncode == 0
+        return self._remote_tools[tool]
+
+    def _pull_tar(self, remote_root, local_root, rels, bwlimit=None):
+        """Fetch `rels` (paths under remote_root) as one compressed tar
+        stream and unpack it into local_root as it arrives.
+
+        zstd is used when both the DUT and this host (zstandard module) have
+        it, gzip otherwise. The DUT reports the sha256 of the compressed
+        stream on stderr; a mismatch raises so the caller can fall back.
+        """
+        ssh = self._get_ssh_client()
+        list_path = f"/tmp/.graid-sync-{uuid.uuid4().hex}.list"
+        stdin, stdout, _ = ssh.exec_command(f"cat > {shlex.quote(list_path)}")
+        stdin.write(''.join(rel + '\0' for rel in rels))
+        stdin.channel.shutdown_write()
+        if stdout.channel.recv_exit_status() != 0:
+            raise RuntimeError("could not write the remote file list")
+
+        use_zstd = zstandard is not None and self._remote_has('zstd')
+        compress = 'zstd -q -c' if use_zstd else 'gzip -1 -c'
+        pipeline = (
+            f"set -o pipefail; tar -C {shlex.quote(remote_root)} --warning=no-file-changed "
+            f"--null -T {shlex.quote(list_path)} -cf - | {compress} | tee >(sha256sum >&2); "
+            f"rc=$?; rm -f {shlex.quote(list_path)}; exit $rc"
+        )
+        _, stdout, stderr = self._exec_binary(['bash', '-c', pipeline])
+        reader = _HashingReader(stdout, _Throttle(bwlimit) if bwlimit else None)
+        stream = zstandard.ZstdDecompressor().stream_reader(reader) if use_zstd else reader
+        Path(local_root).mkdir(parents=True, exist_ok=True)
+        with tarfile.open(fileobj=stream, mode='r|' if use_zstd else 'r|gz') as tar:
+            tar.extractall(local_root, filter='data')
+        reader.drain()
+        # GNU tar exits 1 when a file changed while it was read (a run still
+        # writing); the archive is intact.
+        rc = stdout.channel.recv_exit_status()
+        match = _SHA256_RE.search(stderr.read().decode('utf-8', 'replace'))
+        if rc not in (0, 1):
+            raise RuntimeError(f"remote tar exited with {rc}")
+        if not match or match.group(1) != reader.sha256.hexdigest():
+            raise RuntimeError("tar stream checksum mismatch")
+        logger.info("sync_from_remote %s: %d files in one %s tar stream (%d bytes)",
+                    remote_root, len(rels), 'zstd' if use_zstd else 'gzip', reader.size)
+
+    def _manifest(self, root, with_hash=False, remote=True):
+        cmd = ['python3' if remote else sys.executable, '-c', _MANIFEST_PY, str(root), '1' if with_hash else '0']
+        res = self.run(cmd) if remote else subprocess.run(cmd, capture_output=True, text=True)
+        if res.returncode != 0:
+            raise RuntimeError(f"manifest of {root} failed: {res.stderr.strip()}")
+        return json.loads(res.stdout)
+
+    def _push_delta(self, local_root, remote_root):
+        """Mirror a local directory onto the DUT over one SFTP session.
+
+        Content hashes decide what changed: uploaded files get fresh remote
+        mtimes, so times cannot be compared. Remote files missing locally
+        are removed, as the old `rm -rf` + full copy did.
+        """
+        local = self._manifest(local_root, with_hash=True, remote=False)
+        remote = self._manifest(remote_root, with_hash=True)
+        changed = [rel for rel, (size, _, digest) in local.items()
+                   if rel not in remote or remote[rel][0] != size or remote[rel][2] != digest]
+        stale = [str(PurePosixPath(remote_root) / rel) for rel in remote if rel not in local]
+        if stale:
+            self.run(['rm', '-f'] + stale)
+        dirs = {str(PurePosixPath(remote_root) / rel).rsplit('/', 1)[0] for rel in changed}
+        self.run(['mkdir', '-p', remote_root] + sorted(dirs))
+        sftp = self._get_ssh_client().open_sftp()
+        try:
+            for rel in changed:
+                local_file = Path(local_root) / rel
+                remote_file = str(PurePosixPath(remote_root) / rel)
+                sftp.put(str(local_file), remote_file)
+                sftp.chmod(remote_file, stat.S_IMODE(local_file.stat().st_mode))
+        finally:
+            sftp.close()
+        logger.info("sync_to_remote %s: %d sent, %d removed, %d unchanged",
+                    remote_root, len(changed), len(stale), len(local) - len(changed))
+
+    def _pull_delta(self, remote_root, local_root, bwlimit=None):
+        """Copy new or changed files (by size and mtime) of a DUT directory
+        into local_root. Many small files come back as one tar stream;
+        large files, and small ones when tar is not worth it or fails, go
+        through transfer.pull_files over parallel SFTP channels. Local
+        mtimes match the remote ones so the next pull skips them; local
+        extras are kept."""
+        remote = self._manifest(remote_root)
+        local = self._manifest(local_root, remote=False)
+        changed = [rel for rel, entry in remote.items() if local.get(rel, [None, None])[:2] != entry[:2]]
+        small = [rel for rel in changed if remote[rel][0] <= transfer.CHUNK_SIZE]
+        if len(small) >= TAR_BULK_MIN_FILES:
+            try:
+                self._pull_tar(remote_root, local_root, small, bwlimit)
+                changed = [rel for rel in changed if remote[rel][0] > transfer.CHUNK_SIZE]
+            except Exception as e:
+                logger.warning("Tar sync of %s failed, fetching files over SFTP: %s", remote_root, e)
+        if not changed:
+            return
+        jobs = [(str(PurePosixPath(remote_root) / rel), str(Path(local_root) / rel), remote[rel][0], remote[rel][1])
+                for rel in changed]
+        stats = transfer.pull_files(self._get_ssh_client, jobs, self._staging_dir(local_root),
+                                    settings.transfer_channels, _Throttle(bwlimit) if bwlimit else None)
+        logger.info("sync_from_remote %s: %d fetched, %d unchanged; %d bytes in %ss "
+                    "(%s MiB/s over %d channels)", remote_root, stats['files'],
+                    len(remote) - len(changed), stats['bytes'], stats['seconds'], stats['mib_s'],
+                    settings.transfer_channels)
+
+    @staticmethod
+    def _staging_dir(local_root):
+        """Hidden transfer.py staging dir for a pull into local_root: at the
+        top of the results or logs tree it belongs to (same filesystem, so
+        finished files can be renamed into place, and out of result
+        folders), else inside local_root."""
+        local_root = Path(local_root).resolve()
+        for tree in (RESULTS_DIR, LOGS_DIR):
+            tree = tree.resolve()
+            if local_root == tree or tree in local_root.parents:
+                return tree / transfer.STAGING_DIR_NAME
+        return local_root / transfer.STAGING_DIR_NAME
+
     def sync_to_remote(self, local_path, remote_path):
+        """Copy local_path to the DUT: a file to remote_path, a directory
+        into it. Directories go through _push_delta; SCP is the fallback
+        (no SFTP subsystem or python3 on the DUT)."""
         if not self.is_remote:
             return
         ssh = self._get_ssh_client()
@@ -418,17 +685,29 @@ class RemoteExecutor:
         # Ensure remote parent directory exists
         parent = str(Path(remote_path_mapped).parent)
         self.run(['mkdir', '-p', parent])
-        
+
+        if Path(local_path).is_dir():
+            try:
+                self._push_delta(local_path, str(PurePosixPath(remote_path_mapped) / Path(local_path).name))
+                return
+            except Exception as e:
+                logger.warning("Delta upload of %s failed, copying everything: %s", local_path, e)
+
         transport = ssh.get_transport()
         if not transport:
              raise ConnectionError("SSH transport is not available for SCP")
         with SCPClient(transport) as scp:
             scp.put(local_path, remote_path_mapped, recursive=True)
 
-    def sync_from_remote(self, local_path, remote_path):
+    def sync_from_remote(self, local_path, remote_path, bwlimit=None):
+        """Copy remote_path (mapped onto the DUT) into local_path.
+
+        Directories go through _pull_delta, so files already copied are not
+        fetched again; SCP is the fallback. `bwlimit` caps the transfer in
+        bytes per second.
+        """
         if not self.is_remote:
             return
-        ssh = self._get_ssh_client()
         remote_path_mapped = self._to_remote_path(remote_path)
         logger.debug("sync_from_remote: %s -> %s (local: %s)", remote_path, remote_path_mapped, local_path)
 
@@ -441,12 +720,22 @@ class RemoteExecutor:
         # Ensure local directory exists
         Path(local_path).mkdir(parents=True, exist_ok=True)
 
-        transport = ssh.get_transport()
+        if self.run(['test', '-d', remote_path_mapped], capture_output=True).returncode == 0:
+            try:
+                self._pull_delta(remote_path_mapped, str(Path(local_path) / PurePosixPath(remote_path_mapped).name), bwlimit)
+                return
+            except Exception as e:
+                logger.warning("Delta sync of %s failed, copying everything: %s", remote_path_mapped, e)
+
+        # The delta attempt may have reconnected; use the live client.
+        transport = self._get_ssh_client().get_transport()
         if not transport:
             raise ConnectionError("SSH transport is not available for SCP")
+        progress = _Throttle(bwlimit) if bwlimit else None
         try:
-            with SCPClient(transport) as scp:
-                scp.get(remote_path_mapped, local_path, recursive=True)
+            with SCPClient(transport, progress=progress) as scp:
+                # Keep remote mtimes so a later delta sync can skip these.
+                scp.get(remote_path_mapped, local_path, recursive=True, preserve_times=True)
         except Exception as e:
             logger.error("SCP get failed: %s", e)
 
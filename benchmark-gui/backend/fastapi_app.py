@@ -20,7 +20,7 @@ import time
 from contextvars import ContextVar
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import psutil
 import socketio
@@ -39,17 +39,29 @@ from app import (
     BenchmarkState,
     ConfigManager,
     RemoteExecutor,
+    ResumableRuns,
     _collect_device_usage,
     _collect_gpu_perf,
     _collect_nvme_pcie_info,
     _extract_raid_from_cmd_dir,
     audit_event,
-    benchmark_manager,
+    clean_name,
+    fleet,
     generate_run_id,
     parse_graidctl_json,
+    partial_results_left,
     public_config,
+    results_relative_path,
     sanitize_config,
 )
+from catalog import ResultsCatalog, partial_result_path
+from charts import build_chart_series
+from query import QueryError, ResultFrameCache, run_query
+from regression import compare_runs
+from run_queue import QueueError, run_queue
+from inventory_cache import inventory_cache
+import image_cache
+from watcher import results_watcher
 
 
 logger = logging.getLogger("graid-bench.api")
@@ -104,7 +116,6 @@ def _purge_expired_sessions() -> None:
             _credential_sessions.pop(t, None)
 
 MAX_SNAPSHOT_BYTES = 12 * 1024 * 1024
-SAFE_NAME_RE = re.compile(r"[^A-Za-z0-9._-]+")
 request_id_ctx: ContextVar[str] = ContextVar("request_id", default="-")
 
 
@@ -140,6 +151,26 @@ class StartBenchmarkRequest(BaseModel):
     session_id: str = "default"
 
 
+class EnqueueBenchmarkRequest(BaseModel):
+    config: Dict[str, Any]
+    session_id: str = "default"
+    label: Optional[str] = None
+
+
+class ReorderQueueRequest(BaseModel):
+    ids: List[str]
+
+
+class ResumeQueueRequest(BaseModel):
+    password: Optional[str] = None
+
+
+class ResumeBenchmarkRequest(BaseModel):
+    dut: Optional[str] = None
+    session_id: str = "default"
+    password: Optional[str] = None
+
+
 class StopBenchmarkRequest(BaseModel):
     run_id: Optional[str] = None
 
@@ -162,6 +193,23 @@ class SnapshotRequest(BaseModel):
     output_dir: Optional[str] = None
 
 
+class ResultQueryRequest(BaseModel):
+    results: List[str] = Field(..., min_length=1, max_length=50)
+    type: Optional[str] = Field(default=None, pattern="^(baseline|graid)$")
+    columns: Optional[List[str]] = None
+    filters: Dict[str, Any] = Field(default_factory=dict)
+    group_by: List[str] = Field(default_factory=list)
+    aggregations: Dict[str, str] = Field(default_factory=dict)
+    limit: Optional[int] = Field(default=None, ge=1, le=100000)
+
+
+class CompareResultsRequest(BaseModel):
+    baseline: str
+    candidate: str
+    type: Optional[str] = Field(default=None, pattern="^(baseline|graid)$")
+    thresholds: Dict[str, float] = Field(default_factory=dict)
+
+
 class SaveSnapshotRequest(BaseModel):
     run_id: Optional[str] = None
     image: str
@@ -184,26 +232,11 @@ def current_request_id() -> str:
     return request_id_ctx.get()
 
 
-def clean_name(value: str, default: str = "item") -> str:
-    cleaned = SAFE_NAME_RE.sub("_", value.strip()).strip("._-")
-    return cleaned[:160] or default
-
-
 def normalize_relative_path(value: str | None) -> str:
-    if not value:
-        return ""
-    normalized = value.replace("\\", "/")
-    for prefix in ("../results/", "./results/", "./"):
-        if normalized.startswith(prefix):
-            normalized = normalized[len(prefix):]
-            break
-    normalized = normalized.strip("/")
-    if not normalized:
-        return ""
-    parts = [part for part in normalized.split("/") if part not in ("", ".")]
-    if any(part == ".." for part in parts):
+    try:
+        return results_relative_path(value)
+    except ValueError:
         err("Invalid path", 400)
-    return "/".join(parts)
 
 
 def require_valid_result_name(result_name: str) -> str:
@@ -220,19 +253,35 @@ def get_effective_config(config: Optional[Dict[str, Any]] = None) -> Dict[str, A
     return merged
 
 
-def resolve_saved_state() -> Optional[Dict[str, Any]]:
-    return BenchmarkState.load()
+def resolve_saved_state(slot=None) -> Optional[Dict[str, Any]]:
+    return BenchmarkState.load((slot or fleet.select()).state_file)
 
 
-def resolve_active_run_id() -> Optional[str]:
-    if benchmark_manager.active_run_id:
-        return benchmark_manager.active_run_id
-    state = resolve_saved_state()
+def resolve_active_run_id(slot=None) -> Optional[str]:
+    slot = slot or fleet.select()
+    if slot.active_run_id:
+        return slot.active_run_id
+    state = resolve_saved_state(slot)
     return state.get("run_id") if state else None
 
 
+def resolve_run_slot(run_id: Optional[str]):
+    """Fleet slot a run-scoped request targets; 409 when `run_id` is not the
+    run that slot has active."""
+    slot = (fleet.find_run(run_id) if run_id else None) or fleet.select()
+    active_run_id = resolve_active_run_id(slot)
+    if run_id and active_run_id and run_id != active_run_id:
+        err("Run ID does not match the active benchmark", 409)
+    return slot
+
+
 def get_result_target(result_name: str) -> Path:
     require_valid_result_name(result_name)
+    partial_path = partial_result_path(RESULTS_DIR, result_name)
+    if partial_path is not None:
+        if partial_path.is_dir():
+            return partial_path
+        err("Result not found", 404)
     result_path = RESULTS_DIR / result_name
     if result_path.exists():
         return result_path
@@ -429,6 +478,18 @@ def collect_result_rows(result_name: str, req_type: Optional[str]) -> List[Dict[
     return csv_data
 
 
+def collect_optional_result_rows(result_name: str, req_type: Optional[str]) -> List[Dict[str, Any]]:
+    # Baseline-only or RAID-only results are valid; only a missing result
+    # (get_result_target) should surface as 404.
+    get_result_target(result_name)
+    try:
+        return collect_result_rows(result_name, req_type)
+    except HTTPException as exc:
+        if exc.status_code == 404:
+            return []
+        raise
+
+
 def collect_result_info(result_name: str) -> Dict[str, Any]:
     target = get_result_target(result_name)
     info_data: Dict[str, Any] = {}
@@ -516,47 +577,48 @@ def parse_image_tags(image_path: str) -> Dict[str, str]:
     return tags
 
 
-def collect_result_images(result_name: str) -> List[Dict[str, Any]]:
+def _image_entry(path: Path, name: str, url: str, tag_source: str) -> Dict[str, Any]:
+    image_cache.schedule(path)
+    return {
+        "name": name,
+        "url": url,
+        "thumb_url": f"{url}?size=thumb",
+        "tags": parse_image_tags(tag_source),
+    }
+
+
+def collect_result_images(result_name: str) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """Gallery entries for a result, plus the extraction state for archives."""
     target = get_result_target(result_name)
     images: List[Dict[str, Any]] = []
+    extraction: Optional[Dict[str, Any]] = None
     if target.is_dir():
         for image in target.rglob("*"):
             if image.is_file() and image.suffix.lower() in (".png", ".jpg", ".jpeg") and "report_view" in str(image):
                 rel_path = str(image.relative_to(RESULTS_DIR if str(image).startswith(str(RESULTS_DIR)) else BASE_DIR))
-                images.append({
-                    "name": image.name,
-                    "url": f"/api/result-files/{rel_path}",
-                    "tags": parse_image_tags(str(image)),
-                })
+                images.append(_image_entry(image, image.name, f"/api/result-files/{rel_path}", str(image)))
     elif target.is_file() and target.name.lower().endswith((".tar", ".tar.gz", ".tgz")):
         cache_dir = CACHE_DIR / clean_name(result_name)
-        cache_dir.mkdir(parents=True, exist_ok=True)
-        inner_root = None  # First path component (e.g. "EPW5970-3200GB-result").
-        with tarfile.open(target, "r") as tar:
-            for member in tar.getmembers():
-                if inner_root is None:
-                    head = member.name.split("/", 1)[0]
-                    if head and head not in (".", ".."):
-                        inner_root = head
-                if member.isfile() and member.name.lower().endswith((".png", ".jpg", ".jpeg")) and "report_view" in member.name:
-                    cache_name = clean_name(member.name.replace("/", "_"), "image")
-                    cache_file = cache_dir / cache_name
-                    if not cache_file.exists():
-                        extracted = tar.extractfile(member)
-                        if extracted:
-                            cache_file.write_bytes(extracted.read())
-                    images.append({
-                        "name": cache_name,
-                        "url": f"/api/result-files/.cache/{cache_dir.name}/{cache_name}",
-                        "tags": parse_image_tags(member.name),
-                    })
+        # Extraction runs in the background (image_cache); list what is
+        # cached so far and let result_images_ready prompt a refresh.
+        extraction = image_cache.archive_images(target, cache_dir, result_name)
+        for item in extraction["images"]:
+            images.append(_image_entry(
+                cache_dir / item["name"],
+                item["name"],
+                f"/api/result-files/.cache/{cache_dir.name}/{item['name']}",
+                item["member"],
+            ))
+        inner_root = extraction["inner_root"]
         # Q3a fallback: snapshot PNGs are written by the browser to the backend's
-        # local `RESULTS_DIR/.test-temp-data/<inner-root>/.../report_view/` path,
-        # but the tarball is built on the remote SUT and never sees them. If the
-        # archive came in empty-of-PNGs, surface those loose files.
-        if not images and inner_root:
-            loose_root = RESULTS_DIR / ".test-temp-data" / inner_root
-            if loose_root.is_dir():
+        # local `RESULTS_DIR/.test-temp-data/[<staging-key>/]<inner-root>/.../report_view/`
+        # path, but the tarball is built on the remote SUT and never sees them. If
+        # the archive came in empty-of-PNGs, surface those loose files.
+        if not images and inner_root and extraction["status"] == "complete":
+            temp_root = RESULTS_DIR / ".test-temp-data"
+            candidates = [temp_root / inner_root] + sorted(temp_root.glob(f"*/{inner_root}"))
+            loose_root = next((path for path in candidates if path.is_dir()), None)
+            if loose_root is not None:
                 seen = set()
                 for image in loose_root.rglob("*"):
                     if not (image.is_file() and image.suffix.lower() in (".png", ".jpg", ".jpeg")):
@@ -567,40 +629,51 @@ def collect_result_images(result_name: str) -> List[Dict[str, Any]]:
                         continue
                     seen.add(image.name)
                     rel_path = str(image.relative_to(RESULTS_DIR))
-                    images.append({
-                        "name": image.name,
-                        "url": f"/api/result-files/{rel_path}",
-                        "tags": parse_image_tags(str(image)),
-                    })
-    return images
-
-
-def list_result_entries() -> List[Dict[str, Any]]:
-    results: List[Dict[str, Any]] = []
-    if not RESULTS_DIR.exists():
-        return results
-    for item in RESULTS_DIR.iterdir():
-        if item.name.startswith("."):
-            continue
-        if item.is_file() and item.name.lower().endswith((".tar", ".tar.gz", ".tgz", ".json")):
-            results.append({
-                "name": item.name,
-                "type": "archive",
-                "created": datetime.fromtimestamp(item.stat().st_mtime).isoformat(),
-                "size": item.stat().st_size,
-            })
-        elif item.is_dir():
-            has_csv = any(item.rglob("*.csv"))
-            is_result_folder = item.name.endswith("-result")
-            if has_csv or is_result_folder:
-                results.append({
-                    "name": item.name,
-                    "type": "folder",
-                    "created": datetime.fromtimestamp(item.stat().st_mtime).isoformat(),
-                    "files": [],
-                })
-    results.sort(key=lambda entry: entry["created"], reverse=True)
-    return results
+                    images.append(_image_entry(image, image.name, f"/api/result-files/{rel_path}", str(image)))
+    return images, extraction
+
+
+def describe_result_entry(name: str, path: str) -> Optional[Dict[str, Any]]:
+    """Catalog metadata for one top-level RESULTS_DIR entry (None = hide)."""
+    target = Path(path)
+    rows = collect_optional_result_rows(name, None)
+    if target.is_file():
+        size = target.stat().st_size
+        has_csv = False
+    else:
+        # One walk for both the folder size and the CSV check.
+        size = 0
+        has_csv = False
+        for dirpath, _, filenames in os.walk(target):
+            for filename in filenames:
+                try:
+                    size += os.stat(os.path.join(dirpath, filename)).st_size
+                except OSError:
+                    continue
+                has_csv = has_csv or filename.endswith(".csv")
+        if not rows and not name.endswith("-result") and not has_csv:
+            return None
+    raid_types = sorted({
+        str(row.get("RAID_type"))
+        for row in rows
+        if row.get("RAID_type") not in (None, "", "N/A", "SingleTest")
+    })
+    models: Dict[str, int] = {}
+    for row in rows:
+        model = (row.get("SSD") or "").strip()
+        if model and model != "N/A":
+            models[model] = models.get(model, 0) + 1
+    return {
+        "size": size,
+        "raid_types": raid_types,
+        "ssd_model": max(models, key=models.get) if models else None,
+        "controllers": sorted({row["controller"] for row in rows if row.get("controller")}),
+        "row_count": len(rows),
+    }
+
+
+results_catalog = ResultsCatalog(RESULTS_DIR, CACHE_DIR / "catalog.json", describe_result_entry)
+result_frames = ResultFrameCache(collect_optional_result_rows, export_dir=CACHE_DIR / "arrow")
 
 
 @app.get("/api/config", tags=["Config"])
@@ -687,25 +760,44 @@ def update_config(payload: Dict[str, Any]):
 
 @app.get("/api/system-info", tags=["System"])
 @app.post("/api/system-info", tags=["System"])
-def get_system_info(body: Optional[SystemInfoRequest] = None):
+async def get_system_info(body: Optional[SystemInfoRequest] = None):
     cpu_count = psutil.cpu_count(logical=False)
     cpu_freq = psutil.cpu_freq()
     memory = psutil.virtual_memory()
     config = get_effective_config(body.config if body else None)
     executor = RemoteExecutor(config)
+    dut = fleet.dut_key(config)
 
-    nvme_info: List[Dict[str, Any]] = []
-    try:
-        res = executor.run(["graidctl", "ls", "nd", "--format", "json"], capture_output=True, text=True)
+    async def cached(kind: str, fetch, default):
+        try:
+            return await inventory_cache.get(dut, kind, fetch)
+        except Exception as exc:
+            logger.warning("%s query failed: %s", kind, exc)
+            return default
+
+    async def graidctl_list(resource: str) -> List[Dict[str, Any]]:
+        res = await executor.arun(["graidctl", "ls", resource, "--format", "json"], capture_output=True, text=True)
         if res.returncode == 0:
             start = res.stdout.find("{")
             if start != -1:
-                nvme_info = json.loads(res.stdout[start:]).get("Result", [])
-    except Exception as exc:
-        logger.warning("graidctl nd failed: %s", exc)
-
-    pcie_map = _collect_nvme_pcie_info(executor)
-    usage_map = _collect_device_usage(executor)
+                return json.loads(res.stdout[start:]).get("Result", [])
+        return []
+
+    async def remote_hostname() -> str:
+        res = await executor.arun(["hostname"], capture_output=True, text=True)
+        return res.stdout.strip() if res.returncode == 0 else ""
+
+    # Independent DUT queries share one SSH connection; run them together.
+    nvme_info, pcie_map, usage_map, controller_info, hostname, gpu_perf = await asyncio.gather(
+        cached("nvme", lambda: graidctl_list("nd"), []),
+        cached("pcie", lambda: executor.acall(_collect_nvme_pcie_info, executor), {}),
+        cached("usage", lambda: executor.acall(_collect_device_usage, executor), {}),
+        cached("controller", lambda: graidctl_list("cx"), []),
+        cached("hostname", remote_hostname, "Unknown"),
+        cached("gpu", lambda: executor.acall(_collect_gpu_perf, executor), []),
+    )
+    # Cached entries are shared; annotate copies.
+    nvme_info = [dict(dev) for dev in nvme_info]
     for dev in nvme_info:
         dev_name = Path(dev.get("DevPath", "")).name
         dev.update(pcie_map.get(dev_name, {}))
@@ -714,24 +806,6 @@ def get_system_info(body: Optional[SystemInfoRequest] = None):
             dev["in_use"] = True
             dev["use_reasons"] = reasons
 
-    controller_info: List[Dict[str, Any]] = []
-    try:
-        res = executor.run(["graidctl", "ls", "cx", "--format", "json"], capture_output=True, text=True)
-        if res.returncode == 0:
-            start = res.stdout.find("{")
-            if start != -1:
-                controller_info = json.loads(res.stdout[start:]).get("Result", [])
-    except Exception as exc:
-        logger.warning("graidctl cx failed: %s", exc)
-
-    hostname = "Unknown"
-    try:
-        res = executor.run(["hostname"], capture_output=True, text=True)
-        if res.returncode == 0:
-            hostname = res.stdout.strip()
-    except Exception:
-        pass
-
     return ok({
         "cpu_cores": cpu_count,
         "cpu_freq": cpu_freq.current if cpu_freq else None,
@@ -739,23 +813,28 @@ def get_system_info(body: Optional[SystemInfoRequest] = None):
         "memory_available_gb": memory.available / (1024 ** 3),
         "nvme_info": nvme_info,
         "controller_info": controller_info,
-        "gpu_perf": _collect_gpu_perf(executor),
-        "hostname": hostname,
+        "gpu_perf": gpu_perf,
+        "hostname": hostname or "Unknown",
     })
 
 
 @app.get("/api/license-info", tags=["System"])
 @app.post("/api/license-info", tags=["System"])
-def get_license_info(body: Optional[SystemInfoRequest] = None):
+async def get_license_info(body: Optional[SystemInfoRequest] = None):
     config = get_effective_config(body.config if body else None)
     executor = RemoteExecutor(config)
-    license_info: Dict[str, Any] = {}
-    try:
-        res = executor.run(["graidctl", "desc", "lic", "--format", "json"], capture_output=True, text=True)
+
+    async def fetch_license() -> Dict[str, Any]:
+        res = await executor.arun(["graidctl", "desc", "lic", "--format", "json"], capture_output=True, text=True)
         if res.returncode == 0:
             start = res.stdout.find("{")
             if start != -1:
-                license_info = json.loads(res.stdout[start:]).get("Result", {})
+                return json.loads(res.stdout[start:]).get("Result", {})
+        return {}
+
+    license_info: Dict[str, Any] = {}
+    try:
+        license_info = await inventory_cache.get(fleet.dut_key(config), "license", fetch_license)
     except Exception as exc:
         logger.warning("graidctl lic failed: %s", exc)
     return ok(license_info)
@@ -827,6 +906,7 @@ def setup_dut(body: ConnectionTestRequest):
     executor.run(["mkdir", "-p", "/tmp/graid-setup"])
     executor.sync_to_remote(str(setup_script), "/tmp/graid-setup/setup_env.sh")
     res = executor.run(["bash", "/tmp/graid-setup/setup_env.sh", "--dut-mode"], capture_output=True, text=True)
+    inventory_cache.invalidate(fleet.dut_key(body.config))
     if res.returncode != 0:
         audit_event("dut.setup_failed", target=body.config.get("DUT_IP"), stderr=res.stderr)
         err(res.stderr or "Setup script failed")
@@ -837,44 +917,192 @@ def setup_dut(body: ConnectionTestRequest):
 @app.post("/api/benchmark/start", tags=["Benchmark"], dependencies=[Depends(require_api_key)])
 def start_benchmark(body: StartBenchmarkRequest):
     run_id = generate_run_id()
-    thread = benchmark_manager.try_start(body.config, body.session_id, run_id)
+    slot = fleet.slot_for(body.config)
+    thread = slot.try_start(body.config, body.session_id, run_id)
     if thread is None:
-        err("Another benchmark is already running", 409)
+        err(f"Another benchmark is already running on {slot.dut}", 409)
+    # Remember the submitted form. Queued and resumed runs start their slots
+    # directly and leave the saved config alone.
+    ConfigManager.save_config(body.config)
     audit_event(
         "benchmark.start",
         run_id=run_id,
+        dut=slot.dut,
         session_id=body.session_id,
         config=public_config(body.config),
     )
-    return ok({"run_id": run_id}, message="Benchmark started")
+    return ok({"run_id": run_id, "dut": slot.dut}, message="Benchmark started")
+
+
+@app.get("/api/benchmark/resumable", tags=["Benchmark"])
+def list_resumable_runs():
+    return ok({"runs": list(ResumableRuns.load().values())})
+
+
+@app.post("/api/benchmark/resumable/{dut}/discard", tags=["Benchmark"], dependencies=[Depends(require_api_key)])
+def discard_resumable_run(dut: str):
+    """Forget an interrupted run instead of resuming it. Its DUT's queued
+    runs were held while it was resumable; they start now."""
+    record = ResumableRuns.pop(dut)
+    if record is None:
+        err("No resumable benchmark", 404)
+    audit_event("benchmark.discard_resumable", run_id=record.get("run_id"), dut=dut)
+    run_queue.dispatch(fleet)
+    return ok({"run_id": record.get("run_id"), "dut": dut}, message="Resumable benchmark discarded")
+
+
+@app.post("/api/benchmark/resume", tags=["Benchmark"], dependencies=[Depends(require_api_key)])
+def resume_benchmark(body: ResumeBenchmarkRequest):
+    """Restart an interrupted run with RESUME=true: the same matrix runs in
+    the run's existing .test-temp-data dir and checkpointed cells are skipped.
+
+    A run the backend lost track of on restart (no stored password) is
+    reattached instead when it is still running on the DUT."""
+    runs = ResumableRuns.load()
+    if body.dut:
+        record = runs.get(body.dut)
+    else:
+        record = next(iter(runs.values()), None) if len(runs) == 1 else None
+    if record is None:
+        if runs and not body.dut:
+            err("Several resumable benchmarks; pass dut", 400)
+        err("No resumable benchmark", 404)
+    config = dict(record["config"], RESUME=True)
+    if body.password:
+        config["DUT_PASSWORD"] = body.password
+    if config.get("REMOTE_MODE") and not config.get("DUT_PASSWORD"):
+        err("DUT password required to resume a remote benchmark", 400)
+    slot = fleet.slot(record["dut"])
+    if slot.running:
+        err(f"Another benchmark is already running on {slot.dut}", 409)
+    saved_state = record.get("state")
+    if saved_state:
+        # Put the state back for later restarts; recover_state clears it
+        # (and re-records the run as resumable) if the run is gone.
+        BenchmarkState.save(saved_state, slot.state_file)
+        reattach_config = dict(record["config"], DUT_PASSWORD=config.get("DUT_PASSWORD"))
+        if slot.recover_state({**saved_state, "config": reattach_config, "session_id": body.session_id}):
+            ResumableRuns.pop(slot.dut)
+            audit_event("benchmark.reattach", run_id=saved_state.get("run_id"), dut=slot.dut,
+                        session_id=body.session_id)
+            return ok({"run_id": saved_state.get("run_id"), "dut": slot.dut, "reattached": True},
+                      message="Reattached to the running benchmark")
+    # Reconnect and make sure the checkpoints are still there; a run that
+    # finished while nobody could reach the DUT has nothing left to resume.
+    executor = RemoteExecutor(config)
+    try:
+        partial = partial_results_left(executor, config, slot.dut)
+    except (ConnectionError, PermissionError, ValueError) as exc:
+        err(f"Cannot reach {slot.dut}: {exc}", 502)
+    finally:
+        executor.close()
+    if not partial:
+        ResumableRuns.pop(slot.dut)
+        err(f"No partial results left on {slot.dut}; nothing to resume", 409)
+    run_id = generate_run_id()
+    if slot.try_start(config, body.session_id, run_id) is None:
+        err(f"Another benchmark is already running on {slot.dut}", 409)
+    audit_event("benchmark.resume", run_id=run_id, resumed_run_id=record.get("run_id"), dut=slot.dut,
+                session_id=body.session_id)
+    return ok({"run_id": run_id, "dut": slot.dut, "resumed_run_id": record.get("run_id")}, message="Benchmark resumed")
+
+
+@app.get("/api/queue", tags=["Queue"])
+def list_queue():
+    return ok({"entries": run_queue.list(), "running": sorted(fleet.active_run_ids())})
+
+
+@app.post("/api/queue", tags=["Queue"], dependencies=[Depends(require_api_key)])
+def enqueue_benchmark(body: EnqueueBenchmarkRequest):
+    entry = run_queue.enqueue(body.config, body.session_id, body.label)
+    audit_event("queue.enqueue", entry_id=entry["id"], session_id=body.session_id, config=public_config(body.config))
+    # Idle DUT: the new entry starts right away.
+    started = {item["id"]: item for item in run_queue.dispatch(fleet)}
+    return ok({"entry": started.get(entry["id"], entry)}, message="Benchmark queued")
+
+
+@app.post("/api/queue/reorder", tags=["Queue"], dependencies=[Depends(require_api_key)])
+def reorder_queue(body: ReorderQueueRequest):
+    try:
+        entries = run_queue.reorder(body.ids)
+    except QueueError as exc:
+        err(str(exc), 400)
+    audit_event("queue.reorder", ids=body.ids)
+    return ok({"entries": entries}, message="Queue reordered")
+
+
+@app.post("/api/queue/{entry_id}/cancel", tags=["Queue"], dependencies=[Depends(require_api_key)])
+def cancel_queue_entry(entry_id: str):
+    try:
+        entry = run_queue.cancel(entry_id)
+    except QueueError as exc:
+        err(str(exc), 400)
+    audit_event("queue.cancel", entry_id=entry_id)
+    return ok({"entry": entry}, message="Queue entry cancelled")
+
+
+@app.post("/api/queue/{entry_id}/resume", tags=["Queue"], dependencies=[Depends(require_api_key)])
+def resume_queue_entry(entry_id: str, body: Optional[ResumeQueueRequest] = None):
+    try:
+        entry = run_queue.resume(entry_id, body.password if body else None)
+    except QueueError as exc:
+        err(str(exc), 400)
+    audit_event("queue.resume", entry_id=entry_id)
+    started = {item["id"]: item for item in run_queue.dispatch(fleet)}
+    return ok({"entry": started.get(entry_id, entry)}, message="Queue entry resumed")
+
+
+def queue_completion_hook(run_id: Optional[str], session_id: Optional[str], succeeded: bool) -> None:
+    """Close the finished run's queue entry and start whatever is next on
+    the idle DUTs."""
+    finished = run_queue.on_run_finished(run_id, succeeded)
+    if finished:
+        audit_event("queue.finished", entry_id=finished["id"], run_id=run_id, status=finished["status"])
+    run_queue.dispatch(fleet)
 
 
 @app.post("/api/benchmark/stop", tags=["Benchmark"], dependencies=[Depends(require_api_key)])
 def stop_benchmark(body: StopBenchmarkRequest):
-    active_run_id = resolve_active_run_id()
-    if body.run_id and active_run_id and body.run_id != active_run_id:
-        err("Run ID does not match the active benchmark", 409)
-    stopped_run_id = benchmark_manager.stop_benchmark()
+    slot = resolve_run_slot(body.run_id)
+    active_run_id = resolve_active_run_id(slot)
+    stopped_run_id = slot.stop_benchmark()
     audit_event("benchmark.stop", run_id=stopped_run_id or active_run_id)
     return ok({"run_id": stopped_run_id or active_run_id}, message="Benchmark stopped")
 
 
 @app.get("/api/benchmark/status", tags=["Benchmark"])
-def get_benchmark_status():
-    saved_state = resolve_saved_state()
+def get_benchmark_status(run_id: Optional[str] = Query(default=None), dut: Optional[str] = Query(default=None)):
+    """Status of one run slot: `run_id` or `dut` picks it, otherwise the most
+    recently started run (see /api/fleet for all DUTs)."""
+    slot = fleet.select(run_id, dut) or fleet.select()
+    saved_state = resolve_saved_state(slot)
     return ok({
-        "running": benchmark_manager.running,
-        "run_id": resolve_active_run_id(),
-        "progress": benchmark_manager.latest_progress,
-        "stage_info": benchmark_manager.current_stage_info,
-        "session_id": benchmark_manager.session_id or (saved_state or {}).get("session_id"),
+        "dut": slot.dut,
+        "running": slot.running,
+        "run_id": resolve_active_run_id(slot),
+        "progress": slot.latest_progress,
+        "stage_info": slot.current_stage_info,
+        "session_id": slot.session_id or (saved_state or {}).get("session_id"),
         "active_state": saved_state,
     })
 
 
+@app.get("/api/fleet", tags=["Benchmark"])
+def get_fleet_status():
+    slots = sorted(fleet.slots(), key=lambda slot: slot.dut)
+    return ok({
+        "slots": [slot.status() for slot in slots],
+        "running": sum(1 for slot in slots if slot.running),
+    })
+
+
 @app.get("/api/benchmark/logs", tags=["Benchmark"])
-def get_benchmark_logs(lines: int = Query(default=100, ge=1, le=500)):
-    log_file = benchmark_manager.current_log_file
+def get_benchmark_logs(
+    lines: int = Query(default=100, ge=1, le=500),
+    run_id: Optional[str] = Query(default=None),
+    dut: Optional[str] = Query(default=None),
+):
+    log_file = (fleet.select(run_id, dut) or fleet.select()).current_log_file
     if not log_file and LOGS_DIR.exists():
         logs = sorted(LOGS_DIR.glob("benchmark_*.log"), key=lambda item: item.stat().st_mtime, reverse=True)
         if logs:
@@ -886,26 +1114,35 @@ def get_benchmark_logs(lines: int = Query(default=100, ge=1, le=500)):
 
 
 @app.post("/api/graid/check", tags=["GRAID"])
-def check_graid_resources(body: Optional[GraidResetRequest] = None):
+async def check_graid_resources(body: Optional[GraidResetRequest] = None):
     config = get_effective_config(body.config if body else None)
     executor = RemoteExecutor(config)
-    has_resources = False
-    findings: List[str] = []
-    for resource, label in (("vd", "VDs"), ("dg", "DGs"), ("pd", "PDs")):
-        res = executor.run(["graidctl", "ls", resource, "--format", "json"], capture_output=True, text=True)
-        if res.returncode == 0:
-            items = parse_graidctl_json(res.stdout).get("Result", [])
-            if items:
-                has_resources = True
-                findings.append(f"{len(items)} {label}")
-    return {"success": True, "has_resources": has_resources, "findings": findings}
+
+    async def fetch_resources() -> Dict[str, Any]:
+        has_resources = False
+        findings: List[str] = []
+        resources = (("vd", "VDs"), ("dg", "DGs"), ("pd", "PDs"))
+        results = await asyncio.gather(*(
+            executor.arun(["graidctl", "ls", resource, "--format", "json"], capture_output=True, text=True)
+            for resource, _ in resources
+        ))
+        for (resource, label), res in zip(resources, results):
+            if res.returncode == 0:
+                items = parse_graidctl_json(res.stdout).get("Result", [])
+                if items:
+                    has_resources = True
+                    findings.append(f"{len(items)} {label}")
+        return {"has_resources": has_resources, "findings": findings}
+
+    found = await inventory_cache.get(fleet.dut_key(config), "graid", fetch_resources)
+    return {"success": True, **found}
 
 
 @app.post("/api/graid/reset", tags=["GRAID"], dependencies=[Depends(require_api_key)])
 def reset_graid_resources(body: Optional[GraidResetRequest] = None):
-    if benchmark_manager.running:
-        err("Cannot reset while benchmark is running", 400)
     config = get_effective_config(body.config if body else None)
+    if fleet.slot_for(config).running:
+        err("Cannot reset while benchmark is running", 400)
     executor = RemoteExecutor(config)
     details: List[str] = []
 
@@ -964,13 +1201,22 @@ def reset_graid_resources(body: Optional[GraidResetRequest] = None):
         except Exception as exc:
             logger.error("PD delete error: %s", exc)
 
+    inventory_cache.invalidate(fleet.dut_key(config))
     audit_event("graid.reset", target=config.get("DUT_IP"), details=details)
     return ok({"details": details}, message=f"Reset complete: {', '.join(details) or 'nothing to delete'}")
 
 
 @app.get("/api/results", tags=["Results"])
-def list_results():
-    return ok(list_result_entries())
+def list_results(
+    limit: Optional[int] = Query(default=None, ge=1, le=1000),
+    offset: int = Query(default=0, ge=0),
+    sort: str = Query(default="-created", pattern=r"^[-+]?(created|name|size|row_count|type)$"),
+    filter: Optional[str] = Query(default=None, max_length=200),
+):
+    entries, total = results_catalog.query(limit=limit, offset=offset, sort=sort, filter_text=filter)
+    payload = ok(entries)
+    payload.update({"total": total, "limit": limit, "offset": offset, "building": results_catalog.building})
+    return payload
 
 
 @app.get("/api/results/{result_name}/info", tags=["Results"])
@@ -983,9 +1229,116 @@ def get_result_data(result_name: str, type: Optional[str] = Query(default=None))
     return ok(collect_result_rows(result_name, type))
 
 
+@app.post("/api/results/query", tags=["Results"])
+def query_results(body: ResultQueryRequest):
+    for result_name in body.results:
+        get_result_target(result_name)
+    try:
+        data = run_query(
+            result_frames,
+            body.results,
+            req_type=body.type,
+            columns=body.columns,
+            filters=body.filters,
+            group_by=body.group_by,
+            aggregations=body.aggregations,
+            limit=body.limit,
+        )
+    except QueryError as exc:
+        err(str(exc), 400)
+    return ok(data)
+
+
+@app.get("/api/results/{result_name}/data.arrow", tags=["Results"])
+def get_result_data_arrow(result_name: str, type: Optional[str] = Query(default=None, pattern="^(baseline|graid)$")):
+    get_result_target(result_name)
+    if result_frames.get(result_name, type).empty:
+        err("No CSV data found", 404)
+    try:
+        path = result_frames.export_arrow(result_name, type)
+    except ImportError:
+        err("Arrow export requires pyarrow on the backend", 501)
+    return FileResponse(
+        path,
+        media_type="application/vnd.apache.arrow.file",
+        filename=f"{clean_name(result_name, 'result')}-{type or 'all'}.arrow",
+    )
+
+
+@app.post("/api/results/compare", tags=["Results"])
+def compare_results(body: CompareResultsRequest):
+    baseline_rows = collect_optional_result_rows(body.baseline, body.type)
+    candidate_rows = collect_optional_result_rows(body.candidate, body.type)
+    if not baseline_rows or not candidate_rows:
+        err("No CSV data found", 404)
+    report = compare_runs(baseline_rows, candidate_rows, body.thresholds)
+    return ok({"baseline": body.baseline, "candidate": body.candidate, **report})
+
+
+def regression_completion_hook(run_id: Optional[str], session_id: Optional[str], succeeded: bool) -> None:
+    """Compare the run that just finished against the previous run of the
+    same SSD model and publish the report as `regression_report`.
+
+    The finished run is the archive it reported (STATUS: RESULT); without
+    one the check is skipped rather than guessed from the newest entry."""
+    import config as _config_module
+
+    if not succeeded:
+        return
+    result_name = fleet.result_name(run_id)
+    if not result_name:
+        logger.info("regression check skipped: run %s reported no result archive", run_id)
+        return
+    results_catalog.invalidate(result_name)
+    results_catalog.refresh()
+    entries, _ = results_catalog.query(sort="-created")
+    index = next((i for i, entry in enumerate(entries) if entry["name"] == result_name), None)
+    if index is None:
+        logger.info("regression check skipped: %s (run %s) is not in the results catalog", result_name, run_id)
+        return
+    candidate = entries[index]
+    model = candidate.get("ssd_model")
+    baseline = next((entry for entry in entries[index + 1:] if model and entry.get("ssd_model") == model), None)
+    if baseline is None:
+        logger.info("regression check skipped: no earlier run for %s", model or candidate["name"])
+        return
+    report = compare_runs(
+        collect_optional_result_rows(baseline["name"], None),
+        collect_optional_result_rows(candidate["name"], None),
+        settings.regression_thresholds,
+    )
+    audit_event(
+        "results.regression_check",
+        run_id=run_id,
+        baseline=baseline["name"],
+        candidate=candidate["name"],
+        regressions=len(report["regressions"]),
+        improvements=len(report["improvements"]),
+    )
+    _config_module.socketio.emit(
+        "regression_report",
+        {"run_id": run_id, "baseline": baseline["name"], "candidate": candidate["name"], **report},
+        room=session_id or "default",
+    )
+
+
+@app.get("/api/results/{result_name}/chart-data", tags=["Results"])
+def get_result_chart_data(result_name: str):
+    """Numeric series behind the PD vs VD/MD comparison charts, columnar."""
+    baseline_rows = collect_optional_result_rows(result_name, "baseline")
+    raid_rows = collect_optional_result_rows(result_name, "graid")
+    if not baseline_rows and not raid_rows:
+        err("No CSV data found", 404)
+    return ok(build_chart_series(baseline_rows, raid_rows))
+
+
 @app.get("/api/results/{result_name}/images", tags=["Results"])
 def get_result_images(result_name: str):
-    return {"success": True, "images": collect_result_images(result_name)}
+    images, extraction = collect_result_images(result_name)
+    payload: Dict[str, Any] = {"success": True, "images": images}
+    if extraction is not None:
+        payload["extraction"] = {key: extraction[key] for key in ("status", "extracted", "error")}
+    return payload
 
 
 @app.post("/api/results/{result_name}/clear-cache", tags=["Results"], dependencies=[Depends(require_api_key)])
@@ -993,6 +1346,8 @@ def clear_result_cache(result_name: str):
     target = CACHE_DIR / clean_name(result_name)
     if target.exists():
         shutil.rmtree(target)
+    results_catalog.invalidate(result_name)
+    result_frames.invalidate(result_name)
     audit_event("results.clear_cache", result_name=result_name)
     return ok()
 
@@ -1023,7 +1378,11 @@ def download_result(result_name: str):
 
 
 @app.get("/api/result-files/{filename:path}", tags=["Results"])
-def get_result_file(filename: str):
+def get_result_file(
+    filename: str,
+    size: str = Query(default="full", pattern="^(thumb|full)$"),
+    image_format: Optional[str] = Query(default=None, alias="format", pattern="^(png|webp)$"),
+):
     normalized = normalize_relative_path(filename)
     candidates = [
         (RESULTS_DIR / normalized).resolve(),
@@ -1036,22 +1395,27 @@ def get_result_file(filename: str):
         err("Result file not found", 404)
     if not any(str(target).startswith(str(root)) for root in allowed_roots) or not target.exists():
         err("Result file not found", 404)
+    if target.suffix.lower() in (".png", ".jpg", ".jpeg") and (size != "full" or image_format):
+        # Falls back to the original until the background derivative is ready.
+        derivative = image_cache.lookup(target, size, image_format)
+        if derivative is not None:
+            return FileResponse(derivative, media_type=f"image/{derivative.suffix.lstrip('.')}")
     return FileResponse(target)
 
 
 @app.post("/api/benchmark/trigger_snapshot", tags=["Benchmark"], dependencies=[Depends(require_api_key)])
 async def trigger_snapshot(body: SnapshotRequest):
-    active_run_id = resolve_active_run_id()
-    if body.run_id and active_run_id and body.run_id != active_run_id:
-        err("Run ID does not match the active benchmark", 409)
+    slot = resolve_run_slot(body.run_id)
+    active_run_id = resolve_active_run_id(slot)
     await sio.emit(
         "snapshot_request",
         {
             "run_id": body.run_id or active_run_id,
+            "dut": slot.dut,
             "test_name": clean_name(body.test_name, "snapshot"),
             "output_dir": normalize_relative_path(body.output_dir),
         },
-        room=benchmark_manager.session_id or "default",
+        room=slot.rooms(slot.session_id or "default"),
     )
     audit_event("snapshot.trigger", run_id=body.run_id or active_run_id)
     return ok(message="Snapshot requested")
@@ -1059,11 +1423,13 @@ async def trigger_snapshot(body: SnapshotRequest):
 
 @app.post("/api/benchmark/save_snapshot", tags=["Benchmark"], dependencies=[Depends(require_api_key)])
 def save_snapshot(body: SaveSnapshotRequest):
-    active_run_id = resolve_active_run_id()
-    if body.run_id and active_run_id and body.run_id != active_run_id:
-        err("Run ID does not match the active benchmark", 409)
+    slot = resolve_run_slot(body.run_id)
+    active_run_id = resolve_active_run_id(slot)
 
     encoded = body.image.split(",", 1)[1] if "," in body.image else body.image
+    # Reject before decoding; prefer /save_snapshot/upload for binary bodies.
+    if len(encoded) * 3 // 4 > MAX_SNAPSHOT_BYTES:
+        err("Snapshot too large", 413)
     image_binary = base64.b64decode(encoded)
     if len(image_binary) > MAX_SNAPSHOT_BYTES:
         err("Snapshot too large", 413)
@@ -1077,25 +1443,146 @@ def save_snapshot(body: SaveSnapshotRequest):
     out_path.write_bytes(image_binary)
     audit_event("snapshot.save", run_id=body.run_id or active_run_id, path=str(out_path.relative_to(RESULTS_DIR)))
 
-    # Q3b: When the benchmark runs on a remote SUT, the tar packaging step in
-    # graid-bench.sh:615 runs there and only sees files under the remote's
-    # `<base>/results/.test-temp-data/...`. Push the freshly written snapshot
-    # to the same relative path on the remote so it gets included in the
-    # archive. Best-effort — local save is the source of truth.
-    runtime_config = benchmark_manager.runtime_config
-    if runtime_config and runtime_config.get("REMOTE_MODE"):
-        try:
-            executor = RemoteExecutor(runtime_config)
-            try:
-                executor.sync_to_remote(str(out_path), str(out_path))
-            finally:
-                executor.close()
-        except Exception as exc:
-            logger.warning("snapshot remote sync skipped: %s", exc)
+    # Q3b: push to the DUT so graid-bench.sh's tar step includes it.
+    slot.push_snapshot(out_path)
 
     return ok({"saved_path": str(out_path)}, message="Snapshot saved")
 
 
+SNAPSHOT_CHUNK_BYTES = 64 * 1024
+
+
+def _snapshot_multipart_parser(content_type: str, on_image_data):
+    """Streaming parser for a multipart snapshot upload; `on_image_data`
+    gets the bytes of the `image` part as they are parsed. Returns
+    (parser, seen) where seen["image"] tells whether that part showed up."""
+    # Lazy import: python-multipart is only needed for this upload form.
+    try:
+        from python_multipart.multipart import MultipartParser, parse_options_header
+    except ImportError:  # python-multipart < 0.0.13
+        from multipart.multipart import MultipartParser, parse_options_header
+
+    _, params = parse_options_header(content_type)
+    boundary = params.get(b"boundary")
+    if not boundary:
+        err("Missing multipart boundary", 400)
+
+    seen = {"image": False}
+    part = {"field": b"", "value": b"", "image": False}
+
+    def on_part_begin():
+        part.update(field=b"", value=b"", image=False)
+
+    def on_header_field(data, start, end):
+        part["field"] += data[start:end]
+
+    def on_header_value(data, start, end):
+        part["value"] += data[start:end]
+
+    def on_header_end():
+        if part["field"].lower() == b"content-disposition":
+            _, disposition = parse_options_header(part["value"])
+            part["image"] = disposition.get(b"name") == b"image"
+            seen["image"] = seen["image"] or part["image"]
+        part.update(field=b"", value=b"")
+
+    def on_part_data(data, start, end):
+        if part["image"]:
+            on_image_data(data[start:end])
+
+    callbacks = {
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_part_data": on_part_data,
+    }
+    return MultipartParser(boundary, callbacks), seen
+
+
+async def _iter_snapshot_upload(request: Request):
+    """Yield the raw image bytes of an octet-stream or multipart upload.
+
+    Both are read off request.stream() as they arrive: the body is never
+    buffered whole, and its size is capped here too, since a chunked upload
+    carries no Content-Length to check up front."""
+    content_type = request.headers.get("content-type", "")
+    received = 0
+    if content_type.startswith("multipart/form-data"):
+        pending: List[bytes] = []
+        parser, seen = _snapshot_multipart_parser(content_type, pending.append)
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > MAX_SNAPSHOT_BYTES + SNAPSHOT_CHUNK_BYTES:
+                err("Snapshot too large", 413)
+            parser.write(chunk)
+            while pending:
+                yield pending.pop(0)
+        parser.finalize()
+        while pending:
+            yield pending.pop(0)
+        if not seen["image"]:
+            err("Missing image file field", 400)
+    else:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > MAX_SNAPSHOT_BYTES + SNAPSHOT_CHUNK_BYTES:
+                err("Snapshot too large", 413)
+            yield chunk
+
+
+@app.post("/api/benchmark/save_snapshot/upload", tags=["Benchmark"], dependencies=[Depends(require_api_key)])
+async def upload_snapshot(
+    request: Request,
+    test_name: str = Query(...),
+    output_dir: Optional[str] = Query(default=None),
+    run_id: Optional[str] = Query(default=None),
+):
+    """Binary variant of save_snapshot.
+
+    Accepts `application/octet-stream` (or `image/png`) bodies, or multipart
+    with an `image` file field, parsed as it streams in. The image is
+    written to a temp file next to the target, the size limit is enforced
+    per chunk, and the file is renamed into place only once complete.
+    """
+    slot = resolve_run_slot(run_id)
+    active_run_id = resolve_active_run_id(slot)
+
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > MAX_SNAPSHOT_BYTES + SNAPSHOT_CHUNK_BYTES:
+        err("Snapshot too large", 413)
+
+    normalized_dir = normalize_relative_path(output_dir)
+    save_dir = (RESULTS_DIR / normalized_dir / "report_view") if normalized_dir else (RESULTS_DIR / "report_view")
+    save_dir.mkdir(parents=True, exist_ok=True)
+    out_path = save_dir / f"{clean_name(test_name, 'snapshot')}_report_view.png"
+
+    tmp = tempfile.NamedTemporaryFile(dir=save_dir, prefix=".upload-", suffix=".part", delete=False)
+    written = 0
+    try:
+        with tmp:
+            async for chunk in _iter_snapshot_upload(request):
+                written += len(chunk)
+                if written > MAX_SNAPSHOT_BYTES:
+                    err("Snapshot too large", 413)
+                # Disk writes stay off the event loop, like push_snapshot.
+                await asyncio.to_thread(tmp.write, chunk)
+        if written == 0:
+            err("Empty snapshot upload", 400)
+        await asyncio.to_thread(os.replace, tmp.name, out_path)
+    except BaseException:
+        try:
+            os.unlink(tmp.name)
+        except FileNotFoundError:
+            pass
+        raise
+
+    audit_event("snapshot.save", run_id=run_id or active_run_id, path=str(out_path.relative_to(RESULTS_DIR)))
+    # Q3b: push to the DUT so graid-bench.sh's tar step includes it.
+    await asyncio.to_thread(slot.push_snapshot, out_path)
+    return ok({"saved_path": str(out_path), "bytes": written}, message="Snapshot saved")
+
+
 @app.get("/api/logs", tags=["Logs"])
 def list_logs():
     logs = sorted(LOGS_DIR.glob("*.log"), key=lambda item: item.stat().st_mtime, reverse=True)
@@ -1135,6 +1622,11 @@ async def _join_room(sid: str, data: Dict[str, Any]):
     session_id = data.get("session_id", "default")
     sio.enter_room(sid, session_id)
     logger.info("Client %s joined room %s", sid, session_id)
+    # Optional: follow a single run of the fleet (BenchmarkManager.rooms).
+    run_id = data.get("run_id")
+    if run_id:
+        sio.enter_room(sid, f"run:{run_id}")
+        logger.info("Client %s joined room run:%s", sid, run_id)
 
 
 @sio.event
@@ -1182,13 +1674,36 @@ async def on_startup():
 
     _config_module.socketio = _SioAdapter()
 
-    state = BenchmarkState.load()
-    if state:
-        try:
-            benchmark_manager.recover_state(state)
-            audit_event("benchmark.recover_attempt", run_id=state.get("run_id"), session_id=state.get("session_id"))
-        except Exception as exc:
-            logger.warning("Benchmark state recovery failed: %s", exc)
+    # Precise cache invalidation: each callback receives the top-level
+    # RESULTS_DIR entry name that changed.
+    results_watcher.register(results_catalog.invalidate)
+    results_watcher.register(result_frames.invalidate)
+    results_watcher.register(lambda name: image_cache.invalidate_archive(CACHE_DIR / clean_name(name)))
+    results_watcher.start()
+    # Built in the background; /api/results serves catalog.json meanwhile.
+    results_catalog.start()
+
+    fleet.completion_hooks.append(regression_completion_hook)
+    # After regression detection, so the report refers to the run that just
+    # finished rather than racing the next queued one.
+    fleet.completion_hooks.append(queue_completion_hook)
+
+    try:
+        for path, state in list(fleet.saved_states()):
+            audit_event("benchmark.recover_attempt", run_id=state.get("run_id"), session_id=state.get("session_id"),
+                        dut=fleet.dut_key(state.get("config")))
+        fleet.recover()
+    except Exception as exc:
+        logger.warning("Benchmark state recovery failed: %s", exc)
+
+    run_queue.reconcile(fleet.active_run_ids())
+    run_queue.dispatch(fleet)
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    results_watcher.stop()
+    results_catalog.stop()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,383 @@
+"""Thumbnail / WebP derivative cache and archive image extraction.
+
+Result pages can carry 100+ full-size report_view PNGs, while the gallery
+grid only shows small tiles. Derivatives are generated on a small worker
+pool and stored under CACHE_DIR/derivatives keyed by the source's content
+hash, so identical charts (a tarball and its extracted copy, re-synced
+results) share one set of files and a changed source never serves a stale
+derivative. Hashing happens on the worker, not while listing a gallery,
+and the oldest derivatives are pruned once the cache outgrows
+settings.derivative_cache_mb.
+
+Pillow is optional: without it no derivatives are produced and callers
+serve the original file.
+
+Archived results (.tar/.tar.gz) are extracted by a background job per
+archive: archive_images() starts it and returns immediately with whatever
+is already cached. The job streams the tarball once, writes each
+report_view image into the cache as it is reached, reports progress over
+Socket.IO and records a manifest so later requests skip the tarball. A
+failed job records a failure marker instead, so an unreadable tarball is
+not extracted again until it changes.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tarfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+from config import CACHE_DIR, clean_name, logger
+from settings import settings
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - optional dependency
+    Image = None
+
+DERIVATIVE_DIR = CACHE_DIR / "derivatives"
+
+SIZES = ("thumb", "full")
+FORMATS = ("png", "webp")
+THUMB_MAX_PX = (480, 360)
+WEBP_QUALITY = 80
+
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg")
+MANIFEST_NAME = ".manifest.json"
+FAILURE_NAME = ".failed.json"
+PROGRESS_EMIT_INTERVAL = 0.5  # seconds between result_images_progress events
+HASH_MEMO_ENTRIES = 4096
+PRUNE_INTERVAL = 300.0  # seconds between derivative cache size checks
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="image-cache")
+_extract_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="tar-extract")
+_lock = threading.Lock()
+# (path, size, mtime_ns) of sources queued for derivative generation.
+_pending = set()
+_last_prune = 0.0
+# str(cache_dir) -> job dict (status, extracted, inner_root, images, error)
+_jobs = {}
+# (path, size, mtime_ns) -> sha256 hex (LRU), so serving a derivative
+# does not re-hash the source on each request.
+_hash_memo = OrderedDict()
+
+
+def pillow_available():
+    return Image is not None
+
+
+def content_hash(path):
+    stat = path.stat()
+    memo_key = (str(path), stat.st_size, stat.st_mtime_ns)
+    with _lock:
+        cached = _hash_memo.get(memo_key)
+        if cached:
+            _hash_memo.move_to_end(memo_key)
+    if cached:
+        return cached
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    value = digest.hexdigest()
+    with _lock:
+        _hash_memo[memo_key] = value
+        _hash_memo.move_to_end(memo_key)
+        while len(_hash_memo) > HASH_MEMO_ENTRIES:
+            _hash_memo.popitem(last=False)
+    return value
+
+
+def derivative_path(digest, size, fmt):
+    return DERIVATIVE_DIR / digest[:2] / f"{digest}-{size}.{fmt}"
+
+
+def _variants():
+    # full.png is the source itself.
+    return [(size, fmt) for size in SIZES for fmt in FORMATS if (size, fmt) != ("full", "png")]
+
+
+def _generate(source, key):
+    try:
+        digest = content_hash(source)
+        missing = [(size, fmt) for size, fmt in _variants()
+                   if not derivative_path(digest, size, fmt).exists()]
+        if not missing:
+            return
+        with Image.open(source) as opened:
+            image = opened.convert("RGBA") if opened.mode not in ("RGB", "RGBA") else opened.copy()
+        for size, fmt in missing:
+            target = derivative_path(digest, size, fmt)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            variant = image
+            if size == "thumb":
+                variant = image.copy()
+                variant.thumbnail(THUMB_MAX_PX)
+            # Two sources with the same content may be generated at once.
+            tmp = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            if fmt == "webp":
+                variant.save(tmp, format="WEBP", quality=WEBP_QUALITY, method=4)
+            else:
+                variant.save(tmp, format="PNG", optimize=True)
+            os.replace(tmp, target)
+        _maybe_prune()
+    except Exception as exc:
+        logger.warning("image derivative generation failed for %s: %s", source, exc)
+    finally:
+        with _lock:
+            _pending.discard(key)
+
+
+def schedule(source):
+    """Queue derivative generation for `source`.
+
+    Only stats the file; hashing and the existence check run on the worker.
+    """
+    if Image is None:
+        return
+    try:
+        stat = source.stat()
+    except OSError as exc:
+        logger.debug("image derivative skipped for %s: %s", source, exc)
+        return
+    key = (str(source), stat.st_size, stat.st_mtime_ns)
+    with _lock:
+        if key in _pending:
+            return
+        _pending.add(key)
+    _executor.submit(_generate, source, key)
+
+
+def prune_derivatives(max_bytes=None):
+    """Delete the least recently used derivatives until the cache fits.
+
+    `max_bytes` defaults to settings.derivative_cache_mb; 0 keeps
+    everything. Returns the number of files removed.
+    """
+    if max_bytes is None:
+        max_bytes = int(settings.derivative_cache_mb * 1024 * 1024)
+    if not max_bytes or not DERIVATIVE_DIR.exists():
+        return 0
+    files = []
+    total = 0
+    for path in DERIVATIVE_DIR.glob("*/*"):
+        if path.name.startswith("."):
+            continue
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        files.append((stat.st_mtime, stat.st_size, path))
+        total += stat.st_size
+    removed = 0
+    for _, size, path in sorted(files):
+        if total <= max_bytes:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
+
+
+def _maybe_prune():
+    global _last_prune
+    now = time.monotonic()
+    with _lock:
+        if now - _last_prune < PRUNE_INTERVAL:
+            return
+        _last_prune = now
+    removed = prune_derivatives()
+    if removed:
+        logger.info("image derivative cache pruned %d file(s)", removed)
+
+
+def lookup(source, size="full", fmt=None):
+    """Return the derivative path for `source`, or None to serve the original.
+
+    A miss schedules generation, so the next request gets the derivative.
+    """
+    fmt = fmt or "png"
+    if (size, fmt) == ("full", "png") or Image is None:
+        return None
+    try:
+        digest = content_hash(source)
+    except OSError:
+        return None
+    target = derivative_path(digest, size, fmt)
+    if target.exists():
+        try:
+            # Pruning drops the least recently used files first.
+            os.utime(target)
+        except OSError:
+            pass
+        return target
+    schedule(source)
+    return None
+
+
+def _archive_signature(archive):
+    stat = archive.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _load_manifest(cache_dir, signature):
+    try:
+        manifest = json.loads((cache_dir / MANIFEST_NAME).read_text())
+    except (OSError, ValueError):
+        return None
+    if manifest.get("source") != signature:
+        return None
+    return manifest
+
+
+def _load_failure(cache_dir, signature):
+    try:
+        failure = json.loads((cache_dir / FAILURE_NAME).read_text())
+    except (OSError, ValueError):
+        return None
+    if failure.get("source") != signature:
+        return None
+    return failure
+
+
+def _write_failure(cache_dir, signature, error):
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = cache_dir / f"{FAILURE_NAME}.tmp"
+        tmp.write_text(json.dumps({"source": signature, "error": error}))
+        os.replace(tmp, cache_dir / FAILURE_NAME)
+    except OSError as exc:
+        logger.warning("could not record extraction failure in %s: %s", cache_dir, exc)
+
+
+def _job_view(job):
+    with _lock:
+        return {
+            "status": job["status"],
+            "extracted": job["extracted"],
+            "inner_root": job["inner_root"],
+            "images": list(job["images"]),
+            "error": job.get("error"),
+        }
+
+
+def _extract(archive, cache_dir, result_name, signature, job):
+    last_emit = 0.0
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Stream mode ("r|*") reads the archive once front to back instead of
+        # building the full member index first.
+        with tarfile.open(archive, "r|*") as tar:
+            for member in tar:
+                if job["inner_root"] is None:
+                    head = member.name.split("/", 1)[0]
+                    if head and head not in (".", ".."):
+                        with _lock:
+                            job["inner_root"] = head
+                if not (member.isfile() and member.name.lower().endswith(IMAGE_SUFFIXES)
+                        and "report_view" in member.name):
+                    continue
+                cache_name = clean_name(member.name.replace("/", "_"), "image")
+                cache_file = cache_dir / cache_name
+                if not cache_file.exists():
+                    extracted = tar.extractfile(member)
+                    if extracted is None:
+                        continue
+                    tmp = cache_file.with_name(f".{cache_name}.part")
+                    with extracted, open(tmp, "wb") as out:
+                        shutil.copyfileobj(extracted, out, 1024 * 1024)
+                    os.replace(tmp, cache_file)
+                schedule(cache_file)
+                with _lock:
+                    job["images"].append({"name": cache_name, "member": member.name})
+                    job["extracted"] += 1
+                now = time.monotonic()
+                if now - last_emit >= PROGRESS_EMIT_INTERVAL:
+                    last_emit = now
+                    config.socketio.emit("result_images_progress", {
+                        "result_name": result_name,
+                        "extracted": job["extracted"],
+                    })
+        manifest = {
+            "source": signature,
+            "inner_root": job["inner_root"],
+            "images": job["images"],
+        }
+        tmp_manifest = cache_dir / f"{MANIFEST_NAME}.tmp"
+        tmp_manifest.write_text(json.dumps(manifest))
+        os.replace(tmp_manifest, cache_dir / MANIFEST_NAME)
+        with _lock:
+            job["status"] = "complete"
+    except Exception as exc:
+        logger.error("archive image extraction failed for %s: %s", archive, exc)
+        _write_failure(cache_dir, signature, str(exc))
+        with _lock:
+            job["status"] = "failed"
+            job["error"] = str(exc)
+    finally:
+        config.socketio.emit("result_images_ready", {
+            "result_name": result_name,
+            "status": job["status"],
+            "extracted": job["extracted"],
+            "error": job.get("error"),
+        })
+        with _lock:
+            _jobs.pop(str(cache_dir), None)
+
+
+def archive_images(archive, cache_dir, result_name):
+    """Return the archive's report_view images extracted so far.
+
+    Result dict: status ('complete', 'running' or 'failed'), extracted,
+    inner_root, images ([{'name', 'member'}] under cache_dir), error.
+    Starts a background extraction job when the cache is missing or stale;
+    a failure recorded for this version of the archive is returned as is.
+    """
+    signature = _archive_signature(archive)
+    manifest = _load_manifest(cache_dir, signature)
+    if manifest is not None:
+        return {
+            "status": "complete",
+            "extracted": len(manifest.get("images", [])),
+            "inner_root": manifest.get("inner_root"),
+            "images": manifest.get("images", []),
+            "error": None,
+        }
+    failure = _load_failure(cache_dir, signature)
+    if failure is not None:
+        return {
+            "status": "failed",
+            "extracted": 0,
+            "inner_root": None,
+            "images": [],
+            "error": failure.get("error"),
+        }
+    with _lock:
+        job = _jobs.get(str(cache_dir))
+        if job is None:
+            job = {"status": "running", "extracted": 0, "inner_root": None, "images": []}
+            _jobs[str(cache_dir)] = job
+            _extract_executor.submit(_extract, archive, cache_dir, result_name, signature, job)
+    return _job_view(job)
+
+
+def invalidate_archive(cache_dir):
+    """Drop the extracted images for an archive that changed or vanished.
+
+    Derivatives are content-addressed and need no invalidation. A running
+    extraction job is left alone; its manifest signature already ties the
+    result to the archive version it read.
+    """
+    with _lock:
+        if str(cache_dir) in _jobs:
+            return
+    if cache_dir.exists():
+        shutil.rmtree(cache_dir, ignore_errors=True)
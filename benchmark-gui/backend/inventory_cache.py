@@ -0,0 +1,93 @@
+"""Per-DUT cache for the inventory endpoints (system-info, license-info,
+graid/check).
+
+The frontend refreshes these every few seconds from every open tab, and
+each call used to re-run graidctl / lsblk / nvidia-smi on the DUT. get()
+coalesces concurrent identical requests into one in-flight query
+(single-flight) and keeps the answer for a TTL that depends on how fast the
+data changes: license and PCIe topology barely move, device usage does.
+settings.inventory_ttls overrides DEFAULT_TTLS per kind.
+
+Answers are keyed by DUT (manager.Fleet.dut_key) and kind. Anything that
+changes the DUT — GRAID reset, setup-dut, a benchmark starting or ending —
+calls invalidate(dut). Empty answers are not cached: the query helpers
+return {} / [] when the DUT could not be asked.
+"""
+
+import asyncio
+import threading
+import time
+
+from settings import settings
+
+# Seconds an answer stays fresh, per kind.
+DEFAULT_TTLS = {
+    "license": 600.0,
+    "pcie": 600.0,
+    "hostname": 600.0,
+    "controller": 60.0,
+    "nvme": 30.0,
+    "gpu": 10.0,
+    "usage": 5.0,
+    "graid": 5.0,
+}
+
+
+class InventoryCache:
+    def __init__(self, ttls=None):
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self._lock = threading.Lock()
+        # (dut, kind) -> (stored_at, value)
+        self._values = {}
+        # (dut, kind) -> (generation, asyncio.Task) of the query in flight
+        self._inflight = {}
+        # Bumped by invalidate(): queries started before the bump neither
+        # store their answer nor serve later requests.
+        self._epoch = 0
+        self._generations = {}
+
+    def _generation(self, dut):
+        return (self._epoch, self._generations.get(dut, 0))
+
+    async def get(self, dut, kind, fetch):
+        """Return the cached answer for (dut, kind), or await `fetch()` (a
+        coroutine function) — shared with any identical request already in
+        flight."""
+        key = (dut, kind)
+        with self._lock:
+            cached = self._values.get(key)
+            generation = self._generation(dut)
+        if cached is not None and time.monotonic() - cached[0] < self.ttls.get(kind, 0):
+            return cached[1]
+        inflight = self._inflight.get(key)
+        if inflight is None or inflight[0] != generation:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = (generation, task)
+            task.add_done_callback(lambda done: self._store(key, generation, done))
+        else:
+            task = inflight[1]
+        return await asyncio.shield(task)
+
+    def _store(self, key, generation, task):
+        if self._inflight.get(key, (None, None))[1] is task:
+            del self._inflight[key]
+        if task.cancelled() or task.exception() is not None or not task.result():
+            return
+        with self._lock:
+            if self._generation(key[0]) == generation:
+                self._values[key] = (time.monotonic(), task.result())
+
+    def invalidate(self, dut=None):
+        """Drop cached answers for one DUT, or for all of them. Safe to call
+        from worker threads."""
+        with self._lock:
+            if dut is None:
+                self._values.clear()
+                self._epoch += 1
+                return
+            for key in [key for key in self._values if key[0] == dut]:
+                del self._values[key]
+            self._generations[dut] = self._generations.get(dut, 0) + 1
+
+
+inventory_cache = InventoryCache(settings.inventory_ttls)
@@ -1,19 +1,27 @@
 """BenchmarkManager — owns the benchmark worker thread and giostat watchdog.
 
-Single source of truth for `running`, `process`, `worker_thread`,
-`giostat_*`, and the active state file. try_start guards a single
-running slot under `_start_lock` (B2). stop_benchmark tears worker +
-giostat down in order (B1).
+One BenchmarkManager is one run slot: the single source of truth for
+`running`, `process`, `worker_thread`, `giostat_*`, and that slot's active
+state file. try_start guards the slot under `_start_lock` (B2).
+stop_benchmark tears worker + giostat down in order (B1).
+
+Fleet keeps one slot per DUT (keyed by DUT_IP, or "local" outside remote
+mode) so runs on different DUTs execute concurrently. `benchmark_manager`
+is the local slot, kept for callers that predate the fleet.
 """
 
 import os
 import re
+import shutil
 import subprocess
 import threading
 import time
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 
+import paramiko
+
 import config as _cfg
 from config import (
     BASE_DIR,
@@ -22,13 +30,42 @@ from config import (
     RESULTS_DIR,
     SCRIPT_DIR,
     WORKLOAD_MAP,
+    clean_name,
     generate_run_id,
     logger,
+    results_relative_path,
     strip_ansi,
 )
-from state import BenchmarkState, ConfigManager, sanitize_config
+from state import BenchmarkState, ResumableRuns, sanitize_config
 from executor import RemoteExecutor
 from monitor import start_giostat_monitoring, stop_giostat_monitoring
+from settings import settings
+import snapshots
+from eta import PhaseTracker, eta_model, phase_plan, run_profile
+from watcher import results_watcher
+from catalog import partial_result_name
+from cell_sync import CellSyncer
+from inventory_cache import inventory_cache
+
+LOCAL_SLOT = "local"
+
+# Generated graid-bench.conf files, one per slot. Kept out of SCRIPT_DIR,
+# which is mirrored to every DUT; graid-bench.sh and bench.sh source the one
+# named by GRAID_BENCH_CONF for the whole run.
+RUN_CONF_DIR = BASE_DIR / ".run-conf"
+
+# Per-device giostat lines kept for server-side snapshots: 5 s interval,
+# enough for a 1 h sustain window across ~24 devices.
+GIOSTAT_SAMPLE_LIMIT = 20000
+
+# SSH drops tolerated in a row while waiting on a recovered run, and the
+# cap on the reconnect backoff between them (seconds).
+EXIT_WAIT_MAX_FAILURES = 8
+EXIT_WAIT_MAX_BACKOFF = 60
+
+# What a dropped or unreachable DUT raises (RemoteExecutor's ConnectionError
+# is an OSError).
+_CONNECTION_ERRORS = (paramiko.SSHException, OSError, EOFError)
 
 
 def is_remote_benchmark_alive(executor, saved_pid=None):
@@ -57,13 +94,171 @@ def is_remote_benchmark_alive(executor, saved_pid=None):
     return res.returncode == 0
 
 
+def wait_for_remote_exit(executor, saved_pid=None, poll_interval=10,
+                         max_failures=EXIT_WAIT_MAX_FAILURES):
+    """Block until the recovered benchmark process is gone.
+
+    With a saved PID this holds one `tail --pid=<pid> -f /dev/null` channel
+    open on the DUT, which exits the moment the benchmark does, instead of
+    opening a `kill -0` channel every `poll_interval` seconds. The waiter is
+    re-opened if the connection drops; a waiter that returns at once while
+    the PID lives (no `tail --pid` on the DUT) and legacy state without a
+    PID fall back to polling.
+
+    SSH errors drop the connection and retry with exponential backoff; the
+    last error is raised after `max_failures` of them in a row.
+    """
+    use_waiter = bool(saved_pid)
+    failures = 0
+    while True:
+        try:
+            if use_waiter:
+                opened = time.monotonic()
+                try:
+                    waiter = executor.Popen(
+                        ['tail', f'--pid={saved_pid}', '-f', '/dev/null'],
+                        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+                    )
+                    waiter.wait()
+                except _CONNECTION_ERRORS:
+                    raise
+                except Exception as exc:
+                    logger.warning("Remote exit waiter failed, polling instead: %s", exc)
+                    use_waiter = False
+                else:
+                    if time.monotonic() - opened < 1 and waiter.returncode != 0:
+                        use_waiter = False
+            alive = is_remote_benchmark_alive(executor, saved_pid)
+        except _CONNECTION_ERRORS as exc:
+            failures += 1
+            if failures >= max_failures:
+                raise
+            delay = min(poll_interval * 2 ** (failures - 1), EXIT_WAIT_MAX_BACKOFF)
+            logger.warning("Lost the DUT while waiting for the benchmark to exit (%d/%d), "
+                           "reconnecting in %ss: %s", failures, max_failures, delay, exc)
+            executor.close()
+            time.sleep(delay)
+            continue
+        failures = 0
+        if not alive:
+            return
+        if not use_waiter:
+            time.sleep(poll_interval)
+
+
+def staging_key(dut):
+    """graid-bench.sh STAGING_KEY for a slot: staging dirs live under
+    .test-temp-data/<key>/ so two DUTs with the same NVME_INFO, whose
+    results meet in the local RESULTS_DIR, don't share one."""
+    return clean_name(str(dut), LOCAL_SLOT)
+
+
+def staging_dir(config, dut):
+    """Local path of the run's .test-temp-data staging dir (graid-bench.sh
+    STAGING_DIR)."""
+    return RESULTS_DIR / '.test-temp-data' / staging_key(dut) / f"{config.get('NVME_INFO')}-result"
+
+
+def discard_staging_copy(config, dut):
+    """Drop the local copy of a finished remote run's staging dir that cell
+    sync pulled; the packaged archive now holds the results, and the copy
+    would otherwise stay listed as a partial entry."""
+    path = staging_dir(config, dut)
+    shutil.rmtree(path, ignore_errors=True)
+    try:
+        path.parent.rmdir()
+    except OSError:
+        pass
+
+
+def run_conf_path(dut):
+    return RUN_CONF_DIR / f"graid-bench.{staging_key(dut)}.conf"
+
+
+def write_bench_conf(config, path):
+    """Write `config` as the bash graid-bench.conf the scripts source."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        for key, value in config.items():
+            if isinstance(value, bool):
+                val_str = "true" if value else "false"
+                f.write(f'{key}="{val_str}"\n')
+            elif isinstance(value, list):
+                # Bash array: ("item1" "item2")
+                val_str = "(" + " ".join(f'"{v}"' for v in value) + ")"
+                f.write(f'{key}={val_str}\n')
+            else:
+                f.write(f'{key}="{value}"\n')
+
+
+def script_env_args(executor, dut):
+    """`env NAME=value` arguments pointing the scripts at the slot's conf
+    and staging dir. Passed on the command line rather than through the
+    environment, which sudo on the DUT would reset."""
+    return ['env',
+            f"GRAID_BENCH_CONF={executor._to_remote_path(str(run_conf_path(dut)))}",
+            f"STAGING_KEY={staging_key(dut)}"]
+
+
+def remove_run_conf(executor, dut):
+    """Delete the slot's generated conf, locally and on the DUT."""
+    path = run_conf_path(dut)
+    path.unlink(missing_ok=True)
+    if executor is not None and executor.is_remote:
+        try:
+            executor.run(['rm', '-f', executor._to_remote_path(str(path))])
+        except Exception as exc:
+            logger.debug("remote conf cleanup failed: %s", exc)
+
+
+def partial_results_left(executor, config, dut):
+    """Whether the run's .test-temp-data dir is still on the DUT.
+
+    graid-bench.sh deletes it after packaging the archive, so it only
+    survives a run that was interrupted; its checkpoints make it resumable.
+    """
+    temp_dir = staging_dir(config, dut)
+    res = executor.run(['test', '-d', executor._to_remote_path(str(temp_dir))], capture_output=True, text=True)
+    return res.returncode == 0
+
+
+class _RunContext:
+    """Per-run values _handle_line needs, shared by the live reader and the
+    recovery log follower."""
+
+    def __init__(self, run_id, session_id, config, start_time, pid,
+                 eta_profile, eta_plan, phase_tracker, total_est_seconds=0):
+        self.run_id = run_id
+        self.session_id = session_id
+        self.config = config
+        self.start_time = start_time
+        self.pid = pid
+        self.eta_profile = eta_profile
+        self.eta_plan = eta_plan
+        self.phase_tracker = phase_tracker
+        self.total_est_seconds = total_est_seconds
+        self.base_label = "Initializing..."
+        # Archive the run produced (STATUS: RESULT), for completion hooks.
+        self.result_name = None
+        # True while replaying an existing log: rebuild counters silently.
+        self.replaying = False
+
+
 class BenchmarkManager:
-    def __init__(self, executor_factory=None):
+    def __init__(self, executor_factory=None, dut=LOCAL_SLOT, state_file=None, completion_hooks=None):
         # executor_factory lets tests inject a fake RemoteExecutor that
         # records SSH calls without a real DUT. Production code passes None
         # and gets the real RemoteExecutor. (A3 in AUDIT.md)
         self._executor_factory = executor_factory or RemoteExecutor
+        self.dut = dut
+        # None -> ACTIVE_STATE_FILE (see BenchmarkState).
+        self.state_file = state_file
+        self.started_at = None
         self.process = None
+        # `tail -F` on the DUT's output.log while a recovered run is followed.
+        self.log_follower = None
+        # Pulls finished cells back during remote runs (cell_sync.py).
+        self.cell_syncer = None
         self.worker_thread = None
         self.running = False
         self.active_run_id = None
@@ -80,6 +275,13 @@ class BenchmarkManager:
             'stage': '',
             'label': ''
         }
+        # Log-derived counters, reset by run_benchmark and by the replay of
+        # a recovered run; set here so status() and recovery can read them
+        # before either has run.
+        self.current_step = 0
+        self.total_steps = 0
+        self.cells_done = 0
+        self.last_error = None
         self._lock = threading.Lock()
         # Serializes start() check-and-set + stop() teardown so two concurrent
         # callers cannot both observe running=False and launch a worker.
@@ -92,6 +294,136 @@ class BenchmarkManager:
         self.giostat_process = None
         self.giostat_thread = None
         self.stop_giostat_event = threading.Event()
+        # Parsed giostat samples (timestamp, data) feeding snapshots.py.
+        # workload_started_at marks where the current workload's window
+        # begins; reset on every STATUS: WORKLOAD marker.
+        self.giostat_samples = deque(maxlen=GIOSTAT_SAMPLE_LIMIT)
+        self._samples_lock = threading.Lock()
+        self.workload_started_at = None
+        # Callables run after a benchmark finishes and results are synced
+        # back: hook(run_id=..., session_id=..., succeeded=...). Registered by
+        # fastapi_app at startup (e.g. regression detection). Fleet slots
+        # share the fleet's list.
+        self.completion_hooks = completion_hooks if completion_hooks is not None else []
+        # (run_id, result archive name) of the last run that reported one.
+        self.last_result = None
+
+    def rooms(self, session_id):
+        """Socket.IO rooms for this slot's events: the session, plus
+        `run:<run_id>` so a client can follow one run of the fleet."""
+        if self.active_run_id:
+            return [session_id, f"run:{self.active_run_id}"]
+        return session_id
+
+    def emit(self, event, data, session_id, run_id=None):
+        """Emit a slot event to rooms(), tagged with the run and DUT: runs of
+        several DUTs can share one session room, and clients tell their
+        events apart by these keys."""
+        payload = dict(data, dut=self.dut)
+        payload.setdefault('run_id', run_id or self.active_run_id)
+        _cfg.socketio.emit(event, payload, room=self.rooms(session_id))
+
+    def status(self):
+        return {
+            'dut': self.dut,
+            'running': self.running,
+            'run_id': self.active_run_id,
+            'session_id': self.session_id,
+            'started_at': self.started_at,
+            'progress': self.latest_progress,
+            'stage_info': self.current_stage_info,
+            'log_file': str(self.current_log_file) if self.current_log_file else None,
+        }
+
+    def _run_completion_hooks(self, run_id, session_id, succeeded):
+        # The run created and deleted VDs; cached inventory is stale.
+        inventory_cache.invalidate(self.dut)
+        for hook in list(self.completion_hooks):
+            try:
+                hook(run_id=run_id, session_id=session_id, succeeded=succeeded)
+            except Exception as exc:
+                logger.warning("completion hook %s failed: %s", getattr(hook, '__name__', hook), exc)
+
+    def record_giostat_sample(self, data):
+        with self._samples_lock:
+            self.giostat_samples.append((time.time(), dict(data)))
+
+    def giostat_window(self, since=None):
+        with self._samples_lock:
+            return [sample for sample in self.giostat_samples if since is None or sample[0] >= since]
+
+    def push_snapshot(self, out_path):
+        """Copy a locally written snapshot to the same path on the remote DUT.
+
+        The tar packaging step in graid-bench.sh runs on the DUT and only sees
+        files under its own `<base>/results/.test-temp-data/...`, so the
+        snapshot has to land there to be included in the archive.
+        Best-effort — the local copy is the source of truth.
+        """
+        runtime_config = self.runtime_config
+        if not runtime_config or not runtime_config.get('REMOTE_MODE'):
+            return
+        try:
+            executor = RemoteExecutor(runtime_config)
+            try:
+                executor.sync_to_remote(str(out_path), str(out_path))
+            finally:
+                executor.close()
+        except Exception as exc:
+            logger.warning("snapshot remote sync skipped: %s", exc)
+
+    def request_snapshot(self, test_name, output_dir, session_id):
+        """Render the snapshot server-side, or relay it to the browser.
+
+        The browser relay is kept for BENCHMARK_SNAPSHOT_MODE=browser, when
+        matplotlib is missing, and when rendering fails or has no samples.
+        Rendering runs on its own thread so the log reader keeps draining.
+        """
+        def relay():
+            self.emit('snapshot_request', {
+                'test_name': test_name,
+                'output_dir': output_dir
+            }, session_id)
+
+        if settings.snapshot_mode != 'server' or not snapshots.renderer_available():
+            relay()
+            return
+
+        samples = self.giostat_window(self.workload_started_at)
+        stage = self.current_stage_info.get('stage') or None
+        title = f"{test_name} — {self.current_stage_info.get('label', '').strip()}"
+
+        def render():
+            try:
+                out_path = snapshots.snapshot_path(test_name, output_dir)
+                if not snapshots.render_snapshot(samples, out_path, title, stage):
+                    logger.info("No giostat samples for snapshot %s, asking the browser", test_name)
+                    relay()
+                    return
+                logger.info("Snapshot rendered: %s", out_path)
+                self.push_snapshot(out_path)
+            except Exception as exc:
+                logger.warning("Server-side snapshot failed for %s: %s", test_name, exc)
+                relay()
+
+        threading.Thread(target=render, name=f"snapshot-{test_name}", daemon=True).start()
+
+    def _mark_resumable(self, config, session_id, run_id, reason, state=None):
+        """Record the run as resumable. `state` is the saved run state of a
+        run that may still be going (backend restarted without the DUT
+        password); resuming reattaches to it when it is."""
+        ResumableRuns.save(self.dut, {
+            'run_id': run_id,
+            'session_id': session_id,
+            'dut': self.dut,
+            'config': sanitize_config(config),
+            'reason': reason,
+            'interrupted_at': datetime.now().isoformat(),
+            # Stored configs carry no password; resume must be given one.
+            'needs_password': bool(config.get('REMOTE_MODE')),
+            'state': state,
+        })
+        logger.info("Run %s on %s is resumable (%s)", run_id, self.dut, reason)
 
     def try_start(self, config, session_id, run_id):
         """Atomically claim the running slot and launch the worker thread.
@@ -106,12 +438,14 @@ class BenchmarkManager:
             self.active_run_id = run_id
             self.session_id = session_id
             self.runtime_config = dict(config)
+            self.started_at = time.time()
             thread = threading.Thread(
                 target=self.run_benchmark,
                 args=(config, session_id, run_id),
                 daemon=True,
             )
             self.worker_thread = thread
+        inventory_cache.invalidate(self.dut)
         thread.start()
         return thread
 
@@ -143,6 +477,8 @@ class BenchmarkManager:
                 except Exception as exc:
                     logger.warning("benchmark process kill failed: %s", exc)
 
+        self._stop_log_follower()
+
         if thread is not None and thread.is_alive():
             thread.join(timeout=join_timeout)
             if thread.is_alive():
@@ -151,7 +487,7 @@ class BenchmarkManager:
         # _state_lock pairs with the tick save's lock so any in-flight save
         # completes before we clear the file.
         with self._state_lock:
-            BenchmarkState.clear()
+            BenchmarkState.clear(self.state_file)
 
         with self._start_lock:
             self.process = None
@@ -160,7 +496,7 @@ class BenchmarkManager:
             self.session_id = None
             self.runtime_config = None
 
-        stop_giostat_monitoring()
+        stop_giostat_monitoring(manager=self)
         return run_id
 
     def recover_state(self, state):
@@ -173,11 +509,16 @@ class BenchmarkManager:
             # Restore stage info if available
             self.current_stage_info = state.get('stage_info', {'stage': '', 'label': ''})
 
-            # The saved config has no password (stripped for security).
-            # Without credentials we cannot reconnect — clear state and bail out.
+            # The saved config has no password (stripped for security), so
+            # the DUT cannot be reached and the log cannot be followed yet.
+            # List the run as resumable with its state: resuming with the
+            # password reattaches (recover_state again) if it still runs,
+            # else restarts it from its checkpoints.
             if config.get('REMOTE_MODE') and not config.get('DUT_PASSWORD'):
-                logger.info("Benchmark state found but no credentials available for recovery — clearing state.")
-                BenchmarkState.clear()
+                logger.info("Benchmark state found but no credentials for %s — run %s waits for the password.",
+                            self.dut, run_id)
+                BenchmarkState.clear(self.state_file)
+                self._mark_resumable(config, session_id, run_id, 'backend_restart', state=state)
                 return False
 
             executor = self._executor_factory(config)
@@ -193,7 +534,25 @@ class BenchmarkManager:
                     self.active_run_id = run_id
                     self.session_id = session_id
                     self.runtime_config = config
+                    self.started_at = state.get('start_time') or time.time()
                 
+                # Replay the DUT's log and keep following it so progress,
+                # stage and log lines resume instead of staying frozen.
+                ctx = _RunContext(run_id, session_id, config, self.started_at, saved_pid,
+                                  run_profile(config), phase_plan(config),
+                                  PhaseTracker(self.started_at))
+                predicted = eta_model.estimate(ctx.eta_profile, ctx.eta_plan, config)
+                if predicted is not None:
+                    ctx.total_est_seconds = predicted['total']
+                ctx.result_name = state.get('result_name')
+                if ctx.result_name:
+                    self.last_result = (run_id, ctx.result_name)
+                follower = threading.Thread(target=self._follow_remote_log, args=(ctx,))
+                follower.daemon = True
+                follower.start()
+
+                self._start_cell_sync(executor, config)
+
                 # Start a thread to wait for completion and sync
                 thread = threading.Thread(
                     target=self._wait_for_completion,
@@ -203,34 +562,49 @@ class BenchmarkManager:
                 thread.start()
 
                 # Restart giostat monitoring
-                start_giostat_monitoring(session_id, executor)
+                start_giostat_monitoring(session_id, executor, manager=self)
 
                 # Emit status to UI
-                _cfg.socketio.emit('status', {
+                self.emit('status', {
                     'status': 'started',
                     'message': 'Benchmark is already running (Recovered)',
                     'timestamp': datetime.now().isoformat()
-                }, room=session_id)
+                }, session_id)
                 
                 return True
             else:
                 logger.info("Active state found but no remote benchmark process detected — clearing state.")
-                BenchmarkState.clear()
+                BenchmarkState.clear(self.state_file)
+                if partial_results_left(executor, config, self.dut):
+                    self._mark_resumable(config, session_id, run_id, 'lost')
         except Exception as e:
             logger.error("Error during state recovery: %s", e)
             try:
-                BenchmarkState.clear()
+                BenchmarkState.clear(self.state_file)
             except Exception as clear_err:
                 logger.error("Error clearing benchmark state after recovery failure: %s", clear_err)
         return False
 
     def _wait_for_completion(self, executor, session_id, config, saved_pid=None):
+        completed = False
         try:
-            # Poll until the captured PID dies (or pgrep fails on legacy state).
-            while True:
-                if not is_remote_benchmark_alive(executor, saved_pid):
-                    break
-                time.sleep(10)
+            try:
+                wait_for_remote_exit(executor, saved_pid)
+            except _CONNECTION_ERRORS as exc:
+                logger.error("Gave up waiting for recovered run %s on %s: %s", self.active_run_id, self.dut, exc)
+                self._mark_resumable(config, session_id, self.active_run_id, 'unreachable')
+                self.emit('status', {
+                    'status': 'failed',
+                    'message': 'Lost contact with the DUT while the benchmark was running (recovered); it can be resumed',
+                    'timestamp': datetime.now().isoformat(),
+                    'run_id': self.active_run_id,
+                }, session_id)
+                return
+            # Give `tail -F` a moment to deliver the last lines.
+            time.sleep(1)
+            self._stop_log_follower()
+            self._stop_cell_sync()
+            interrupted = partial_results_left(executor, config, self.dut)
             
             # Sync back
             if executor.is_remote:
@@ -239,28 +613,402 @@ class BenchmarkManager:
                     executor.sync_from_remote(str(LOGS_DIR.parent), str(LOGS_DIR))
                 except Exception as e:
                     logger.error("Error syncing back after recovery: %s", e)
+                if not interrupted:
+                    discard_staging_copy(config, self.dut)
+                results_watcher.notify()
                     
-            _cfg.socketio.emit('status', {
-                'status': 'completed',
-                'message': 'Benchmark completed (recovered)',
-                'timestamp': datetime.now().isoformat(),
-                'run_id': self.active_run_id,
-            }, room=session_id)
+            if interrupted:
+                self._mark_resumable(config, session_id, self.active_run_id, 'lost')
+                self.emit('status', {
+                    'status': 'failed',
+                    'message': 'Benchmark ended before packaging its results (recovered); it can be resumed',
+                    'timestamp': datetime.now().isoformat(),
+                    'run_id': self.active_run_id,
+                }, session_id)
+            else:
+                ResumableRuns.pop(self.dut)
+                self.emit('status', {
+                    'status': 'completed',
+                    'message': 'Benchmark completed (recovered)',
+                    'timestamp': datetime.now().isoformat(),
+                    'run_id': self.active_run_id,
+                }, session_id)
+                completed = True
             
         finally:
+            run_id = self.active_run_id
             with self._start_lock:
                 self.running = False
                 self.active_run_id = None
                 self.session_id = None
                 self.runtime_config = None
-            BenchmarkState.clear()
-            stop_giostat_monitoring()
+            self._stop_log_follower()
+            self._stop_cell_sync()
+            remove_run_conf(executor, self.dut)
+            BenchmarkState.clear(self.state_file)
+            stop_giostat_monitoring(manager=self)
+            # The recovered run's exit code is not observable; a clean exit
+            # of the wait loop that left no partial results counts as success.
+            self._run_completion_hooks(run_id, session_id, succeeded=completed)
+
+    def _emit(self, ctx, event, data):
+        if not ctx.replaying:
+            self.emit(event, data, ctx.session_id, ctx.run_id)
+
+    def _save_run_state(self, ctx):
+        if ctx.replaying:
+            return
+        BenchmarkState.save({
+            'session_id': ctx.session_id,
+            'run_id': ctx.run_id,
+            'log_file': str(self.current_log_file),
+            'config': sanitize_config(ctx.config),
+            'start_time': ctx.start_time,
+            'status': 'started',
+            'stage_info': self.current_stage_info,
+            'pid': ctx.pid,
+            'result_name': ctx.result_name,
+        }, self.state_file)
+
+    def _handle_line(self, msg, ctx):
+        """Parse one benchmark log line: emit it and act on STATUS markers."""
+        # Emit log line to frontend
+        if not any(x in msg for x in ["DEBUG:", "Emitting giostat", "snapshot_request"]):
+             self._emit(ctx, 'bench_log', {'line': msg})
+
+        logger.debug("BENCH_LOG: %s", msg)
+        # Replayed lines carry their own timestamps.
+        ctx.phase_tracker.feed(msg, None if ctx.replaying else time.time())
+
+        # Detect STATUS markers
+        if "STATUS: STATE:" in msg:
+             try:
+                 state = msg.split("STATUS: STATE:")[1].strip()
+                 logger.info("DETECTED STATE: %s", state)
+                 self._emit(ctx, 'run_status_update', {
+                    'status': state,
+                    'timestamp': datetime.now().isoformat()
+                 })
+             except Exception as e:
+                 logger.warning("Error parsing state: %s", e)
+
+        elif "STATUS: ERROR:" in msg:
+             try:
+                 error_msg = msg.split("STATUS: ERROR:")[1].strip()
+                 logger.warning("DETECTED ERROR: %s", error_msg)
+                 self.last_error = error_msg
+             except Exception as e:
+                 logger.warning("Error parsing error message: %s", e)
+
+
+        elif "STATUS: STAGE_PD_START" in msg:
+             logger.info("DETECTED STAGE PD START")
+             ctx.base_label = 'Baseline Performance Test\n'
+             self.current_stage_info = {'stage': 'PD', 'label': ctx.base_label}
+             self._emit(ctx, 'status_update', {
+                'stage': 'PD',
+                'label': ctx.base_label,
+                'timestamp': datetime.now().isoformat()
+            })
+             self._save_run_state(ctx)
+
+        elif "STATUS: STAGE_VD_START" in msg:
+             logger.info("DETECTED STAGE VD START")
+             ctx.base_label = 'RAID Performance Test\n'
+             self.current_stage_info = {'stage': 'VD', 'label': ctx.base_label}
+             self._emit(ctx, 'status_update', {
+                'stage': 'VD',
+                'label': ctx.base_label,
+                'timestamp': datetime.now().isoformat()
+            })
+             self._save_run_state(ctx)
+
+        elif "STATUS: STAGE_MD_START" in msg:
+             logger.info("DETECTED STAGE MD START")
+             ctx.base_label = 'MDADM Performance Test\n'
+             self.current_stage_info = {'stage': 'MD', 'label': ctx.base_label}
+             self._emit(ctx, 'status_update', {
+                'stage': 'MD',
+                'label': ctx.base_label,
+                'timestamp': datetime.now().isoformat()
+            })
+             self._save_run_state(ctx)
+
+        elif "STATUS: WORKLOAD:" in msg:
+            try:
+                filename = msg.split("STATUS: WORKLOAD:")[1].strip()
+                friendly_name = filename
+                for key, val in WORKLOAD_MAP.items():
+                    if key in filename:
+                        friendly_name = val
+                        break
+
+                new_label = f"{ctx.base_label} - {friendly_name}"
+                self.workload_started_at = time.time()
+                logger.info("DETECTED WORKLOAD: %s -> %s", filename, new_label)
+                stage_code = 'PD' if 'Baseline' in ctx.base_label else 'MD' if 'MDADM' in ctx.base_label else 'VD'
+
+                self.current_stage_info = {'stage': stage_code, 'label': new_label}
+                self._emit(ctx, 'status_update', {
+                    'stage': stage_code,
+                    'label': new_label,
+                    'timestamp': datetime.now().isoformat()
+                })
+                self._save_run_state(ctx)
+            except Exception as e:
+                logger.warning("Error parsing workload: %s", e)
+
+        elif "STATUS: TOTAL_STEPS:" in msg:
+            try:
+                self.total_steps = int(msg.split("STATUS: TOTAL_STEPS:")[1].strip())
+                self.current_step = 0
+                ctx.eta_plan['workload'] = self.total_steps
+                logger.debug("Total steps set to %d", self.total_steps)
+            except Exception:
+                pass
+
+        elif "STATUS: SNAPSHOT:" in msg:
+             try:
+                 # Format: STATUS: SNAPSHOT: test_name="name" output_dir="dir"
+                 test_match = re.search(r'test_name="([^"]+)"', msg)
+                 dir_match = re.search(r'output_dir="([^"]+)"', msg)
+
+                 tn = test_match.group(1) if test_match else "unknown"
+                 od = dir_match.group(1) if dir_match else ""
+
+                 logger.info("TRIGGER SNAPSHOT -> test=%s, dir=%s", tn, od)
+                 if not ctx.replaying:
+                     self.request_snapshot(tn, od, ctx.session_id)
+             except Exception as e:
+                 logger.warning("Error parsing snapshot marker: %s", e)
+
+        elif "STATUS: DEVICE_START:" in msg:
+            try:
+                dev = msg.split("STATUS: DEVICE_START:")[1].strip()
+                self._emit(ctx, 'device_discard_update', {
+                    'device': dev,
+                    'state': 'started',
+                    'timestamp': datetime.now().isoformat()
+                })
+            except Exception as e:
+                logger.warning("Error parsing DEVICE_START: %s", e)
+
+        elif "STATUS: DEVICE_DONE:" in msg:
+            try:
+                dev = msg.split("STATUS: DEVICE_DONE:")[1].strip()
+                self._emit(ctx, 'device_discard_update', {
+                    'device': dev,
+                    'state': 'done',
+                    'timestamp': datetime.now().isoformat()
+                })
+            except Exception as e:
+                logger.warning("Error parsing DEVICE_DONE: %s", e)
+
+        elif "STATUS: DEVICE_STUCK:" in msg:
+            try:
+                dev = msg.split("STATUS: DEVICE_STUCK:")[1].strip()
+                logger.warning("DEVICE_STUCK detected: %s", dev)
+                self._emit(ctx, 'device_stuck', {
+                    'device': dev,
+                    'timestamp': datetime.now().isoformat()
+                })
+            except Exception as e:
+                logger.warning("Error parsing DEVICE_STUCK: %s", e)
+
+        elif "STATUS: DEVICE_UNSTUCK:" in msg:
+            try:
+                dev = msg.split("STATUS: DEVICE_UNSTUCK:")[1].strip()
+                self._emit(ctx, 'device_unstuck', {
+                    'device': dev,
+                    'timestamp': datetime.now().isoformat()
+                })
+            except Exception as e:
+                logger.warning("Error parsing DEVICE_UNSTUCK: %s", e)
+
+        elif "STATUS: CELL_DONE:" in msg:
+            # bench.sh checkpointed a cell (RESUME skips it).
+            # Format: STATUS: CELL_DONE: <cell> output_dir="dir"
+            self.cells_done += 1
+            cell = msg.split("STATUS: CELL_DONE:")[1].split(' output_dir=')[0].strip()
+            dir_match = re.search(r'output_dir="([^"]+)"', msg)
+            if dir_match and not ctx.replaying:
+                if self.cell_syncer is not None:
+                    self.cell_syncer.submit(dir_match.group(1))
+                else:
+                    # Nothing to pull (local run, or cell sync is off): the
+                    # partial entry on disk may still have changed.
+                    try:
+                        partial_name = partial_result_name(results_relative_path(dir_match.group(1)))
+                    except ValueError:
+                        partial_name = None
+                    if partial_name:
+                        results_watcher.notify(partial_name)
+            self._emit(ctx, 'cell_done', {
+                'cell': cell,
+                'count': self.cells_done,
+                'run_id': ctx.run_id,
+                'timestamp': datetime.now().isoformat()
+            })
+
+        elif "STATUS: RESULT:" in msg:
+            # graid-bench.sh packaged the run: STATUS: RESULT: <archive name>
+            ctx.result_name = msg.split("STATUS: RESULT:")[1].strip()
+            self.last_result = (ctx.run_id, ctx.result_name)
+            logger.info("Run %s produced %s", ctx.run_id, ctx.result_name)
+            self._save_run_state(ctx)
+
+        elif "STATUS: TICK" in msg:
+            try:
+                self.current_step += 1
+                percentage = 0
+                elapsed = int(time.time() - ctx.start_time)
+                if self.total_steps > 0:
+                    percentage = (self.current_step / self.total_steps) * 100
+
+                # Refined remaining time logic
+                remaining = 0
+                eta = eta_model.estimate(ctx.eta_profile, ctx.eta_plan, ctx.config, ctx.phase_tracker)
+                if eta is not None:
+                    remaining = eta['total']
+                elif ctx.total_est_seconds > 0:
+                    # Use initial estimate minus elapsed as baseline
+                    est_remaining = ctx.total_est_seconds - elapsed
+                    if est_remaining < 0: est_remaining = 0
+
+                    if percentage > 10:
+                        # After 10% progress, blend with extrapolation for real-time correction
+                        # This avoids massive drops due to fast init/preconditioning steps
+                        extrapolated_total = elapsed / (percentage / 100)
+                        extrapolated_remaining = int(extrapolated_total - elapsed)
+
+                        # Transition factor (0.0 at 10% progress, 1.0 at 100% progress)
+                        alpha = (percentage - 10) / 90
+                        remaining = int(est_remaining * (1 - alpha) + extrapolated_remaining * alpha)
+                    else:
+                        # Early stage (<10%): prioritize initial estimate
+                        remaining = est_remaining
+                elif percentage > 0:
+                    # Fallback to pure extrapolation if no initial estimate was parsed
+                    total_projected = elapsed / (percentage / 100)
+                    remaining = int(total_projected - elapsed)
+
+                if remaining < 0: remaining = 0
+
+                self.latest_progress = {
+                    'current_step': self.current_step,
+                    'total_steps': self.total_steps,
+                    'percentage': round(percentage, 2),
+                    'elapsed': elapsed,
+                    'remaining': remaining,
+                    'timestamp': datetime.now().isoformat()
+                }
+                if eta is not None:
+                    self.latest_progress['phases'] = eta['phases']
+                self._emit(ctx, 'progress_update', self.latest_progress)
+
+                # Update persistent state with latest progress (every 10 ticks to reduce I/O).
+                # Hold _state_lock so this read-modify-write doesn't race with stop_benchmark()'s clear().
+                if self.current_step % 10 == 0 and not ctx.replaying:
+                    with self._state_lock:
+                        if self.running:
+                            try:
+                                saved = BenchmarkState.load(self.state_file) or {}
+                                saved['progress'] = self.latest_progress
+                                BenchmarkState.save(saved, self.state_file)
+                            except Exception as exc:
+                                logger.debug("tick state save skipped: %s", exc)
+            except Exception as e:
+                logger.warning("Error handling progress tick: %s", e)
+
+    def _follow_remote_log(self, ctx):
+        """Rebuild a recovered run's progress from the DUT's output.log, then
+        keep streaming it with `tail -F` until _wait_for_completion stops us.
+
+        graid-bench.sh tees everything to scripts/output.log, so replaying it
+        through _handle_line (emits and state saves muted) restores the stage,
+        step count and ETA the backend lost when it restarted.
+        """
+        try:
+            executor = self._executor_factory(ctx.config)
+            remote_log = executor._to_remote_path(str(SCRIPT_DIR / 'output.log'))
+            result = executor.run(['cat', remote_log], capture_output=True, text=True)
+            if result.returncode != 0:
+                logger.warning("Cannot read %s for recovery: %s", remote_log, result.stderr.strip())
+                return
+            # A trailing partial line is left for tail to deliver whole.
+            lines = result.stdout.splitlines(keepends=True)
+            if lines and not lines[-1].endswith('\n'):
+                lines.pop()
+            messages = [strip_ansi(line.strip()) for line in lines]
+            # output.log is appended to (tee -a) and only removed once results
+            # are packaged, so an aborted earlier run may precede this one.
+            first = 0
+            for index, msg in enumerate(messages):
+                if "STATUS: TOTAL_STEPS:" in msg:
+                    first = index
+
+            with open(self.current_log_file, 'w') as log:
+                log.writelines(lines)
+                self.current_step = 0
+                self.total_steps = 0
+                self.cells_done = 0
+                self.last_error = None
+                ctx.replaying = True
+                for msg in messages[first:]:
+                    if msg:
+                        self._handle_line(msg, ctx)
+                ctx.replaying = False
+                self._emit(ctx, 'status_update', {
+                    **self.current_stage_info,
+                    'timestamp': datetime.now().isoformat()
+                })
+                self._emit(ctx, 'progress_update', self.latest_progress)
+                logger.info("Replayed %d log lines of recovered run %s (step %d/%d)",
+                            len(messages) - first, ctx.run_id, self.current_step, self.total_steps)
+
+                with self._start_lock:
+                    if not self.running:
+                        return
+                    follower = self.log_follower = executor.Popen(
+                        ['tail', '-n', f'+{len(lines) + 1}', '-F', remote_log],
+                        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1
+                    )
+                for line in follower.stdout:
+                    log.write(line)
+                    log.flush()
+                    msg = strip_ansi(line.strip())
+                    if msg and not msg.startswith('tail:'):
+                        self._handle_line(msg, ctx)
+        except Exception as e:
+            logger.warning("Log follower for recovered run %s stopped: %s", ctx.run_id, e)
+
+    def _start_cell_sync(self, executor, config):
+        if executor.is_remote and settings.cell_sync_bwlimit > 0:
+            self.cell_syncer = CellSyncer(self._executor_factory, config, settings.cell_sync_bwlimit)
+
+    def _stop_cell_sync(self):
+        syncer, self.cell_syncer = self.cell_syncer, None
+        if syncer is not None:
+            syncer.stop()
+
+    def _stop_log_follower(self):
+        follower, self.log_follower = self.log_follower, None
+        if follower is not None:
+            try:
+                follower.terminate()
+            except Exception as exc:
+                logger.debug("log follower terminate failed: %s", exc)
 
     def run_benchmark(self, config, session_id, run_id=None):
         run_id = run_id or generate_run_id()
         executor = None
+        succeeded = False
+        # Set when the DUT connection or the script process was lost, as
+        # opposed to the script failing on its own: only then is the run
+        # resumable.
+        lost = False
+        phase_tracker = None
         try:
-            ConfigManager.save_config(config)
             executor = self._executor_factory(config)
             with self._start_lock:
                 self.running = True
@@ -269,15 +1017,15 @@ class BenchmarkManager:
                 self.runtime_config = dict(config)
             
             # Start giostat monitoring
-            start_giostat_monitoring(session_id, executor)
+            start_giostat_monitoring(session_id, executor, manager=self)
 
             # Sync scripts to remote if in remote mode
             if executor.is_remote:
-                _cfg.socketio.emit('status', {
+                self.emit('status', {
                     'status': 'syncing',
                     'message': 'Syncing scripts to remote DUT...',
                     'timestamp': datetime.now().isoformat()
-                }, room=session_id)
+                }, session_id)
                 
                 # Ensure remote directories exist and are writable
                 remote_script_dir = executor._to_remote_path(str(SCRIPT_DIR))
@@ -291,36 +1039,24 @@ class BenchmarkManager:
                     executor.run(['sudo', 'chown', '-R', executor.config.get('DUT_USER', 'root'), 
                                  executor._to_remote_path(str(REMOTE_BASE_DIR))])
                 
-                executor.run(['rm', '-rf', remote_script_dir])
+                # Delta mirror: only changed scripts are sent, stale ones removed.
                 executor.sync_to_remote(str(SCRIPT_DIR), str(SCRIPT_DIR.parent))
                 
                 checksum = executor.run(['md5sum', str(SCRIPT_DIR / 'graid-bench.sh')], capture_output=True, text=True)
                 logger.debug("Remote script checksum: %s", checksum.stdout.strip())
 
             # Convert JSON config to Bash format
-            target_config = SCRIPT_DIR / "graid-bench.conf"
-            with open(target_config, 'w') as f:
-                for key, value in config.items():
-                    if isinstance(value, bool):
-                        val_str = "true" if value else "false"
-                        f.write(f'{key}="{val_str}"\n')
-                    elif isinstance(value, list):
-                        # Bash array: ("item1" "item2")
-                        val_str = "(" + " ".join(f'"{v}"' for v in value) + ")"
-                        f.write(f'{key}={val_str}\n')
-                    else:
-                        f.write(f'{key}="{value}"\n')
-            
-            # Sync generated config to remote
+            conf_path = run_conf_path(self.dut)
+            write_bench_conf(config, conf_path)
             if executor.is_remote:
-                executor.sync_to_remote(str(target_config), str(target_config))
+                executor.sync_to_remote(str(conf_path), str(conf_path))
 
-            _cfg.socketio.emit('status', {
+            self.emit('status', {
                 'status': 'started',
                 'message': 'Benchmark started',
                 'timestamp': datetime.now().isoformat(),
                 'run_id': run_id,
-            }, room=session_id)
+            }, session_id)
 
             self.latest_progress = {
                 'percentage': 0,
@@ -343,13 +1079,13 @@ class BenchmarkManager:
                 'config': sanitize_config(config),
                 'start_time': start_time,
                 'status': 'started'
-            })
+            }, self.state_file)
 
             script_path = SCRIPT_DIR / 'graid-bench.sh'
             if executor.is_remote:
                 script_path = executor._to_remote_path(str(script_path))
                 
-            cmd = ['bash', str(script_path)]
+            cmd = script_env_args(executor, self.dut) + ['bash', str(script_path)]
 
             # Local-only: prepend backend venv/bin to PATH so the script picks
             # up the same python/tools the backend was launched with. Remote
@@ -360,20 +1096,30 @@ class BenchmarkManager:
                 venv_bin = BASE_DIR / 'venv' / 'bin'
                 env['PATH'] = str(venv_bin) + os.pathsep + env['PATH']
 
-            # Get total estimated time
+            # Historical per-phase model first (eta.py); est_time.sh only
+            # when this profile has phases the history has never seen.
+            eta_profile = run_profile(config)
+            eta_plan = phase_plan(config)
+            phase_tracker = PhaseTracker(start_time)
             total_est_seconds = 0
-            try:
-                est_cmd = ['bash', executor._to_remote_path(str(SCRIPT_DIR / 'est_time.sh'))]
-                result = executor.run(est_cmd, cwd=str(SCRIPT_DIR), env=env)
-                if result.returncode == 0:
-                    # Parse "Estimated Completion Time: 00:00:15 (dd:hh:mm)"
-                    match = re.search(r'Estimated Completion Time: (\d+):(\d+):(\d+)', result.stdout)
-                    if match:
-                        days, hours, minutes = map(int, match.groups())
-                        total_est_seconds = days * 86400 + hours * 3600 + minutes * 60
-                        logger.info("Total estimated seconds: %d", total_est_seconds)
-            except Exception as e:
-                logger.warning("Error getting estimated time: %s", e)
+            predicted = eta_model.estimate(eta_profile, eta_plan, config)
+            if predicted is not None:
+                total_est_seconds = predicted['total']
+                logger.info("Historical ETA: %d s %s", total_est_seconds, predicted['phases'])
+            else:
+                try:
+                    est_cmd = script_env_args(executor, self.dut) + [
+                        'bash', executor._to_remote_path(str(SCRIPT_DIR / 'est_time.sh'))]
+                    result = executor.run(est_cmd, cwd=str(SCRIPT_DIR), env=env)
+                    if result.returncode == 0:
+                        # Parse "Estimated Completion Time: 00:00:15 (dd:hh:mm)"
+                        match = re.search(r'Estimated Completion Time: (\d+):(\d+):(\d+)', result.stdout)
+                        if match:
+                            days, hours, minutes = map(int, match.groups())
+                            total_est_seconds = days * 86400 + hours * 3600 + minutes * 60
+                            logger.info("Total estimated seconds: %d", total_est_seconds)
+                except Exception as e:
+                    logger.warning("Error getting estimated time: %s", e)
 
             # Open log file for writing
             with open(log_file, 'w') as log:
@@ -393,11 +1139,14 @@ class BenchmarkManager:
                     'start_time': start_time,
                     'status': 'started',
                     'pid': process_pid,
-                })
+                }, self.state_file)
 
-                current_base_label = "Initializing..."
+                ctx = _RunContext(run_id, session_id, config, start_time, process_pid,
+                                  eta_profile, eta_plan, phase_tracker, total_est_seconds)
+                self._start_cell_sync(executor, config)
                 self.current_step = 0
                 self.total_steps = 0
+                self.cells_done = 0
                 self.last_error = None
 
                 # Robust log reading
@@ -413,254 +1162,7 @@ class BenchmarkManager:
                             if not msg:
                                 continue
                                 
-                            # Emit log line to frontend
-                            if not any(x in msg for x in ["DEBUG:", "Emitting giostat", "snapshot_request"]):
-                                 _cfg.socketio.emit('bench_log', {'line': msg}, room=session_id)
-
-                            logger.debug("BENCH_LOG: %s", msg)
-
-                            # Detect STATUS markers
-                            if "STATUS: STATE:" in msg:
-                                 try:
-                                     state = msg.split("STATUS: STATE:")[1].strip()
-                                     logger.info("DETECTED STATE: %s", state)
-                                     _cfg.socketio.emit('run_status_update', {
-                                        'status': state,
-                                        'timestamp': datetime.now().isoformat()
-                                     }, room=session_id)
-                                 except Exception as e:
-                                     logger.warning("Error parsing state: %s", e)
-
-                            elif "STATUS: ERROR:" in msg:
-                                 try:
-                                     error_msg = msg.split("STATUS: ERROR:")[1].strip()
-                                     logger.warning("DETECTED ERROR: %s", error_msg)
-                                     self.last_error = error_msg
-                                 except Exception as e:
-                                     logger.warning("Error parsing error message: %s", e)
-
-
-                            elif "STATUS: STAGE_PD_START" in msg:
-                                 logger.info("DETECTED STAGE PD START")
-                                 current_base_label = 'Baseline Performance Test\n'
-                                 self.current_stage_info = {'stage': 'PD', 'label': current_base_label}
-                                 _cfg.socketio.emit('status_update', {
-                                    'stage': 'PD',
-                                    'label': current_base_label,
-                                    'timestamp': datetime.now().isoformat()
-                                }, room=session_id)
-                                 # Update persistent state
-                                 BenchmarkState.save({
-                                     'session_id': session_id,
-                                     'run_id': run_id,
-                                     'log_file': str(self.current_log_file),
-                                     'config': sanitize_config(config),
-                                     'start_time': start_time,
-                                     'status': 'started',
-                                     'stage_info': self.current_stage_info,
-                                     'pid': process_pid,
-                                 })
-
-                            elif "STATUS: STAGE_VD_START" in msg:
-                                 logger.info("DETECTED STAGE VD START")
-                                 current_base_label = 'RAID Performance Test\n'
-                                 self.current_stage_info = {'stage': 'VD', 'label': current_base_label}
-                                 _cfg.socketio.emit('status_update', {
-                                    'stage': 'VD',
-                                    'label': current_base_label,
-                                    'timestamp': datetime.now().isoformat()
-                                }, room=session_id)
-                                 # Update persistent state
-                                 BenchmarkState.save({
-                                     'session_id': session_id,
-                                     'run_id': run_id,
-                                     'log_file': str(self.current_log_file),
-                                     'config': sanitize_config(config),
-                                     'start_time': start_time,
-                                     'status': 'started',
-                                     'stage_info': self.current_stage_info,
-                                     'pid': process_pid,
-                                 })
-
-                            elif "STATUS: STAGE_MD_START" in msg:
-                                 logger.info("DETECTED STAGE MD START")
-                                 current_base_label = 'MDADM Performance Test\n'
-                                 self.current_stage_info = {'stage': 'MD', 'label': current_base_label}
-                                 _cfg.socketio.emit('status_update', {
-                                    'stage': 'MD',
-                                    'label': current_base_label,
-                                    'timestamp': datetime.now().isoformat()
-                                }, room=session_id)
-                                 # Update persistent state
-                                 BenchmarkState.save({
-                                     'session_id': session_id,
-                                     'run_id': run_id,
-                                     'log_file': str(self.current_log_file),
-                                     'config': sanitize_config(config),
-                                     'start_time': start_time,
-                                     'status': 'started',
-                                     'stage_info': self.current_stage_info,
-                                     'pid': process_pid,
-                                 })
-
-                            elif "STATUS: WORKLOAD:" in msg:
-                                try:
-                                    filename = msg.split("STATUS: WORKLOAD:")[1].strip()
-                                    friendly_name = filename
-                                    for key, val in WORKLOAD_MAP.items():
-                                        if key in filename:
-                                            friendly_name = val
-                                            break
-                                    
-                                    new_label = f"{current_base_label} - {friendly_name}"
-                                    logger.info("DETECTED WORKLOAD: %s -> %s", filename, new_label)
-                                    stage_code = 'PD' if 'Baseline' in current_base_label else 'MD' if 'MDADM' in current_base_label else 'VD'
-                                    
-                                    self.current_stage_info = {'stage': stage_code, 'label': new_label}
-                                    _cfg.socketio.emit('status_update', {
-                                        'stage': stage_code,
-                                        'label': new_label,
-                                        'timestamp': datetime.now().isoformat()
-                                    }, room=session_id)
-                                    # Update persistent state
-                                    BenchmarkState.save({
-                                        'session_id': session_id,
-                                        'run_id': run_id,
-                                        'log_file': str(self.current_log_file),
-                                        'config': sanitize_config(config),
-                                        'start_time': start_time,
-                                        'status': 'started',
-                                        'stage_info': self.current_stage_info,
-                                        'pid': process_pid,
-                                    })
-                                except Exception as e:
-                                    logger.warning("Error parsing workload: %s", e)
-
-                            elif "STATUS: TOTAL_STEPS:" in msg:
-                                try:
-                                    self.total_steps = int(msg.split("STATUS: TOTAL_STEPS:")[1].strip())
-                                    self.current_step = 0
-                                    logger.debug("Total steps set to %d", self.total_steps)
-                                except Exception:
-                                    pass
-
-                            elif "STATUS: SNAPSHOT:" in msg:
-                                 try:
-                                     # Format: STATUS: SNAPSHOT: test_name="name" output_dir="dir"
-                                     test_match = re.search(r'test_name="([^"]+)"', msg)
-                                     dir_match = re.search(r'output_dir="([^"]+)"', msg)
-                                     
-                                     tn = test_match.group(1) if test_match else "unknown"
-                                     od = dir_match.group(1) if dir_match else ""
-                                     
-                                     logger.info("TRIGGER SNAPSHOT -> test=%s, dir=%s", tn, od)
-                                     _cfg.socketio.emit('snapshot_request', {
-                                         'test_name': tn,
-                                         'output_dir': od
-                                     }, room=session_id)
-                                 except Exception as e:
-                                     logger.warning("Error parsing snapshot marker: %s", e)
-
-                            elif "STATUS: DEVICE_START:" in msg:
-                                try:
-                                    dev = msg.split("STATUS: DEVICE_START:")[1].strip()
-                                    _cfg.socketio.emit('device_discard_update', {
-                                        'device': dev,
-                                        'state': 'started',
-                                        'timestamp': datetime.now().isoformat()
-                                    }, room=session_id)
-                                except Exception as e:
-                                    logger.warning("Error parsing DEVICE_START: %s", e)
-
-                            elif "STATUS: DEVICE_DONE:" in msg:
-                                try:
-                                    dev = msg.split("STATUS: DEVICE_DONE:")[1].strip()
-                                    _cfg.socketio.emit('device_discard_update', {
-                                        'device': dev,
-                                        'state': 'done',
-                                        'timestamp': datetime.now().isoformat()
-                                    }, room=session_id)
-                                except Exception as e:
-                                    logger.warning("Error parsing DEVICE_DONE: %s", e)
-
-                            elif "STATUS: DEVICE_STUCK:" in msg:
-                                try:
-                                    dev = msg.split("STATUS: DEVICE_STUCK:")[1].strip()
-                                    logger.warning("DEVICE_STUCK detected: %s", dev)
-                                    _cfg.socketio.emit('device_stuck', {
-                                        'device': dev,
-                                        'timestamp': datetime.now().isoformat()
-                                    }, room=session_id)
-                                except Exception as e:
-                                    logger.warning("Error parsing DEVICE_STUCK: %s", e)
-
-                            elif "STATUS: DEVICE_UNSTUCK:" in msg:
-                                try:
-                                    dev = msg.split("STATUS: DEVICE_UNSTUCK:")[1].strip()
-                                    _cfg.socketio.emit('device_unstuck', {
-                                        'device': dev,
-                                        'timestamp': datetime.now().isoformat()
-                                    }, room=session_id)
-                                except Exception as e:
-                                    logger.warning("Error parsing DEVICE_UNSTUCK: %s", e)
-
-                            elif "STATUS: TICK" in msg:
-                                try:
-                                    self.current_step += 1
-                                    percentage = 0
-                                    elapsed = int(time.time() - start_time)
-                                    if self.total_steps > 0:
-                                        percentage = (self.current_step / self.total_steps) * 100
-
-                                    # Refined remaining time logic
-                                    remaining = 0
-                                    if total_est_seconds > 0:
-                                        # Use initial estimate minus elapsed as baseline
-                                        est_remaining = total_est_seconds - elapsed
-                                        if est_remaining < 0: est_remaining = 0
-                                        
-                                        if percentage > 10:
-                                            # After 10% progress, blend with extrapolation for real-time correction
-                                            # This avoids massive drops due to fast init/preconditioning steps
-                                            extrapolated_total = elapsed / (percentage / 100)
-                                            extrapolated_remaining = int(extrapolated_total - elapsed)
-                                            
-                                            # Transition factor (0.0 at 10% progress, 1.0 at 100% progress)
-                                            alpha = (percentage - 10) / 90
-                                            remaining = int(est_remaining * (1 - alpha) + extrapolated_remaining * alpha)
-                                        else:
-                                            # Early stage (<10%): prioritize initial estimate
-                                            remaining = est_remaining
-                                    elif percentage > 0:
-                                        # Fallback to pure extrapolation if no initial estimate was parsed
-                                        total_projected = elapsed / (percentage / 100)
-                                        remaining = int(total_projected - elapsed)
-                                    
-                                    if remaining < 0: remaining = 0
-                                    
-                                    self.latest_progress = {
-                                        'current_step': self.current_step,
-                                        'total_steps': self.total_steps,
-                                        'percentage': round(percentage, 2),
-                                        'elapsed': elapsed,
-                                        'remaining': remaining,
-                                        'timestamp': datetime.now().isoformat()
-                                    }
-                                    _cfg.socketio.emit('progress_update', self.latest_progress, room=session_id)
-                                    
-                                    # Update persistent state with latest progress (every 10 ticks to reduce I/O).
-                                    # Hold _state_lock so this read-modify-write doesn't race with stop_benchmark()'s clear().
-                                    if self.current_step % 10 == 0:
-                                        with self._state_lock:
-                                            if self.running:
-                                                try:
-                                                    saved = BenchmarkState.load() or {}
-                                                    saved['progress'] = self.latest_progress
-                                                    BenchmarkState.save(saved)
-                                                except Exception as exc:
-                                                    logger.debug("tick state save skipped: %s", exc)
-                                except Exception as e:
-                                    logger.warning("Error handling progress tick: %s", e)
+                            self._handle_line(msg, ctx)
                     else:
                         # No data or EOF
                         if self.process.poll() is not None:
@@ -669,38 +1171,67 @@ class BenchmarkManager:
                 
                 # Wait for completion
                 self.process.wait()
+                phase_tracker.finish()
                 logger.info("BENCH_PROCESS_EXIT: rc=%d", self.process.returncode)
 
 
+            # Negative: killed by a signal, or (remote) the channel closed
+            # without an exit status.
+            lost = self.process.returncode < 0
             if self.process.returncode == 0:
-                _cfg.socketio.emit('status', {
+                succeeded = True
+                self.emit('status', {
                     'status': 'completed',
                     'message': 'Benchmark completed',
                     'timestamp': datetime.now().isoformat(),
                     'run_id': run_id,
-                }, room=session_id)
+                }, session_id)
             else:
                 fail_msg = self.last_error if self.last_error else f'Failed: {self.process.returncode} (No error captured)'
-                _cfg.socketio.emit('status', {
+                self.emit('status', {
                     'status': 'failed',
                     'message': fail_msg,
                     'timestamp': datetime.now().isoformat(),
                     'run_id': run_id,
-                }, room=session_id)
+                }, session_id)
         except Exception as e:
-            _cfg.socketio.emit('error', {
+            lost = isinstance(e, _CONNECTION_ERRORS)
+            self.emit('error', {
                 'message': str(e),
                 'timestamp': datetime.now().isoformat(),
                 'run_id': run_id,
-            }, room=session_id)
+            }, session_id)
         finally:
+            # stop_benchmark() clears `running` before terminating, so a
+            # lost run with the flag still set was not asked for. Script
+            # failures would fail again on resume and are not recorded.
+            interrupted = self.running and lost and not succeeded
+            self._stop_cell_sync()
             if executor is not None and executor.is_remote:
                 # Sync results and logs back from remote
+                sync_started = time.time()
                 try:
                     executor.sync_from_remote(str(RESULTS_DIR.parent), str(RESULTS_DIR))
                     executor.sync_from_remote(str(LOGS_DIR.parent), str(LOGS_DIR))
                 except Exception as e:
                     logger.error("Error syncing back results: %s", e)
+                if phase_tracker is not None:
+                    phase_tracker.add('sync', time.time() - sync_started)
+                if succeeded:
+                    discard_staging_copy(config, self.dut)
+                results_watcher.notify()
+            remove_run_conf(executor, self.dut)
+
+            if succeeded and phase_tracker is not None:
+                try:
+                    eta_model.record(run_profile(config), phase_tracker, config)
+                except Exception as exc:
+                    logger.warning("ETA history update failed: %s", exc)
+
+            if succeeded:
+                ResumableRuns.pop(self.dut)
+            elif interrupted and executor is not None:
+                self._mark_resumable(config, session_id, run_id, 'lost')
 
             with self._start_lock:
                 self.running = False
@@ -709,7 +1240,102 @@ class BenchmarkManager:
                 self.active_run_id = None
                 self.session_id = None
                 self.runtime_config = None
-            stop_giostat_monitoring()
+            stop_giostat_monitoring(manager=self)
+            self._run_completion_hooks(run_id, session_id, succeeded)
+
+
+class Fleet:
+    """Registry of per-DUT run slots (one BenchmarkManager each)."""
+
+    def __init__(self, manager_factory=BenchmarkManager):
+        self._manager_factory = manager_factory
+        self._slots = {}
+        self._lock = threading.Lock()
+        # Shared by every slot; see BenchmarkManager.completion_hooks.
+        self.completion_hooks = []
+
+    @staticmethod
+    def dut_key(config):
+        config = config or {}
+        if config.get('REMOTE_MODE') and config.get('DUT_IP'):
+            return str(config['DUT_IP'])
+        return LOCAL_SLOT
+
+    @staticmethod
+    def state_file(key):
+        if key == LOCAL_SLOT:
+            # None keeps BenchmarkState's ACTIVE_STATE_FILE default.
+            return None
+        return LOGS_DIR / f"{_cfg.ACTIVE_STATE_FILE.stem}-{clean_name(key, 'dut')}.json"
+
+    def slot(self, key):
+        with self._lock:
+            manager = self._slots.get(key)
+            if manager is None:
+                manager = self._manager_factory(
+                    dut=key,
+                    state_file=self.state_file(key),
+                    completion_hooks=self.completion_hooks,
+                )
+                self._slots[key] = manager
+            return manager
+
+    def slot_for(self, config):
+        return self.slot(self.dut_key(config))
+
+    def slots(self):
+        with self._lock:
+            return list(self._slots.values())
+
+    def find_run(self, run_id):
+        return next((manager for manager in self.slots() if run_id and manager.active_run_id == run_id), None)
+
+    def result_name(self, run_id):
+        """Result archive the finished run `run_id` reported, or None."""
+        for manager in self.slots():
+            if run_id and manager.last_result and manager.last_result[0] == run_id:
+                return manager.last_result[1]
+        return None
+
+    def active_run_ids(self):
+        return {manager.active_run_id for manager in self.slots() if manager.active_run_id}
+
+    def select(self, run_id=None, dut=None):
+        """Slot a single-run caller means: by run_id, by DUT, else the most
+        recently started running slot, else the most recently used one."""
+        if run_id:
+            return self.find_run(run_id)
+        if dut:
+            return self.slot(dut)
+        slots = sorted(self.slots(), key=lambda manager: manager.started_at or 0, reverse=True)
+        running = [manager for manager in slots if manager.running]
+        return (running or slots or [self.slot(LOCAL_SLOT)])[0]
+
+    def saved_states(self):
+        """Yield (state_path, state) for every slot state file on disk."""
+        pattern = f"{_cfg.ACTIVE_STATE_FILE.stem}*.json"
+        for path in sorted(LOGS_DIR.glob(pattern)):
+            state = BenchmarkState.load(path)
+            if state:
+                yield path, state
+
+    def recover(self):
+        """recover_state() every saved run into its DUT's slot.
+
+        A state written before per-DUT slots (remote run in
+        ACTIVE_STATE_FILE) is moved to its slot's file first.
+        """
+        recovered = []
+        for path, state in list(self.saved_states()):
+            manager = self.slot_for(state.get('config'))
+            target = manager.state_file or _cfg.ACTIVE_STATE_FILE
+            if path != target:
+                BenchmarkState.save(state, target)
+                BenchmarkState.clear(path)
+            if manager.recover_state(state):
+                recovered.append(manager)
+        return recovered
 
 
-benchmark_manager = BenchmarkManager()
+fleet = Fleet()
+benchmark_manager = fleet.slot(LOCAL_SLOT)
@@ -1,7 +1,8 @@
 """giostat watchdog lifecycle.
 
-Owns no state of its own — process/thread/event live on `benchmark_manager`
-(B13 in AUDIT.md) so stop_benchmark() can deterministically tear them down.
+Owns no state of its own — process/thread/event live on the run slot's
+BenchmarkManager (B13 in AUDIT.md) so stop_benchmark() can deterministically
+tear them down. Callers pass their slot as `manager`; the default
 benchmark_manager is imported lazily to break the manager↔monitor cycle.
 """
 
@@ -10,26 +11,32 @@ import threading
 import time
 from datetime import datetime
 
-import config
-from config import LOGS_DIR, logger, strip_ansi
+from config import LOGS_DIR, clean_name, logger, strip_ansi
 from state import ConfigManager
 from executor import RemoteExecutor
 
 
-def start_giostat_monitoring(session_id, executor=None):
-    from manager import benchmark_manager
+def _default_manager(manager):
+    if manager is None:
+        from manager import benchmark_manager
+        manager = benchmark_manager
+    return manager
+
+
+def start_giostat_monitoring(session_id, executor=None, manager=None):
+    benchmark_manager = _default_manager(manager)
     benchmark_manager.stop_giostat_event.clear()
     thread = threading.Thread(
         target=monitor_giostat,
-        args=(session_id, executor),
+        args=(session_id, executor, benchmark_manager),
         daemon=True,
     )
     benchmark_manager.giostat_thread = thread
     thread.start()
 
 
-def stop_giostat_monitoring(join_timeout=3):
-    from manager import benchmark_manager
+def stop_giostat_monitoring(join_timeout=3, manager=None):
+    benchmark_manager = _default_manager(manager)
     benchmark_manager.stop_giostat_event.set()
     proc = benchmark_manager.giostat_process
     if proc is not None:
@@ -53,16 +60,17 @@ def stop_giostat_monitoring(join_timeout=3):
     benchmark_manager.giostat_thread = None
 
 
-def monitor_giostat(session_id, executor=None):
-    from manager import benchmark_manager
+def monitor_giostat(session_id, executor=None, manager=None):
+    benchmark_manager = _default_manager(manager)
 
-    # Open debug log file for giostat output
-    debug_log_path = LOGS_DIR / "giostat_debug.log"
+    # Open debug log file for giostat output (one per fleet slot)
+    suffix = "" if benchmark_manager.dut == "local" else f"-{clean_name(benchmark_manager.dut, 'dut')}"
+    debug_log_path = LOGS_DIR / f"giostat_debug{suffix}.log"
     MAX_LOG_SIZE = 10 * 1024 * 1024  # 10MB max log size
     
     try:
         if not executor:
-            executor = RemoteExecutor(ConfigManager.load_config())
+            executor = RemoteExecutor(benchmark_manager.runtime_config or ConfigManager.load_config())
         
         # Check if log file exceeds 10MB, if so truncate it
         if debug_log_path.exists() and debug_log_path.stat().st_size > MAX_LOG_SIZE:
@@ -157,15 +165,16 @@ def monitor_giostat(session_id, executor=None):
                     if data['iops_read'] > 0 or data['iops_write'] > 0:
                         debug_log.write(f"DEBUG: Emitting data for {dev_name}: IOPS R:{data['iops_read']:.0f} W:{data['iops_write']:.0f}\n")
                     
-                    config.socketio.emit('giostat_data_v2', data, room=session_id)
+                    benchmark_manager.record_giostat_sample(data)
+                    benchmark_manager.emit('giostat_data_v2', data, session_id)
                     # Also keep v1 for simple terminal display if needed
-                    config.socketio.emit('giostat_data', {'line': line}, room=session_id)
+                    benchmark_manager.emit('giostat_data', {'line': line}, session_id)
                 except Exception as e:
                     logger.debug("Error parsing giostat line: %s", e)
-                    config.socketio.emit('giostat_data', {'line': line}, room=session_id)
+                    benchmark_manager.emit('giostat_data', {'line': line}, session_id)
             else:
                 # Fallback for raw lines
-                config.socketio.emit('giostat_data', {'line': line}, room=session_id)
+                benchmark_manager.emit('giostat_data', {'line': line}, session_id)
                 
     except Exception as e:
         logger.error("Error in giostat monitoring: %s", e)
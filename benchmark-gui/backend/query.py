@@ -0,0 +1,207 @@
+"""Server-side filter / projection / group-by over result rows.
+
+The dashboard used to fetch every row of every selected result and
+aggregate in the browser (aggregateBaseline in ComparisonDashboard.jsx).
+run_query() does the same work with pandas over a cached DataFrame per
+(result, type) so comparing many runs only transfers the cells on screen.
+
+Row loading is injected (`load_rows(result_name, req_type) -> list[dict]`)
+so this module does not depend on the FastAPI helpers. Cached frames are
+dropped by invalidate(), which the results watcher calls per result.
+
+The same typed frames are exported as one Arrow IPC (Feather v2) file per
+run and type under `export_dir`, so notebooks can load typed columns
+instead of re-parsing CSV text. Files are named by a hash of the result
+name, the type and a signature of the rows. pyarrow is only needed for
+the export.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+FILTER_COLUMNS = (
+    "result", "RAID_type", "Workload", "BlockSize", "Queue Depth", "Threads",
+    "controller", "stage", "Type", "RAID_status",
+)
+NUMERIC_FILTER_COLUMNS = ("BlockSize", "Queue Depth", "Threads")
+AGGREGATIONS = ("sum", "mean", "max")
+MAX_CACHED_FRAMES = 32
+
+
+class QueryError(ValueError):
+    """Invalid query (unknown column, aggregation, ...)."""
+
+
+class ResultFrameCache:
+    def __init__(self, load_rows, max_entries=MAX_CACHED_FRAMES, export_dir=None):
+        self._load_rows = load_rows
+        self._max_entries = max_entries
+        self._export_dir = export_dir
+        self._frames = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, result_name, req_type=None):
+        key = (result_name, req_type)
+        with self._lock:
+            frame = self._frames.get(key)
+            if frame is not None:
+                self._frames.move_to_end(key)
+                return frame
+        frame = self._build(result_name, req_type)
+        with self._lock:
+            self._frames[key] = frame
+            self._frames.move_to_end(key)
+            while len(self._frames) > self._max_entries:
+                self._frames.popitem(last=False)
+        return frame
+
+    def _build(self, result_name, req_type):
+        frame = pd.DataFrame(self._load_rows(result_name, req_type))
+        frame["result"] = result_name
+        # CSV values arrive as strings (object, or the "str" dtype on
+        # pandas 3); convert every column that is fully numeric so filters
+        # and aggregations work on numbers.
+        for column in frame.columns:
+            if frame[column].dtype == object or pd.api.types.is_string_dtype(frame[column].dtype):
+                converted = pd.to_numeric(frame[column], errors="coerce")
+                if converted.notna().sum() == frame[column].replace("", pd.NA).notna().sum():
+                    frame[column] = converted
+        return frame
+
+    @staticmethod
+    def _export_prefix(result_name):
+        # Hash the exact name: clean_name() maps "a b" and "a_b" (and long
+        # names sharing a prefix) to the same string. Every prefix has the
+        # same length, so one result's glob never matches another's files.
+        return hashlib.sha256(result_name.encode("utf-8")).hexdigest()[:32] + "-"
+
+    @staticmethod
+    def _frame_signature(frame):
+        digest = hashlib.sha256("\0".join(str(column) for column in frame.columns).encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+        return digest.hexdigest()[:16]
+
+    def export_arrow(self, result_name, req_type=None):
+        """Return the Arrow file for (result, type), writing it if missing.
+
+        The file name carries a signature of the frame it was written
+        from, so an export older than the current rows is rewritten
+        instead of served. Raises ImportError when pyarrow is not installed.
+        """
+        import pyarrow.feather as feather
+
+        frame = self.get(result_name, req_type)
+        self._export_dir.mkdir(parents=True, exist_ok=True)
+        prefix = f"{self._export_prefix(result_name)}{req_type or 'all'}-"
+        path = self._export_dir / f"{prefix}{self._frame_signature(frame)}.arrow"
+        if path.exists():
+            return path
+        frame = frame.copy()
+        # Leftover object columns are text (or text with gaps); give Arrow
+        # a single type instead of letting it guess per chunk.
+        for column in frame.columns:
+            if frame[column].dtype == object:
+                frame[column] = frame[column].astype("string")
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        feather.write_feather(frame, tmp_path, compression="lz4")
+        os.replace(tmp_path, path)
+        for stale in self._export_dir.glob(f"{prefix}*.arrow"):
+            if stale != path:
+                try:
+                    stale.unlink()
+                except OSError:
+                    pass
+        return path
+
+    def invalidate(self, result_name=None):
+        with self._lock:
+            if result_name is None:
+                self._frames.clear()
+            else:
+                for key in [key for key in self._frames if key[0] == result_name]:
+                    del self._frames[key]
+        if self._export_dir is None or not self._export_dir.exists():
+            return
+        prefix = self._export_prefix(result_name) if result_name is not None else ""
+        for path in self._export_dir.glob(f"{prefix}*.arrow"):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+def _apply_filters(frame, filters):
+    for column, values in (filters or {}).items():
+        if column not in FILTER_COLUMNS:
+            raise QueryError(f"Filtering on '{column}' is not supported")
+        if column not in frame.columns:
+            return frame.iloc[0:0]
+        if not isinstance(values, (list, tuple)):
+            values = [values]
+        if column in NUMERIC_FILTER_COLUMNS:
+            wanted = pd.to_numeric(pd.Series(list(values)), errors="coerce").dropna().tolist()
+            frame = frame[pd.to_numeric(frame[column], errors="coerce").isin(wanted)]
+        else:
+            frame = frame[frame[column].astype(str).isin([str(value) for value in values])]
+    return frame
+
+
+def _columnar(frame):
+    frame = frame.astype(object).where(frame.notna(), None)
+    return {
+        "length": len(frame),
+        "columns": {str(column): frame[column].tolist() for column in frame.columns},
+    }
+
+
+def run_query(cache, results, req_type=None, columns=None, filters=None,
+              group_by=None, aggregations=None, limit=None):
+    """Return {'length', 'columns': {name: list}} for the query.
+
+    Without group_by the filtered rows are projected onto `columns`. With
+    group_by, `aggregations` maps metric column -> 'sum' | 'mean' | 'max'
+    and one row per group is returned (plus a 'samples' count).
+    """
+    frames = [cache.get(name, req_type) for name in results]
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return {"length": 0, "columns": {}}
+    frame = pd.concat(frames, ignore_index=True, sort=False)
+    frame = _apply_filters(frame, filters).copy()
+
+    if group_by:
+        missing = [column for column in group_by if column not in frame.columns]
+        if missing:
+            raise QueryError(f"Unknown group_by column(s): {', '.join(missing)}")
+        aggregations = aggregations or {}
+        for column, func in aggregations.items():
+            if func not in AGGREGATIONS:
+                raise QueryError(f"Unsupported aggregation '{func}' for '{column}'")
+            if column not in frame.columns:
+                raise QueryError(f"Unknown column '{column}'")
+            if not pd.api.types.is_numeric_dtype(frame[column]):
+                # Mixed dtypes after concat (numeric in one run, text in another).
+                frame[column] = pd.to_numeric(frame[column], errors="coerce")
+                if frame[column].isna().all():
+                    raise QueryError(f"Column '{column}' is not numeric")
+        grouped = frame.groupby(list(group_by), dropna=False, sort=True)
+        named = {
+            column: pd.NamedAgg(column=column, aggfunc=func)
+            for column, func in aggregations.items()
+            if column not in group_by
+        }
+        named["samples"] = pd.NamedAgg(column=group_by[0], aggfunc="size")
+        frame = grouped.agg(**named).reset_index()
+    elif columns:
+        missing = [column for column in columns if column not in frame.columns]
+        if missing:
+            raise QueryError(f"Unknown column(s): {', '.join(missing)}")
+        frame = frame[list(columns)]
+
+    if limit is not None:
+        frame = frame.head(limit)
+    return _columnar(frame)
@@ -0,0 +1,97 @@
+"""Cross-run regression detection.
+
+compare_runs() matches the rows of a baseline run and a candidate run (as
+returned by fastapi_app.collect_result_rows) by test cell and reports the
+relative change of IOPS, bandwidth and latency per cell. A change beyond
+the metric's threshold, in the metric's bad direction, is a regression;
+beyond it in the good direction, an improvement.
+
+Rows of the same cell within a run are aggregated like the dashboard does
+(charts.py): IOPS and bandwidth summed across PDs, latency averaged.
+"""
+
+from charts import as_label, as_number
+
+MATCH_COLUMNS = ("controller", "RAID_type", "Workload", "BlockSize", "Queue Depth", "Threads", "stage")
+
+# metric column -> (threshold group, higher_is_better, aggregation)
+METRICS = {
+    "IOPS(K)": ("iops", True, "sum"),
+    "Bandwidth (GB/s)": ("bandwidth", True, "sum"),
+    "Read Latency (us)": ("latency", False, "mean"),
+    "Write Latency (us)": ("latency", False, "mean"),
+}
+
+# Percent change that counts as a regression/improvement, per group.
+DEFAULT_THRESHOLDS = {"iops": 5.0, "bandwidth": 5.0, "latency": 10.0}
+
+
+def _cell_key(row):
+    return tuple(as_label(row.get(column)) for column in MATCH_COLUMNS)
+
+
+def _aggregate(rows):
+    cells = {}
+    for row in rows or []:
+        cell = cells.setdefault(_cell_key(row), {})
+        for metric in METRICS:
+            value = as_number(row.get(metric))
+            if value is None:
+                continue
+            cell.setdefault(metric, []).append(value)
+    return {
+        key: {
+            metric: (sum(values) if METRICS[metric][2] == "sum" else sum(values) / len(values))
+            for metric, values in metrics.items()
+        }
+        for key, metrics in cells.items()
+    }
+
+
+def compare_runs(baseline_rows, candidate_rows, thresholds=None):
+    """Return {'regressions', 'improvements', 'unchanged', 'unmatched', 'thresholds'}.
+
+    Each regression/improvement entry carries the matched cell (one field
+    per MATCH_COLUMNS name), the metric, both values and `delta_pct`.
+    Entries are ordered worst-first.
+    """
+    limits = dict(DEFAULT_THRESHOLDS)
+    limits.update({key: float(value) for key, value in (thresholds or {}).items() if key in limits})
+
+    baseline = _aggregate(baseline_rows)
+    candidate = _aggregate(candidate_rows)
+    regressions, improvements = [], []
+    unchanged = 0
+
+    for key in sorted(set(baseline) & set(candidate)):
+        for metric, (group, higher_is_better, _) in METRICS.items():
+            before = baseline[key].get(metric)
+            after = candidate[key].get(metric)
+            if before is None or after is None or before == 0:
+                continue
+            delta_pct = (after - before) / abs(before) * 100.0
+            signed = delta_pct if higher_is_better else -delta_pct
+            entry = {
+                **dict(zip(MATCH_COLUMNS, key)),
+                "metric": metric,
+                "baseline": round(before, 4),
+                "candidate": round(after, 4),
+                "delta_pct": round(delta_pct, 2),
+            }
+            if signed <= -limits[group]:
+                regressions.append((signed, entry))
+            elif signed >= limits[group]:
+                improvements.append((-signed, entry))
+            else:
+                unchanged += 1
+
+    return {
+        "regressions": [entry for _, entry in sorted(regressions, key=lambda item: item[0])],
+        "improvements": [entry for _, entry in sorted(improvements, key=lambda item: item[0])],
+        "unchanged": unchanged,
+        "unmatched": {
+            "baseline_only": len(set(baseline) - set(candidate)),
+            "candidate_only": len(set(candidate) - set(baseline)),
+        },
+        "thresholds": limits,
+    }
@@ -0,0 +1,218 @@
+"""Persistent benchmark run queue.
+
+Queued configs run one after another without anyone clicking Start: when a
+run finishes and its results are synced back, the fleet's completion hooks
+call RunQueue.on_run_finished and then dispatch(), which starts the next
+queued entry of every idle DUT slot (manager.Fleet). Entries for different
+DUTs run concurrently; entries for the same DUT keep their queue order.
+
+The queue is written atomically to LOGS_DIR/run_queue.json (like
+BenchmarkState) so it survives backend restarts. Configs are stored through
+sanitize_config; DUT passwords live only in memory. After a restart, remote
+entries therefore hold their DUT's queue (`needs_password`) until the
+operator supplies the password again through resume(). A DUT with an
+interrupted run waiting to be resumed (state.ResumableRuns) holds its queue
+too: the next run would reuse its staging dir and wipe its checkpoints.
+
+Entry status: queued -> running -> completed | failed, or cancelled.
+A 'running' entry whose run is not recovered at startup becomes
+'interrupted'.
+"""
+
+import json
+import os
+import threading
+import uuid
+from datetime import datetime
+
+import config
+from config import audit_event, generate_run_id, logger
+from state import ResumableRuns, sanitize_config
+
+QUEUE_VERSION = 1
+FINISHED_STATUSES = ("completed", "failed", "cancelled", "interrupted")
+# Finished entries kept for the queue view; older ones are dropped.
+HISTORY_LIMIT = 50
+
+
+class QueueError(ValueError):
+    """Invalid queue operation (unknown entry, wrong status, ...)."""
+
+
+def _now():
+    return datetime.now().isoformat()
+
+
+class RunQueue:
+    def __init__(self, path=None):
+        self.path = path or config.LOGS_DIR / "run_queue.json"
+        self._lock = threading.Lock()
+        self._entries = self._load()
+        # entry id -> DUT_PASSWORD, never persisted.
+        self._passwords = {}
+
+    def _load(self):
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            logger.error("Error loading run queue: %s", e)
+            return []
+        if data.get('version') != QUEUE_VERSION:
+            return []
+        return data.get('entries', [])
+
+    def _save(self):
+        finished = [entry for entry in self._entries if entry['status'] in FINISHED_STATUSES]
+        for entry in finished[:-HISTORY_LIMIT]:
+            self._entries.remove(entry)
+        try:
+            self.path.parent.mkdir(exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump({'version': QUEUE_VERSION, 'entries': self._entries}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error("Error saving run queue: %s", e)
+
+    def _find(self, entry_id):
+        for entry in self._entries:
+            if entry['id'] == entry_id:
+                return entry
+        raise QueueError(f"Queue entry not found: {entry_id}")
+
+    def _needs_password(self, entry):
+        return bool(entry['config'].get('REMOTE_MODE')) and entry['id'] not in self._passwords
+
+    def _public(self, entry):
+        return {**entry, 'needs_password': entry['status'] == 'queued' and self._needs_password(entry)}
+
+    def list(self):
+        with self._lock:
+            return [self._public(entry) for entry in self._entries]
+
+    def enqueue(self, cfg, session_id=None, label=None):
+        entry = {
+            'id': uuid.uuid4().hex[:12],
+            'label': label or cfg.get('NVME_INFO') or 'benchmark',
+            'config': sanitize_config(cfg),
+            'session_id': session_id,
+            'status': 'queued',
+            'run_id': None,
+            'created_at': _now(),
+            'started_at': None,
+            'finished_at': None,
+        }
+        with self._lock:
+            if cfg.get('DUT_PASSWORD'):
+                self._passwords[entry['id']] = cfg['DUT_PASSWORD']
+            self._entries.append(entry)
+            self._save()
+            return self._public(entry)
+
+    def cancel(self, entry_id):
+        with self._lock:
+            entry = self._find(entry_id)
+            if entry['status'] != 'queued':
+                raise QueueError(f"Only queued entries can be cancelled (entry is {entry['status']})")
+            entry['status'] = 'cancelled'
+            entry['finished_at'] = _now()
+            self._passwords.pop(entry_id, None)
+            self._save()
+            return self._public(entry)
+
+    def reorder(self, entry_ids):
+        """Put the queued entries in `entry_ids` order; others keep their place."""
+        with self._lock:
+            queued = [entry for entry in self._entries if entry['status'] == 'queued']
+            by_id = {entry['id']: entry for entry in queued}
+            unknown = [entry_id for entry_id in entry_ids if entry_id not in by_id]
+            if unknown:
+                raise QueueError(f"Not queued: {', '.join(unknown)}")
+            ordered = [by_id[entry_id] for entry_id in entry_ids]
+            ordered += [entry for entry in queued if entry['id'] not in entry_ids]
+            slots = iter(ordered)
+            self._entries = [next(slots) if entry['status'] == 'queued' else entry for entry in self._entries]
+            self._save()
+            return [self._public(entry) for entry in self._entries]
+
+    def resume(self, entry_id, password=None):
+        """Re-arm an entry after a restart: store its password, requeue it if
+        it was interrupted."""
+        with self._lock:
+            entry = self._find(entry_id)
+            if entry['status'] not in ('queued', 'interrupted'):
+                raise QueueError(f"Entry is {entry['status']}")
+            if password:
+                self._passwords[entry_id] = password
+            if entry['status'] == 'interrupted':
+                entry.update(status='queued', run_id=None, started_at=None, finished_at=None)
+            self._save()
+            return self._public(entry)
+
+    def reconcile(self, active_run_ids):
+        """Mark 'running' entries that did not survive a restart as interrupted."""
+        with self._lock:
+            changed = False
+            for entry in self._entries:
+                if entry['status'] == 'running' and entry['run_id'] not in active_run_ids:
+                    entry['status'] = 'interrupted'
+                    entry['finished_at'] = _now()
+                    changed = True
+            if changed:
+                self._save()
+
+    def dispatch(self, fleet):
+        """Start the first queued entry of every idle DUT slot.
+
+        Returns the started entries. A remote entry without a password holds
+        its DUT's queue rather than being skipped, so runs keep their order;
+        so does a resumable run on the DUT until it is resumed or discarded.
+        """
+        started = []
+        resumable = ResumableRuns.load()
+        with self._lock:
+            seen = set()
+            for entry in self._entries:
+                if entry['status'] != 'queued':
+                    continue
+                dut = fleet.dut_key(entry['config'])
+                if dut in seen:
+                    continue
+                seen.add(dut)
+                slot = fleet.slot(dut)
+                if slot.running or dut in resumable or self._needs_password(entry):
+                    continue
+                run_config = dict(entry['config'])
+                if entry['id'] in self._passwords:
+                    run_config['DUT_PASSWORD'] = self._passwords[entry['id']]
+                run_id = generate_run_id()
+                if slot.try_start(run_config, entry['session_id'], run_id) is None:
+                    continue
+                entry.update(status='running', run_id=run_id, started_at=_now())
+                started.append(self._public(entry))
+            if started:
+                self._save()
+        for entry in started:
+            audit_event("benchmark.start", run_id=entry['run_id'], session_id=entry['session_id'],
+                        dut=fleet.dut_key(entry['config']), queue_entry=entry['id'], config=entry['config'])
+            config.socketio.emit('queue', {'event': 'started', 'entry': entry}, room=entry['session_id'] or 'default')
+        return started
+
+    def on_run_finished(self, run_id, succeeded):
+        with self._lock:
+            for entry in self._entries:
+                if entry['status'] == 'running' and entry['run_id'] == run_id:
+                    entry['status'] = 'completed' if succeeded else 'failed'
+                    entry['finished_at'] = _now()
+                    self._passwords.pop(entry['id'], None)
+                    self._save()
+                    return self._public(entry)
+        return None
+
+
+run_queue = RunQueue()
@@ -12,7 +12,7 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass, field
-from typing import List
+from typing import Dict, List
 
 
 _DEFAULT_ORIGINS = (
@@ -29,11 +29,62 @@ def _parse_origins(raw: str) -> tuple[bool, List[str]]:
     return False, [o.strip() for o in raw.split(",") if o.strip()]
 
 
+def _parse_float(raw: str, default: float) -> float:
+    try:
+        value = float(raw)
+    except (TypeError, ValueError):
+        return default
+    return value if value > 0 else default
+
+
+def _parse_limit(raw: str, default: float) -> float:
+    # Like _parse_float, but 0 is meaningful ("off").
+    try:
+        return max(0.0, float(raw))
+    except (TypeError, ValueError):
+        return default
+
+
+def _parse_thresholds(raw: str) -> Dict[str, float]:
+    # "iops=5,bandwidth=5,latency=10" -> {"iops": 5.0, ...}; bad pairs ignored.
+    thresholds: Dict[str, float] = {}
+    for pair in raw.split(","):
+        key, _, value = pair.partition("=")
+        try:
+            thresholds[key.strip()] = float(value)
+        except ValueError:
+            continue
+    return thresholds
+
+
+def _parse_choice(raw: str, choices: tuple[str, ...], default: str) -> str:
+    value = raw.strip().lower()
+    return value if value in choices else default
+
+
 @dataclass(frozen=True)
 class Settings:
     api_key: str | None
     allow_all_origins: bool
     allowed_origins: List[str] = field(default_factory=list)
+    # "server" renders real-time snapshots from buffered giostat samples
+    # (snapshots.py); "browser" keeps the snapshot_request relay.
+    snapshot_mode: str = "server"
+    # Polling interval of watcher.py when the watchdog package is missing.
+    results_poll_interval: float = 10.0
+    # Overrides for regression.DEFAULT_THRESHOLDS used by the end-of-run
+    # comparison (percent change per metric group).
+    regression_thresholds: Dict[str, float] = field(default_factory=dict)
+    # MB/s for pulling each finished cell's results off the DUT while a
+    # remote run is still going (cell_sync.py); 0 turns it off.
+    cell_sync_bwlimit: float = 20.0
+    # Concurrent SFTP channels per pull from a DUT (transfer.py).
+    transfer_channels: int = 4
+    # Overrides for inventory_cache.DEFAULT_TTLS (seconds per data kind).
+    inventory_ttls: Dict[str, float] = field(default_factory=dict)
+    # Size cap of the thumbnail / WebP derivative cache (image_cache.py);
+    # 0 turns eviction off.
+    derivative_cache_mb: float = 2048.0
 
     @classmethod
     def from_env(cls) -> "Settings":
@@ -44,6 +95,29 @@ class Settings:
             api_key=api_key,
             allow_all_origins=allow_all,
             allowed_origins=origins or ["http://localhost:50072"],
+            snapshot_mode=_parse_choice(
+                os.environ.get("BENCHMARK_SNAPSHOT_MODE", "server"),
+                ("server", "browser"),
+                "server",
+            ),
+            results_poll_interval=_parse_float(
+                os.environ.get("BENCHMARK_RESULTS_POLL_INTERVAL", "10"), 10.0
+            ),
+            regression_thresholds=_parse_thresholds(
+                os.environ.get("BENCHMARK_REGRESSION_THRESHOLDS", "")
+            ),
+            cell_sync_bwlimit=_parse_limit(
+                os.environ.get("BENCHMARK_CELL_SYNC_BWLIMIT", "20"), 20.0
+            ),
+            transfer_channels=int(_parse_float(
+                os.environ.get("BENCHMARK_TRANSFER_CHANNELS", "4"), 4.0
+            )),
+            inventory_ttls=_parse_thresholds(
+                os.environ.get("BENCHMARK_INVENTORY_TTL", "")
+            ),
+            derivative_cache_mb=_parse_limit(
+                os.environ.get("BENCHMARK_DERIVATIVE_CACHE_MB", "2048"), 2048.0
+            ),
         )
 
 
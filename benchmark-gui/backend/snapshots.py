@@ -0,0 +1,161 @@
+"""Server-side rendering of the per-workload real-time snapshot.
+
+bench.sh emits `STATUS: SNAPSHOT:` shortly before each workload ends. The
+browser used to answer the relayed snapshot_request by rasterising
+RealTimeDashboard and POSTing a base64 PNG back to save_snapshot, so no
+browser meant no snapshot. Instead, BenchmarkManager buffers the giostat
+samples monitor.py parses and render_snapshot() draws the same CDM summary
+and read/write time series from them.
+
+matplotlib is optional (imported lazily). Rendering runs on worker threads,
+so it draws on a bare Figure with the Agg canvas and never touches pyplot's
+global figure manager, which is not thread-safe. renderer_available()
+reports whether it can be used; the manager falls back to the browser relay
+when it cannot.
+"""
+
+import re
+from datetime import datetime
+
+from config import RESULTS_DIR, clean_name, results_relative_path
+
+# giostat -xmcdz 5 (monitor.py) prints one line per device every 5 s.
+SAMPLE_INTERVAL = 5
+
+# Same device filters as RealTimeDashboard.filterDevicesByTarget.
+_STAGE_DEVICE_RE = {
+    'PD': re.compile(r'^nvme\d+n1$'),
+    'VD': re.compile(r'^gdg\d+(n\d+)?$'),
+    'MD': re.compile(r'^md\d+$'),
+}
+
+_METRICS = ('iops_read', 'iops_write', 'bw_read', 'bw_write', 'lat_read', 'lat_write')
+
+
+def renderer_available():
+    try:
+        import matplotlib  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def snapshot_path(test_name, output_dir):
+    """Return the report_view PNG path save_snapshot would have written.
+
+    Raises ValueError if output_dir escapes RESULTS_DIR.
+    """
+    relative = results_relative_path(output_dir)
+    save_dir = (RESULTS_DIR / relative / "report_view") if relative else (RESULTS_DIR / "report_view")
+    return save_dir / f"{clean_name(test_name, 'snapshot')}_report_view.png"
+
+
+def aggregate_samples(samples, stage=None):
+    """Collapse per-device (timestamp, data) samples into per-interval totals.
+
+    IOPS and bandwidth are summed across devices, latency is averaged —
+    the same aggregation RealTimeDashboard uses for its CDM boxes. Returns a
+    list of dicts with 'elapsed' (seconds since the first sample) plus the
+    six giostat metrics.
+    """
+    pattern = _STAGE_DEVICE_RE.get(stage)
+    samples = [(ts, data) for ts, data in samples
+               if pattern is None or pattern.match(data.get('dev', ''))]
+    if not samples:
+        return []
+
+    origin = samples[0][0]
+    buckets = {}
+    for ts, data in samples:
+        index = int((ts - origin) // SAMPLE_INTERVAL)
+        # A device reports once per interval; keep the newest line if the
+        # reader delivered two in the same bucket.
+        buckets.setdefault(index, {})[data.get('dev')] = data
+
+    points = []
+    for index in sorted(buckets):
+        devices = buckets[index].values()
+        count = len(devices)
+        point = {'elapsed': index * SAMPLE_INTERVAL}
+        for metric in _METRICS:
+            total = sum(float(dev.get(metric) or 0.0) for dev in devices)
+            point[metric] = total / count if metric.startswith('lat_') else total
+        points.append(point)
+    return points
+
+
+def _format_throughput(value):
+    return f"{value / 1000:.2f} GB/s" if value >= 1000 else f"{value:.2f} MB/s"
+
+
+def _format_iops(value):
+    if value >= 1000000:
+        return f"{value / 1000000:.2f} MIO/s"
+    if value >= 1000:
+        return f"{value / 1000:.2f} KIO/s"
+    return f"{value:.0f} IO/s"
+
+
+def _format_latency(value):
+    if value and value < 1:
+        return f"{value * 1000:.2f} us"
+    return f"{value:.3f} ms"
+
+
+def render_snapshot(samples, out_path, title, stage=None):
+    """Render the CDM summary and time series for `samples` to `out_path`.
+
+    Returns True when a PNG was written, False when there was nothing to
+    draw. Raises ImportError if matplotlib is unavailable.
+    """
+    points = aggregate_samples(samples, stage)
+    if not points:
+        return False
+
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    elapsed = [point['elapsed'] for point in points]
+    latest = points[-1]
+
+    fig = Figure(figsize=(14, 10), dpi=100)
+    FigureCanvasAgg(fig)
+    grid = fig.add_gridspec(4, 3, height_ratios=[0.6, 1, 1, 1], hspace=0.45)
+    fig.suptitle(title, fontsize=14, fontweight="bold")
+
+    summary = (
+        ("Throughput", _format_throughput, 'bw'),
+        ("IOPS", _format_iops, 'iops'),
+        ("Latency", _format_latency, 'lat'),
+    )
+    for column, (label, fmt, prefix) in enumerate(summary):
+        ax = fig.add_subplot(grid[0, column])
+        ax.axis("off")
+        ax.text(0.5, 0.8, label, ha="center", va="center", fontsize=12, fontweight="bold")
+        ax.text(0.5, 0.45, f"Read  {fmt(latest[f'{prefix}_read'])}", ha="center", va="center",
+                fontsize=11, color="#1f77b4")
+        ax.text(0.5, 0.15, f"Write {fmt(latest[f'{prefix}_write'])}", ha="center", va="center",
+                fontsize=11, color="#d62728")
+
+    series = (
+        ("Throughput (MB/s)", 'bw'),
+        ("IOPS", 'iops'),
+        ("Latency (ms)", 'lat'),
+    )
+    for row, (label, prefix) in enumerate(series, start=1):
+        ax = fig.add_subplot(grid[row, :])
+        ax.plot(elapsed, [point[f'{prefix}_read'] for point in points], label="Read", color="#1f77b4")
+        ax.plot(elapsed, [point[f'{prefix}_write'] for point in points], label="Write", color="#d62728")
+        ax.set_ylabel(label)
+        ax.grid(True, alpha=0.3)
+        ax.legend(loc="upper right")
+    ax.set_xlabel("Elapsed (s)")
+
+    fig.text(0.99, 0.005, f"Rendered {datetime.now().isoformat(timespec='seconds')}",
+             ha="right", va="bottom", fontsize=8, color="#666666")
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_name(out_path.name + ".tmp")
+    fig.savefig(tmp_path, format="png")
+    tmp_path.replace(out_path)
+    return True
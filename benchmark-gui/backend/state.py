@@ -1,6 +1,7 @@
 """Persistent state and config loader.
 
 BenchmarkState writes ACTIVE_STATE_FILE atomically (B19 in AUDIT.md).
+ResumableRuns remembers interrupted runs per DUT in RESUMABLE_FILE.
 ConfigManager reads/writes the .conf file. sanitize_config / public_config
 strip or redact DUT_PASSWORD before crossing trust boundaries.
 
@@ -11,44 +12,101 @@ local imports) so tests can redirect `config.LOGS_DIR` /
 
 import json
 import os
+import threading
 
 import config
 from config import logger
 
+# Fleet slots finishing together would otherwise lose each other's records
+# between ResumableRuns' load and write.
+_resumable_lock = threading.Lock()
+# Concurrent start / config requests share the one .conf file.
+_config_lock = threading.Lock()
+
 
 class BenchmarkState:
+    """Active-run state file. `path` defaults to ACTIVE_STATE_FILE; each
+    fleet slot other than the local one passes its own (manager.Fleet)."""
+
     @staticmethod
-    def save(state):
+    def save(state, path=None):
+        path = path or config.ACTIVE_STATE_FILE
         try:
             config.LOGS_DIR.mkdir(exist_ok=True)
-            tmp_path = config.ACTIVE_STATE_FILE.with_suffix(config.ACTIVE_STATE_FILE.suffix + '.tmp')
+            tmp_path = path.with_suffix(path.suffix + '.tmp')
             with open(tmp_path, 'w') as f:
                 json.dump(state, f)
                 f.flush()
                 os.fsync(f.fileno())
-            os.replace(tmp_path, config.ACTIVE_STATE_FILE)
+            os.replace(tmp_path, path)
         except Exception as e:
             logger.error("Error saving benchmark state: %s", e)
 
     @staticmethod
-    def load():
+    def load(path=None):
+        path = path or config.ACTIVE_STATE_FILE
         try:
-            if config.ACTIVE_STATE_FILE.exists():
-                with open(config.ACTIVE_STATE_FILE, 'r') as f:
+            if path.exists():
+                with open(path, 'r') as f:
                     return json.load(f)
         except Exception as e:
             logger.error("Error loading benchmark state: %s", e)
         return None
 
     @staticmethod
-    def clear():
+    def clear(path=None):
+        path = path or config.ACTIVE_STATE_FILE
         try:
-            if config.ACTIVE_STATE_FILE.exists():
-                config.ACTIVE_STATE_FILE.unlink()
+            if path.exists():
+                path.unlink()
         except Exception as e:
             logger.error("Error clearing benchmark state: %s", e)
 
 
+class ResumableRuns:
+    """Interrupted runs that can continue from their checkpoints (RESUME=true),
+    keyed by fleet slot. Configs are stored sanitized."""
+
+    @staticmethod
+    def load():
+        try:
+            if config.RESUMABLE_FILE.exists():
+                with open(config.RESUMABLE_FILE, 'r') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.error("Error loading resumable runs: %s", e)
+        return {}
+
+    @staticmethod
+    def _write(runs):
+        try:
+            config.LOGS_DIR.mkdir(exist_ok=True)
+            tmp_path = config.RESUMABLE_FILE.with_suffix(config.RESUMABLE_FILE.suffix + '.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(runs, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, config.RESUMABLE_FILE)
+        except Exception as e:
+            logger.error("Error saving resumable runs: %s", e)
+
+    @staticmethod
+    def save(dut, record):
+        with _resumable_lock:
+            runs = ResumableRuns.load()
+            runs[dut] = record
+            ResumableRuns._write(runs)
+
+    @staticmethod
+    def pop(dut):
+        with _resumable_lock:
+            runs = ResumableRuns.load()
+            record = runs.pop(dut, None)
+            if record is not None:
+                ResumableRuns._write(runs)
+            return record
+
+
 class ConfigManager:
     @staticmethod
     def load_config():
@@ -62,10 +120,13 @@ class ConfigManager:
     def save_config(cfg):
         sanitized = {
             key: value for key, value in cfg.items()
-            if key not in config.SENSITIVE_CONFIG_KEYS
+            if key not in config.SENSITIVE_CONFIG_KEYS and key not in config.TRANSIENT_CONFIG_KEYS
         }
-        with open(config.CONFIG_FILE, 'w') as f:
-            json.dump(sanitized, f, indent=2)
+        tmp_path = config.CONFIG_FILE.with_suffix(config.CONFIG_FILE.suffix + '.tmp')
+        with _config_lock:
+            with open(tmp_path, 'w') as f:
+                json.dump(sanitized, f, indent=2)
+            os.replace(tmp_path, config.CONFIG_FILE)
 
 
 def sanitize_config(cfg):
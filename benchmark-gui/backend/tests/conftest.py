@@ -0,0 +1,10 @@
+"""Shared pytest setup: the backend modules import each other flat (as in
+the Docker image), and the DUT-side helpers live in scripts/src."""
+
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(BACKEND_DIR.parent / "scripts" / "src"))
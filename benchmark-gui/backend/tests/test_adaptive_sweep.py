@@ -0,0 +1,72 @@
+import json
+
+import adaptive_sweep
+
+
+def _points(iops_by_qd):
+    # Latency keeps rising with QD, so only the IOPS gain decides the knee.
+    return {qd: (iops, float(qd)) for qd, iops in iops_by_qd.items()}
+
+
+def test_coarse_ladder_climbs_in_powers_of_four_up_to_the_max():
+    assert adaptive_sweep.coarse_ladder(1, 256) == [1, 4, 16, 64, 256]
+    assert adaptive_sweep.coarse_ladder(2, 100) == [2, 8, 32, 100]
+    assert adaptive_sweep.coarse_ladder(64, 64) == [64]
+
+
+def test_find_knee_normalises_the_gain_per_doubling():
+    # 1 -> 4 is two doublings: 1.44x is +20 % per doubling, still climbing.
+    points = _points({1: 100, 4: 144, 16: 150})
+    assert adaptive_sweep.find_knee(points, 10.0) == 1
+    assert adaptive_sweep.find_knee(_points({1: 100, 4: 144}), 10.0) is None
+
+
+def test_find_knee_needs_latency_to_rise():
+    points = {1: (100, 10.0), 4: (101, 10.0)}
+    assert adaptive_sweep.find_knee(points, 10.0) is None
+
+
+def test_next_qd_climbs_then_bisects_around_the_knee():
+    assert adaptive_sweep.next_qd({}, 1, 256, 10.0) == (1, None)
+    assert adaptive_sweep.next_qd(_points({1: 100}), 1, 256, 10.0) == (4, None)
+    points = _points({1: 100, 4: 400, 16: 1600, 64: 1700})
+    # Knee at 16: refine 4..16 first, then 16..64.
+    assert adaptive_sweep.next_qd(points, 1, 256, 10.0) == (8, 16)
+    points[8] = (800, 8.0)
+    assert adaptive_sweep.next_qd(points, 1, 256, 10.0) == (32, 16)
+    points[32] = (1650, 32.0)
+    assert adaptive_sweep.next_qd(points, 1, 256, 10.0) == (None, 16)
+
+
+def test_never_flattening_ends_at_the_max():
+    points = _points({qd: qd * 100 for qd in (1, 4, 16, 64, 256)})
+    assert adaptive_sweep.next_qd(points, 1, 256, 10.0) == (None, 256)
+
+
+def _cell(fio_dir, qd, iops, lat_ns=1000.0, device="nvme0n1"):
+    path = fio_dir / device / "4k" / f"randread-{qd}-8.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"jobs": [{"read": {"iops": iops, "lat_ns": {"mean": lat_ns}}, "write": {}}]}))
+
+
+def test_measured_points_sum_iops_and_average_latency_across_devices(tmp_path):
+    _cell(tmp_path, 16, 1000, 2000.0)
+    _cell(tmp_path, 16, 3000, 4000.0, device="nvme1n1")
+    _cell(tmp_path / ".iter2", 16, 99999)
+    assert adaptive_sweep.measured_points(tmp_path, "randread", "4k", "8") == {16: (4000, 3.0)}
+
+
+def test_main_stops_instead_of_retrying_a_failed_qd(tmp_path, capsys):
+    _cell(tmp_path, 1, 100, 1000.0)
+    args = [str(tmp_path), "randread", "4k", "8", "--qd-max", "16"]
+
+    adaptive_sweep.main(args)
+    assert capsys.readouterr().out.strip() == "NEXT 4"
+
+    # QD 4 ran but left no JSON: asking for it again ends the sweep.
+    adaptive_sweep.main(args + ["--attempted", "1,4"])
+    captured = capsys.readouterr()
+    assert captured.out.strip() == "DONE knee=None peak=1 reason=error"
+    assert "QD 4" in captured.err
+    summary = json.loads((tmp_path / adaptive_sweep.SUMMARY_NAME).read_text())
+    assert summary["randread-4k-8"]["stop_reason"] == "error"
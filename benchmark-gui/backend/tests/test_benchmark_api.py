@@ -0,0 +1,145 @@
+import pytest
+
+for _module in ("httpx", "fastapi.testclient", "socketio", "psutil", "paramiko", "scp"):
+    pytest.importorskip(_module)
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import config  # noqa: E402
+import fastapi_app  # noqa: E402
+import manager  # noqa: E402
+from state import ConfigManager, ResumableRuns  # noqa: E402
+
+
+class FakeSlot:
+    def __init__(self, dut):
+        self.dut = dut
+        self.running = False
+        self.state_file = None
+        self.started = []
+
+    def try_start(self, run_config, session_id, run_id):
+        if self.running:
+            return None
+        self.started.append((run_config, session_id, run_id))
+        self.running = True
+        return run_id
+
+    def recover_state(self, state):
+        return False
+
+
+class FakeFleet:
+    def __init__(self):
+        self.slots = {}
+
+    def slot(self, dut):
+        return self.slots.setdefault(dut, FakeSlot(dut))
+
+    def slot_for(self, run_config):
+        return self.slot(manager.Fleet.dut_key(run_config))
+
+
+class FakeExecutor:
+    def __init__(self, run_config):
+        self.config = run_config
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fleet(tmp_path, monkeypatch):
+    fleet = FakeFleet()
+    monkeypatch.setattr(config, "LOGS_DIR", tmp_path)
+    monkeypatch.setattr(config, "RESUMABLE_FILE", tmp_path / "resumable_benchmark.json")
+    monkeypatch.setattr(config, "CONFIG_FILE", tmp_path / "graid-bench.conf")
+    monkeypatch.setattr(fastapi_app, "fleet", fleet)
+    monkeypatch.setattr(fastapi_app, "audit_event", lambda *args, **kwargs: None)
+    monkeypatch.setattr(fastapi_app, "RemoteExecutor", FakeExecutor)
+    return fleet
+
+
+@pytest.fixture
+def client(fleet):
+    return TestClient(fastapi_app.app)
+
+
+def _record(dut, remote=True):
+    return {
+        "run_id": f"run-{dut}", "session_id": "default", "dut": dut, "reason": "lost",
+        "config": {"NVME_INFO": "MODEL", "DUT_IP": dut, "REMOTE_MODE": remote},
+        "needs_password": remote, "state": None,
+    }
+
+
+def test_resume_restarts_the_run_with_resume_set(client, fleet, monkeypatch):
+    monkeypatch.setattr(fastapi_app, "partial_results_left", lambda executor, run_config, dut: True)
+    ResumableRuns.save("10.0.0.1", _record("10.0.0.1"))
+
+    assert client.post("/api/benchmark/resume", json={}).status_code == 400  # needs the password
+    response = client.post("/api/benchmark/resume", json={"password": "secret", "session_id": "s1"})
+    assert response.status_code == 200
+    assert response.json()["data"]["resumed_run_id"] == "run-10.0.0.1"
+    (run_config, session_id, _), = fleet.slot("10.0.0.1").started
+    assert run_config["RESUME"] is True
+    assert run_config["DUT_PASSWORD"] == "secret"
+    assert session_id == "s1"
+
+
+def test_resume_without_checkpoints_drops_the_record(client, fleet, monkeypatch):
+    monkeypatch.setattr(fastapi_app, "partial_results_left", lambda executor, run_config, dut: False)
+    ResumableRuns.save("10.0.0.1", _record("10.0.0.1"))
+
+    response = client.post("/api/benchmark/resume", json={"dut": "10.0.0.1", "password": "secret"})
+    assert response.status_code == 409
+    assert ResumableRuns.load() == {}
+    assert fleet.slot("10.0.0.1").started == []
+
+
+def test_resume_needs_a_dut_when_several_runs_are_resumable(client):
+    assert client.post("/api/benchmark/resume", json={}).status_code == 404
+    ResumableRuns.save("10.0.0.1", _record("10.0.0.1"))
+    ResumableRuns.save("10.0.0.2", _record("10.0.0.2"))
+    assert client.post("/api/benchmark/resume", json={}).status_code == 400
+    assert client.post("/api/benchmark/resume", json={"dut": "10.0.0.3"}).status_code == 404
+
+
+def test_discarding_a_resumable_run_releases_the_queue(client, monkeypatch):
+    dispatched = []
+    monkeypatch.setattr(fastapi_app.run_queue, "dispatch", dispatched.append)
+    ResumableRuns.save("10.0.0.1", _record("10.0.0.1"))
+
+    response = client.post("/api/benchmark/resumable/10.0.0.1/discard")
+    assert response.status_code == 200
+    assert ResumableRuns.load() == {}
+    assert len(dispatched) == 1
+    assert client.post("/api/benchmark/resumable/10.0.0.1/discard").status_code == 404
+
+
+def test_start_claims_the_dut_slot_and_saves_the_form(client, fleet):
+    form = {"NVME_INFO": "MODEL", "REMOTE_MODE": True, "DUT_IP": "10.0.0.1", "DUT_PASSWORD": "secret"}
+    response = client.post("/api/benchmark/start", json={"config": form})
+    assert response.status_code == 200
+    assert response.json()["data"]["dut"] == "10.0.0.1"
+    assert len(fleet.slot("10.0.0.1").started) == 1
+    assert ConfigManager.load_config() == {"NVME_INFO": "MODEL", "REMOTE_MODE": True, "DUT_IP": "10.0.0.1"}
+
+    # A refused start leaves the saved form as it was.
+    busy = dict(form, NVME_INFO="OTHER")
+    assert client.post("/api/benchmark/start", json={"config": busy}).status_code == 409
+    assert ConfigManager.load_config()["NVME_INFO"] == "MODEL"
+
+
+def test_fleet_lists_every_slot(client, monkeypatch):
+    fleet = manager.Fleet()
+    monkeypatch.setattr(fastapi_app, "fleet", fleet)
+    busy = fleet.slot("10.0.0.2")
+    busy.running, busy.active_run_id = True, "run-2"
+    fleet.slot("10.0.0.1")
+
+    data = client.get("/api/fleet").json()["data"]
+    assert [(slot["dut"], slot["run_id"], slot["running"]) for slot in data["slots"]] == [
+        ("10.0.0.1", None, False), ("10.0.0.2", "run-2", True),
+    ]
+    assert data["running"] == 1
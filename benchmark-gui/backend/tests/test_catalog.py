@@ -0,0 +1,148 @@
+import os
+import threading
+import time
+
+import pytest
+
+from catalog import (
+    PARTIAL_PREFIX,
+    ResultsCatalog,
+    partial_result_name,
+    partial_result_path,
+)
+
+
+class Describer:
+    """describe() stand-in that records which entries were described."""
+
+    def __init__(self):
+        self.calls = []
+        self.gate = None
+
+    def __call__(self, name, path):
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.calls.append(name)
+        return {"row_count": len(name), "ssd_model": "MODEL-A" if name.startswith("run-a") else "MODEL-B", "size": 1}
+
+
+@pytest.fixture
+def root(tmp_path):
+    root = tmp_path / "results"
+    (root / ".cache").mkdir(parents=True)
+    return root
+
+
+def _catalog(root, describe):
+    return ResultsCatalog(root, root / ".cache" / "catalog.json", describe)
+
+
+def test_only_changed_entries_are_described_again(root):
+    (root / "run-a.tar").write_bytes(b"a")
+    (root / "run-bb").mkdir()
+    describe = Describer()
+    catalog = _catalog(root, describe)
+
+    entries, total = catalog.query()
+    assert total == 2
+    assert sorted(describe.calls) == ["run-a.tar", "run-bb"]
+
+    describe.calls.clear()
+    catalog.query()
+    assert describe.calls == []
+
+    (root / "run-bb" / "stage").mkdir()
+    catalog.query()
+    assert describe.calls == ["run-bb"]
+
+    describe.calls.clear()
+    catalog.invalidate("run-a.tar")
+    catalog.query()
+    assert describe.calls == ["run-a.tar"]
+
+
+def test_records_survive_a_restart(root):
+    (root / "run-a.tar").write_bytes(b"a")
+    _catalog(root, Describer()).query()
+
+    describe = Describer()
+    entries, _ = _catalog(root, describe).query()
+    assert [entry["name"] for entry in entries] == ["run-a.tar"]
+    assert describe.calls == []
+
+
+def test_removed_entries_drop_out(root):
+    (root / "run-a.tar").write_bytes(b"a")
+    catalog = _catalog(root, Describer())
+    catalog.query()
+    (root / "run-a.tar").unlink()
+    assert catalog.query() == ([], 0)
+
+
+def test_query_sorts_filters_and_pages(root):
+    for index, name in enumerate(("run-a.tar", "run-bbb.tar", "run-cc.tar")):
+        path = root / name
+        path.write_bytes(b"x")
+        os.utime(path, (1000 + index, 1000 + index))
+    catalog = _catalog(root, Describer())
+
+    entries, total = catalog.query(sort="-created")
+    assert [entry["name"] for entry in entries] == ["run-cc.tar", "run-bbb.tar", "run-a.tar"]
+    entries, _ = catalog.query(sort="row_count")
+    assert [entry["name"] for entry in entries] == ["run-a.tar", "run-cc.tar", "run-bbb.tar"]
+    entries, total = catalog.query(sort="name", limit=1, offset=1)
+    assert total == 3
+    assert [entry["name"] for entry in entries] == ["run-bbb.tar"]
+    entries, total = catalog.query(filter_text="model-a")
+    assert (total, entries[0]["name"]) == (1, "run-a.tar")
+    entries, _ = catalog.query(sort="bogus")
+    assert entries[0]["name"] == "run-cc.tar"
+
+
+def test_staging_dirs_are_listed_as_partial_entries(root):
+    keyed = root / ".test-temp-data" / "10.0.0.5" / "MODEL-result"
+    legacy = root / ".test-temp-data" / "OLD-result"
+    keyed.mkdir(parents=True)
+    legacy.mkdir(parents=True)
+    (root / ".test-temp-data" / "10.0.0.5" / "notes").mkdir()
+
+    entries, _ = _catalog(root, Describer()).query(sort="name")
+    partial = {entry["name"]: entry for entry in entries if entry["partial"]}
+    assert sorted(partial) == [f"{PARTIAL_PREFIX}10.0.0.5~MODEL-result", f"{PARTIAL_PREFIX}OLD-result"]
+    assert partial_result_path(root, f"{PARTIAL_PREFIX}10.0.0.5~MODEL-result") == keyed
+    assert partial_result_path(root, f"{PARTIAL_PREFIX}OLD-result") == legacy
+
+
+def test_partial_names_round_trip_and_reject_escapes(root):
+    assert partial_result_name(".test-temp-data/10.0.0.5/MODEL-result/MODEL/VD/fio") == \
+        f"{PARTIAL_PREFIX}10.0.0.5~MODEL-result"
+    assert partial_result_name(".test-temp-data/OLD-result/OLD") == f"{PARTIAL_PREFIX}OLD-result"
+    assert partial_result_name("run-a/x") is None
+    assert partial_result_path(root, "run-a.tar") is None
+    assert partial_result_path(root, f"{PARTIAL_PREFIX}..~x") is None
+    assert partial_result_path(root, f"{PARTIAL_PREFIX}a~b~c") is None
+
+
+def test_background_refresh_serves_the_last_catalog_meanwhile(root):
+    (root / "run-a.tar").write_bytes(b"a")
+    _catalog(root, Describer()).query()
+
+    describe = Describer()
+    describe.gate = threading.Event()
+    catalog = _catalog(root, describe)
+    (root / "run-bb.tar").write_bytes(b"b")
+    catalog.start()
+    try:
+        entries, _ = catalog.query()
+        assert [entry["name"] for entry in entries] == ["run-a.tar"]
+        assert catalog.building
+
+        describe.gate.set()
+        deadline = time.monotonic() + 5
+        while catalog.building and time.monotonic() < deadline:
+            time.sleep(0.02)
+        entries, _ = catalog.query()
+        assert sorted(entry["name"] for entry in entries) == ["run-a.tar", "run-bb.tar"]
+        assert not catalog.building
+    finally:
+        catalog.stop()
@@ -0,0 +1,62 @@
+from charts import as_label, as_number, build_chart_series
+
+
+def _row(**fields):
+    row = {
+        "stage": "afterdiscard",
+        "Type": "randread",
+        "BlockSize": "4",
+        "Queue Depth": "64",
+        "Threads": "8",
+        "RAID_type": "RAID5",
+        "RAID_status": "Normal",
+    }
+    row.update(fields)
+    return row
+
+
+def test_as_number_and_label_normalise_csv_values():
+    assert as_number("1.5") == 1.5
+    assert as_number("nan") is None
+    assert as_number("N/A") is None
+    assert as_label("64.0") == "64"
+    assert as_label(" N/A ") == "N/A"
+    assert as_label(None, "unknown") == "unknown"
+
+
+def test_pd_rows_sum_throughput_and_average_latency():
+    baseline = [
+        _row(**{"IOPS(K)": "100", "Read Latency (us)": "80"}),
+        _row(**{"IOPS(K)": "120", "Read Latency (us)": "120"}),
+    ]
+    series = build_chart_series(baseline, [])
+
+    assert series["length"] == 1
+    columns = series["columns"]
+    assert columns["group"] == ["PD"]
+    assert columns["raid"] == ["BASELINE"]
+    assert columns["bs"] == ["4k"]
+    assert columns["samples"] == [2]
+    assert columns["IOPS(K)"] == [220.0]
+    assert columns["Read Latency (us)"] == [100.0]
+
+
+def test_baseline_and_raid_rows_stay_separate_cells():
+    baseline = [_row(**{"IOPS(K)": "100"})]
+    raid = [
+        _row(**{"IOPS(K)": "300", "BlockSize": "1024"}),
+        _row(**{"IOPS(K)": "50", "controller": "MDADM"}),
+    ]
+    series = build_chart_series(baseline, raid)
+
+    cells = list(zip(series["columns"]["group"], series["columns"]["bs"], series["columns"]["IOPS(K)"]))
+    assert sorted(cells) == [("MD", "4k", 50.0), ("PD", "4k", 100.0), ("VD", "1m", 300.0)]
+    for column in series["columns"].values():
+        assert len(column) == series["length"]
+
+
+def test_all_zero_percentiles_are_dropped():
+    series = build_chart_series([_row(**{"99.00th": "0", "50.00th": "12"})], [])
+
+    assert series["percentiles"] == ["50.00th"]
+    assert "99.00th" not in series["columns"]
@@ -0,0 +1,90 @@
+import shlex
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+BENCH_SH = Path(__file__).resolve().parents[2] / "scripts" / "src" / "bench.sh"
+
+pytestmark = pytest.mark.skipif(shutil.which("bash") is None, reason="needs bash")
+
+# Everything run_benchfio_cell calls besides the checkpoint helpers.
+STUBS = r"""
+log_info() { echo "$*"; }
+update_progress() { :; }
+collect_log() { :; }
+python3() { :; }
+find_cpu_list_by_numa_node() { echo 0-3; }
+cut_cpu_list() { echo 0; }
+cat() {
+    if [[ "$1" == /sys/devices/system/node/online ]]; then echo 0; else command cat "$@"; fi
+}
+run_task() {
+    # bench-fio's JSON for the cell (mode/bs/qd/job are the caller's locals).
+    mkdir -p "$6/$bs"
+    echo '{}' > "$6/$bs/$mode-$qd-$job.json"
+    touch -d "@$(( $(date +%s) + 5 ))" "$6/$bs/$mode-$qd-$job.json"
+    echo "RAN $7"
+}
+"""
+
+
+def _checkpoint_functions():
+    text = BENCH_SH.read_text()
+    start = text.index("# RESUME support.")
+    cell = text.index("function run_benchfio_cell()", start)
+    end = text.index("\n}\n", cell) + 3
+    return text[start:end]
+
+
+def _bench(tmp_path, script, **env):
+    variables = {
+        "CHECKPOINT_DIR": str(tmp_path / "checkpoints"),
+        "OUTPUT_NAME": "SR-RAID5-4PD", "STAS": "Normal", "DEV_NAME": "VD",
+        "ITERATIONS": "2", "RESUME": "false", "WCD": "false",
+        "fio_dir": str(tmp_path / "fio"), "FIO_NAME": "fio", "RUNTIME": "30",
+        "cpus_counts": "4", "CPU_ALLOWED_SEQ": "0-3",
+        **env,
+    }
+    prelude = "".join(f"{key}={shlex.quote(value)}\n" for key, value in variables.items())
+    result = subprocess.run(
+        ["bash", "-c", prelude + STUBS + _checkpoint_functions() + "\n" + script],
+        capture_output=True, text=True, cwd=tmp_path, timeout=30,
+    )
+    assert result.returncode == 0, result.stderr
+    return result.stdout
+
+
+def test_resume_skips_only_checkpointed_cells(tmp_path):
+    first = _bench(tmp_path, "run_benchfio_cell randread 4k 64 8")
+    assert first.count("RAN ") == 2
+    cells = sorted(path.name for path in (tmp_path / "checkpoints" / "cells").iterdir())
+    assert cells == [
+        "SR-RAID5-4PD-randread_4k_qd64_8J-Normal-iter2.done",
+        "SR-RAID5-4PD-randread_4k_qd64_8J-Normal.done",
+    ]
+
+    # Interrupted during the second iteration: only that one runs again.
+    (tmp_path / "checkpoints" / "cells" / cells[0]).unlink()
+    resumed = _bench(tmp_path, "run_benchfio_cell randread 4k 64 8", RESUME="true")
+    assert "RESUME: skipping completed cell SR-RAID5-4PD-randread_4k_qd64_8J-Normal\n" in resumed
+    assert resumed.count("RAN ") == 1
+    assert "RAN SR-RAID5-4PD-randread_4k_qd64_8J-Normal-iter2" in resumed
+
+    # Without RESUME the checkpoints are ignored.
+    assert _bench(tmp_path, "run_benchfio_cell randread 4k 64 8").count("RAN ") == 2
+
+
+def test_cells_without_a_result_are_not_checkpointed(tmp_path):
+    out = _bench(tmp_path, "run_task() { :; }\nrun_benchfio_cell randread 4k 64 8\necho missed=$CELLS_MISSED",
+                 ITERATIONS="1")
+    assert "missed=1" in out
+    assert not (tmp_path / "checkpoints" / "cells").exists()
+
+
+def test_per_device_pd_runs_get_their_own_run_checkpoint(tmp_path):
+    out = _bench(tmp_path, "run_checkpoint", DEV_NAME="PD", RUN_PD_ALL="false", PD_NAME="nvme0n1", IODEPTH="64")
+    assert out.strip().endswith("/runs/SR-RAID5-4PD-Normal-QD64-nvme0n1.done")
+    out = _bench(tmp_path, "run_checkpoint", IODEPTH="64")
+    assert out.strip().endswith("/runs/SR-RAID5-4PD-Normal-QD64.done")
@@ -0,0 +1,100 @@
+import pytest
+
+from eta import EtaModel, PhaseTracker, phase_plan, run_profile
+
+CONFIG = {
+    "NVME_INFO": "MODEL-3.84TB",
+    "NVME_LIST": "nvme0n1 nvme1n1 nvme2n1 nvme3n1",
+    "TS_LS": "afterdiscard afterprecondition",
+    "QD_LS": "32 64",
+    "RUN_PD": "true",
+    "RUN_PD_ALL": "true",
+    "RUN_VD": "true",
+    "STA_LS": "Normal",
+    "RAID_TYPE": "RAID5 RAID10",
+    "VD_RUNTIME": "60",
+    "PD_RUNTIME": "30",
+    "REMOTE_MODE": True,
+}
+
+
+def _line(clock, status):
+    return f"[2026-01-01 00:{clock // 60:02d}:{clock % 60:02d}] STATUS: {status}"
+
+
+def test_run_profile_reads_capacity_from_the_model_name():
+    assert run_profile(CONFIG) == ("MODEL-3.84TB", 3840.0, 4)
+    assert run_profile({"NVME_INFO": "X-800G"}) == ("X-800G", 800.0, 0)
+
+
+def test_phase_plan_follows_the_graid_bench_loops():
+    plan = phase_plan(CONFIG, total_steps=24)
+    # Per stage: PD (2 QDs) + VD (1 status x 2 RAID types x 2 QDs) = 6.
+    assert plan == {"discard": 12, "precondition": 6, "sustain": 0, "workload": 24, "parse": 1, "sync": 1}
+
+
+def test_tracker_times_phases_from_log_timestamps():
+    tracker = PhaseTracker(started_at=0)
+    for line in (
+        _line(0, "STAGE_VD_START"),
+        _line(0, "STATE: DISCARD"),
+        _line(30, "STATE: PRECONDITIONING: 1/1"),
+        _line(130, "STATE: BENCHMARKING"),
+        _line(140, "TICK"),
+        _line(210, "TICK"),
+        _line(275, "STATE: PARSING"),
+        "no status here",
+    ):
+        tracker.feed(line)
+    tracker.finish(now=tracker._last_ts + 5)
+
+    assert [(phase, seconds) for phase, seconds, _ in tracker.samples] == [
+        ("discard", 30.0), ("precondition", 100.0), ("workload", 70.0), ("workload", 65.0), ("parse", 5.0),
+    ]
+    assert {sample[2] for sample in tracker.samples} == {"VD"}
+    assert tracker.counts["workload"] == 2
+
+
+def test_estimate_needs_history_for_every_planned_phase(tmp_path):
+    model = EtaModel(tmp_path / "eta_history.json")
+    assert model.estimate(run_profile(CONFIG), phase_plan(CONFIG, 4), CONFIG) is None
+
+
+def _trained_model(path):
+    tracker = PhaseTracker(started_at=0)
+    tracker.stage = "VD"
+    for phase, seconds in (("discard", 30), ("precondition", 3840), ("workload", 70), ("parse", 20), ("sync", 40)):
+        tracker.add(phase, seconds)
+    model = EtaModel(path)
+    model.record(run_profile(CONFIG), tracker, CONFIG)
+    return model
+
+
+def test_estimate_from_history_and_remaining_time_of_a_live_run(tmp_path):
+    model = _trained_model(tmp_path / "eta_history.json")
+    plan = {"discard": 2, "precondition": 1, "workload": 4, "parse": 1, "sync": 1}
+
+    whole = model.estimate(run_profile(CONFIG), plan, CONFIG)
+    # Workloads are stored as 10 s overhead over the 60 s VD runtime.
+    assert whole["phases"] == {"discard": 60, "precondition": 3840, "workload": 280, "parse": 20, "sync": 40}
+    assert whole["total"] == 4240
+
+    live = PhaseTracker(started_at=0)
+    live.stage = "VD"
+    live.counts.update(discard=2, precondition=1, workload=2)
+    live.current, live.current_started = "workload", 1000.0
+    remaining = model.estimate(run_profile(CONFIG), plan, CONFIG, tracker=live, now=1030.0)
+    # Two workloads left, plus 40 s of the running one.
+    assert remaining["phases"]["workload"] == 2 * 70 + 40
+    assert remaining["phases"]["discard"] == 0
+
+
+def test_history_persists_and_precondition_scales_with_capacity(tmp_path):
+    path = tmp_path / "eta_history.json"
+    _trained_model(path)
+    model = EtaModel(path)
+
+    smaller = {**CONFIG, "NVME_INFO": "MODEL-1.92TB"}
+    estimate = model.estimate(run_profile(smaller), {"precondition": 1}, smaller)
+    # 3840 s for 3840 GB is 1 s/GB, so 1920 GB takes 1920 s.
+    assert estimate["phases"]["precondition"] == pytest.approx(1920, abs=1)
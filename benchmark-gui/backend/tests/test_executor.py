@@ -0,0 +1,182 @@
+import asyncio
+import hashlib
+import io
+import os
+import threading
+
+import pytest
+
+pytest.importorskip("paramiko")
+pytest.importorskip("scp")
+
+import executor as executor_module  # noqa: E402
+from executor import RemoteExecutor  # noqa: E402
+
+
+def _write(path, data, mtime=1_700_000_000):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    os.utime(path, (mtime, mtime))
+
+
+class FakeRemote(RemoteExecutor):
+    """RemoteExecutor whose DUT side is a local directory tree."""
+
+    def __init__(self, remote_manifest):
+        super().__init__({})
+        self.remote_manifest = remote_manifest
+        self.commands = []
+
+    def _manifest(self, root, with_hash=False, remote=True):
+        if remote:
+            return self.remote_manifest
+        return super()._manifest(root, with_hash=with_hash, remote=False)
+
+    def run(self, cmd, cwd=None, env=None, capture_output=True, text=True):
+        self.commands.append(list(cmd))
+        return super().run(["true"])
+
+
+@pytest.fixture
+def pulls(monkeypatch):
+    """Record transfer.pull_files jobs instead of opening SFTP channels."""
+    calls = []
+
+    def pull_files(connect, jobs, staging_dir, channels=4, throttle=None):
+        calls.append(jobs)
+        return {"files": len(jobs), "bytes": 0, "seconds": 0.0, "mib_s": 0.0}
+
+    monkeypatch.setattr(executor_module.transfer, "pull_files", pull_files)
+    return calls
+
+
+def test_local_manifest_lists_size_mtime_and_optional_hash(tmp_path):
+    _write(tmp_path / "a.csv", b"abc")
+    _write(tmp_path / "sub" / "b.json", b"{}", mtime=1_600_000_000)
+    executor = RemoteExecutor({})
+
+    assert executor._manifest(tmp_path, remote=False) == {
+        "a.csv": [3, 1_700_000_000, None],
+        "sub/b.json": [2, 1_600_000_000, None],
+    }
+    hashed = executor._manifest(tmp_path, with_hash=True, remote=False)
+    assert hashed["a.csv"][2] == hashlib.sha256(b"abc").hexdigest()
+    assert executor._manifest(tmp_path / "missing", remote=False) == {}
+
+
+def test_pull_delta_fetches_only_new_or_changed_files(tmp_path, pulls):
+    local = tmp_path / "local"
+    _write(local / "same.csv", b"abc")
+    _write(local / "grown.log", b"ab")
+    _write(local / "extra.txt", b"kept")
+    executor = FakeRemote({
+        "same.csv": [3, 1_700_000_000, None],
+        "grown.log": [5, 1_700_000_000, None],
+        "new/cell.json": [7, 1_700_000_100, None],
+    })
+
+    executor._pull_delta("/tmp/benchmark-gui/results", str(local))
+
+    (jobs,) = pulls
+    assert sorted((job[0], job[2], job[3]) for job in jobs) == [
+        ("/tmp/benchmark-gui/results/grown.log", 5, 1_700_000_000),
+        ("/tmp/benchmark-gui/results/new/cell.json", 7, 1_700_000_100),
+    ]
+    assert (local / "extra.txt").exists()
+
+
+def test_push_delta_sends_changed_files_and_removes_stale_ones(tmp_path):
+    local = tmp_path / "scripts"
+    _write(local / "bench.sh", b"#!/bin/bash\n")
+    _write(local / "src" / "new.py", b"print()\n")
+    executor = FakeRemote({
+        "bench.sh": [12, 1, hashlib.sha256(b"#!/bin/bash\n").hexdigest()],
+        "old.sh": [3, 1, "0" * 64],
+    })
+    sent = []
+
+    class FakeSFTP:
+        def put(self, local_file, remote_file):
+            sent.append(remote_file)
+
+        def chmod(self, remote_file, mode):
+            pass
+
+        def close(self):
+            pass
+
+    class FakeClient:
+        def open_sftp(self):
+            return FakeSFTP()
+
+    executor._get_ssh_client = lambda: FakeClient()
+    executor._push_delta(str(local), "/tmp/benchmark-gui/scripts")
+
+    assert sent == ["/tmp/benchmark-gui/scripts/src/new.py"]
+    assert ["rm", "-f", "/tmp/benchmark-gui/scripts/old.sh"] in executor.commands
+
+
+def test_many_small_files_come_back_as_one_tar_stream(tmp_path, pulls, monkeypatch):
+    big = executor_module.transfer.CHUNK_SIZE + 1
+    manifest = {f"cells/{index}.json": [10, 1, None] for index in range(executor_module.TAR_BULK_MIN_FILES)}
+    manifest["atop.raw"] = [big, 1, None]
+    executor = FakeRemote(manifest)
+    tarred = []
+    monkeypatch.setattr(executor, "_pull_tar", lambda remote_root, local_root, rels, bwlimit=None: tarred.append(rels))
+
+    executor._pull_delta("/remote/results", str(tmp_path / "local"))
+
+    assert sorted(tarred[0]) == sorted(rel for rel in manifest if rel != "atop.raw")
+    assert [job[0] for job in pulls[0]] == ["/remote/results/atop.raw"]
+
+
+def test_a_failed_tar_stream_falls_back_to_sftp(tmp_path, pulls, monkeypatch):
+    manifest = {f"{index}.json": [10, 1, None] for index in range(executor_module.TAR_BULK_MIN_FILES)}
+    executor = FakeRemote(manifest)
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("tar stream checksum mismatch")
+
+    monkeypatch.setattr(executor, "_pull_tar", broken)
+    executor._pull_delta("/remote/results", str(tmp_path / "local"))
+
+    assert len(pulls[0]) == len(manifest)
+
+
+def test_few_changed_files_skip_the_tar_stream(tmp_path, pulls, monkeypatch):
+    executor = FakeRemote({"a.json": [10, 1, None]})
+    monkeypatch.setattr(executor, "_pull_tar", lambda *args, **kwargs: pytest.fail("tar used for one file"))
+    executor._pull_delta("/remote/results", str(tmp_path / "local"))
+    assert len(pulls[0]) == 1
+
+
+def test_hashing_reader_hashes_everything_it_passes_on():
+    payload = os.urandom(300_000)
+    reader = executor_module._HashingReader(io.BytesIO(payload))
+    assert reader.read(1000) == payload[:1000]
+    reader.drain()
+    assert reader.size == len(payload)
+    assert reader.sha256.hexdigest() == hashlib.sha256(payload).hexdigest()
+
+
+def test_transfer_staging_sits_at_the_top_of_the_results_or_logs_tree(tmp_path):
+    staging = executor_module.transfer.STAGING_DIR_NAME
+    results = executor_module.RESULTS_DIR.resolve()
+    logs = executor_module.LOGS_DIR.resolve()
+
+    assert RemoteExecutor._staging_dir(results / "run-a" / "VD") == results / staging
+    assert RemoteExecutor._staging_dir(logs) == logs / staging
+    assert RemoteExecutor._staging_dir(tmp_path / "elsewhere") == (tmp_path / "elsewhere").resolve() / staging
+
+
+def test_async_calls_run_on_the_dut_io_pool():
+    executor = RemoteExecutor({})
+
+    async def scenario():
+        thread = await executor.acall(lambda: threading.current_thread().name)
+        result = await executor.arun(["echo", "ok"])
+        return thread, result
+
+    thread, result = asyncio.run(scenario())
+    assert thread.startswith("dut-io")
+    assert (result.returncode, result.stdout.strip()) == (0, "ok")
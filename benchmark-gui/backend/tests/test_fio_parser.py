@@ -0,0 +1,98 @@
+import csv
+import json
+
+import pytest
+
+pytest.importorskip("pandas")
+
+import fio_parser  # noqa: E402
+
+
+def _fio_json(path, iops, job_runtime_ms=30000, steadystate=None):
+    job = {
+        "job options": {"rw": "randread", "bs": "4k", "iodepth": "64", "numjobs": "8"},
+        "read": {"iops": iops, "bw": iops * 4, "lat_ns": {"mean": 50000.0, "stddev": 1000.0}},
+        "write": {"iops": 0, "bw": 0},
+        "job_runtime": job_runtime_ms,
+    }
+    if steadystate is not None:
+        job["steadystate"] = steadystate
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"fio version": "fio-3.36", "jobs": [job]}))
+    return path
+
+
+def test_iteration_stats_uses_the_sample_stddev_and_student_t():
+    mean, stddev, lo, hi, ci95 = fio_parser.iteration_stats([10.0, 12.0, 14.0])
+    assert (mean, stddev, lo, hi) == (12.0, 2.0, 10.0, 14.0)
+    assert ci95 == pytest.approx(4.303 * 2.0 / 3 ** 0.5)
+    assert fio_parser.iteration_stats([5.0]) == (5.0, 0.0, 5.0, 5.0, 0.0)
+    # Past 30 degrees of freedom the normal approximation applies.
+    values = [float(v % 2) for v in range(40)]
+    _, stddev, _, _, ci95 = fio_parser.iteration_stats(values)
+    assert ci95 == pytest.approx(1.96 * stddev / 40 ** 0.5)
+
+
+def test_stop_reason_follows_the_steadystate_block(tmp_path):
+    plain = fio_parser.parse_bench_fio_json(_fio_json(tmp_path / "a.json", 1000, 12500))
+    assert plain["Stop Reason"] == "runtime"
+    assert plain["Runtime (s)"] == 12.5
+    attained = fio_parser.parse_bench_fio_json(_fio_json(tmp_path / "b.json", 1000, steadystate={"attained": 1}))
+    assert attained["Stop Reason"] == "steady_state"
+    capped = fio_parser.parse_bench_fio_json(_fio_json(tmp_path / "c.json", 1000, steadystate={"attained": 0}))
+    assert capped["Stop Reason"] == "runtime_cap"
+
+
+def test_find_iteration_roots_picks_up_hidden_repeat_dirs(tmp_path):
+    stage = tmp_path / "VD" / "afterdiscard"
+    (stage / "nvme0n1").mkdir(parents=True)
+    (stage / ".iter3" / "nvme0n1").mkdir(parents=True)
+    (stage / ".iter2" / "nvme0n1").mkdir(parents=True)
+    (stage / ".iter4").mkdir()  # no output for this device
+
+    roots = fio_parser.find_iteration_roots(stage / "nvme0n1")
+    assert roots == [
+        (1, stage / "nvme0n1"),
+        (2, stage / ".iter2" / "nvme0n1"),
+        (3, stage / ".iter3" / "nvme0n1"),
+    ]
+
+
+def test_repeated_cells_get_mean_and_spread_columns(tmp_path):
+    stage = tmp_path / "VD" / "afterdiscard"
+    device = stage / "nvme0n1"
+    for index, iops in enumerate((100000, 110000, 120000), start=1):
+        root = device if index == 1 else stage / f".iter{index}" / "nvme0n1"
+        _fio_json(root / "4k" / "randread-64-8.json", iops)
+
+    out = fio_parser.collect_bench_fio_results(device, "nvme0n1", stage / "result")
+    with open(out, newline="") as fh:
+        (row,) = list(csv.DictReader(fh))
+    assert row["Iterations"] == "3"
+    assert float(row["IOPS(K)"]) == pytest.approx(110.0)
+    assert float(row["IOPS(K) mean"]) == pytest.approx(110.0)
+    assert float(row["IOPS(K) stddev"]) == pytest.approx(10.0)
+    assert float(row["IOPS(K) min"]) == pytest.approx(100.0)
+    assert float(row["IOPS(K) CI95"]) == pytest.approx(4.303 * 10 / 3 ** 0.5, abs=1e-3)
+
+
+def test_single_runs_keep_the_plain_csv_schema(tmp_path):
+    device = tmp_path / "VD" / "afterdiscard" / "nvme0n1"
+    _fio_json(device / "4k" / "randread-64-8.json", 100000)
+
+    out = fio_parser.collect_bench_fio_results(device, "nvme0n1", tmp_path / "result")
+    with open(out, newline="") as fh:
+        (row,) = list(csv.DictReader(fh))
+    assert "Iterations" not in row
+    assert not any(col.endswith((" mean", " stddev", " CI95")) for col in row)
+
+
+def test_find_bench_fio_roots_keeps_the_shallowest_dirs(tmp_path):
+    fio_dir = tmp_path / "VD" / "afterdiscard"
+    _fio_json(fio_dir / "nvme0n1" / "4k" / "randread-64-8.json", 1000)
+    _fio_json(fio_dir / "nvme1n1" / "4k" / "randread-64-8.json", 1000)
+
+    roots = fio_parser.find_bench_fio_roots(fio_dir)
+    assert sorted(roots) == [fio_dir / "nvme0n1", fio_dir / "nvme1n1"]
+    assert fio_parser.convert_bench_fio_roots(roots) == 2
+    assert len(list((fio_dir / "result").glob("*_bench-fio.csv"))) == 2
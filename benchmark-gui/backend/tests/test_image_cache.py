@@ -0,0 +1,146 @@
+import io
+import os
+import tarfile
+import time
+
+import pytest
+
+import image_cache
+
+
+def _wait_for(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        value = predicate()
+        if value:
+            return value
+        time.sleep(0.05)
+    raise AssertionError("timed out")
+
+
+@pytest.fixture(autouse=True)
+def derivative_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(image_cache, "DERIVATIVE_DIR", tmp_path / "derivatives")
+    return tmp_path / "derivatives"
+
+
+def test_content_hash_is_memoised_per_version(tmp_path):
+    path = tmp_path / "a.png"
+    path.write_bytes(b"one")
+    first = image_cache.content_hash(path)
+    assert image_cache.content_hash(path) == first
+    path.write_bytes(b"two!")
+    assert image_cache.content_hash(path) != first
+
+
+def test_hash_memo_is_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(image_cache, "HASH_MEMO_ENTRIES", 2)
+    monkeypatch.setattr(image_cache, "_hash_memo", image_cache.OrderedDict())
+    for index in range(4):
+        path = tmp_path / f"{index}.png"
+        path.write_bytes(bytes([index]))
+        image_cache.content_hash(path)
+    assert [key[0] for key in image_cache._hash_memo] == [str(tmp_path / "2.png"), str(tmp_path / "3.png")]
+
+
+def test_schedule_leaves_hashing_to_the_worker(tmp_path, monkeypatch):
+    submitted = []
+    monkeypatch.setattr(image_cache, "Image", object())
+    monkeypatch.setattr(image_cache._executor, "submit", lambda *args: submitted.append(args))
+    monkeypatch.setattr(image_cache, "content_hash", lambda path: pytest.fail("hashed in schedule"))
+    source = tmp_path / "chart_report_view.png"
+    source.write_bytes(b"png")
+
+    image_cache.schedule(source)
+    image_cache.schedule(source)  # already queued
+    assert len(submitted) == 1
+    image_cache._pending.clear()
+
+
+def test_prune_drops_the_least_recently_used_derivatives(derivative_dir):
+    for index in range(4):
+        path = derivative_dir / "ab" / f"ab{index}-thumb.webp"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (1000 + index, 1000 + index))
+
+    assert image_cache.prune_derivatives(max_bytes=250) == 2
+    assert sorted(path.name for path in derivative_dir.glob("*/*")) == ["ab2-thumb.webp", "ab3-thumb.webp"]
+    assert image_cache.prune_derivatives(max_bytes=0) == 0
+
+
+def test_lookup_generates_thumbnail_and_webp_derivatives(tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+    source = tmp_path / "chart_report_view.png"
+    Image.new("RGB", (1600, 1000), "white").save(source)
+
+    assert image_cache.lookup(source, "full", "png") is None
+    assert image_cache.lookup(source, "thumb", "webp") is None  # miss schedules generation
+    thumb = _wait_for(lambda: image_cache.lookup(source, "thumb", "webp"))
+    full_webp = _wait_for(lambda: image_cache.lookup(source, "full", "webp"))
+
+    with Image.open(thumb) as opened:
+        assert opened.format == "WEBP"
+        assert opened.width <= image_cache.THUMB_MAX_PX[0]
+        assert opened.height <= image_cache.THUMB_MAX_PX[1]
+    with Image.open(full_webp) as opened:
+        assert opened.size == (1600, 1000)
+
+
+def _write_archive(path, members):
+    with tarfile.open(path, "w:gz") as tar:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+
+
+def test_archive_images_extracts_in_background_and_keeps_a_manifest(tmp_path):
+    archive = tmp_path / "run.tar.gz"
+    _write_archive(archive, {
+        "MODEL-result/MODEL/VD/report_view/iops.png": b"png-1",
+        "MODEL-result/MODEL/VD/report_view/lat.png": b"png-2",
+        "MODEL-result/MODEL/VD/result/summary.csv": b"a,b\n",
+    })
+    cache_dir = tmp_path / "cache" / "run"
+
+    first = image_cache.archive_images(archive, cache_dir, "run.tar.gz")
+    assert first["status"] in ("running", "complete")
+    _wait_for(lambda: (cache_dir / image_cache.MANIFEST_NAME).exists())
+
+    done = image_cache.archive_images(archive, cache_dir, "run.tar.gz")
+    assert done["status"] == "complete"
+    assert done["inner_root"] == "MODEL-result"
+    assert sorted(item["member"] for item in done["images"]) == [
+        "MODEL-result/MODEL/VD/report_view/iops.png",
+        "MODEL-result/MODEL/VD/report_view/lat.png",
+    ]
+    for item in done["images"]:
+        assert (cache_dir / item["name"]).is_file()
+
+    image_cache.invalidate_archive(cache_dir)
+    assert not cache_dir.exists()
+
+
+def test_failed_extraction_is_recorded_until_the_archive_changes(tmp_path, monkeypatch):
+    archive = tmp_path / "run.tar.gz"
+    archive.write_bytes(b"not a tarball")
+    cache_dir = tmp_path / "cache" / "run"
+    submitted = []
+    real_submit = image_cache._extract_executor.submit
+    monkeypatch.setattr(image_cache._extract_executor, "submit",
+                        lambda *args: submitted.append(args) or real_submit(*args))
+
+    image_cache.archive_images(archive, cache_dir, "run.tar.gz")
+    _wait_for(lambda: (cache_dir / image_cache.FAILURE_NAME).exists())
+    _wait_for(lambda: str(cache_dir) not in image_cache._jobs)
+
+    failed = image_cache.archive_images(archive, cache_dir, "run.tar.gz")
+    assert failed["status"] == "failed"
+    assert failed["error"]
+    assert len(submitted) == 1
+
+    _write_archive(archive, {"MODEL-result/VD/report_view/iops.png": b"png"})
+    image_cache.archive_images(archive, cache_dir, "run.tar.gz")
+    assert len(submitted) == 2
+    _wait_for(lambda: image_cache.archive_images(archive, cache_dir, "run.tar.gz")["status"] == "complete")
@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+
+import inventory_cache as inventory_cache_module
+from inventory_cache import InventoryCache
+
+
+class Fetcher:
+    def __init__(self, answers=None):
+        self.calls = 0
+        self.answers = answers
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.answers is not None:
+            return self.answers.pop(0)
+        return {"call": self.calls}
+
+
+def test_concurrent_requests_share_one_query():
+    async def scenario():
+        cache = InventoryCache()
+        fetch = Fetcher()
+        tasks = [asyncio.ensure_future(cache.get("dut-1", "nvme", fetch)) for _ in range(5)]
+        await asyncio.sleep(0)
+        fetch.release.set()
+        return await asyncio.gather(*tasks), fetch.calls
+
+    answers, calls = asyncio.run(scenario())
+    assert calls == 1
+    assert answers == [{"call": 1}] * 5
+
+
+def test_answers_expire_after_their_kinds_ttl(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(inventory_cache_module.time, "monotonic", lambda: clock[0])
+
+    async def scenario():
+        cache = InventoryCache({"usage": 5.0})
+        fetch = Fetcher()
+        fetch.release.set()
+        first = await cache.get("dut-1", "usage", fetch)
+        clock[0] += 4
+        cached = await cache.get("dut-1", "usage", fetch)
+        clock[0] += 2
+        fresh = await cache.get("dut-1", "usage", fetch)
+        return first, cached, fresh
+
+    assert asyncio.run(scenario()) == ({"call": 1}, {"call": 1}, {"call": 2})
+
+
+def test_invalidate_drops_answers_and_discards_queries_in_flight():
+    async def scenario():
+        cache = InventoryCache()
+        fetch = Fetcher()
+        stale = asyncio.ensure_future(cache.get("dut-1", "graid", fetch))
+        await asyncio.sleep(0)
+        cache.invalidate("dut-1")
+        # Asked after the invalidation: not served by the older query.
+        fresh = asyncio.ensure_future(cache.get("dut-1", "graid", fetch))
+        await asyncio.sleep(0)
+        fetch.release.set()
+        await asyncio.gather(stale, fresh)
+        again = await cache.get("dut-1", "graid", fetch)
+        return fetch.calls, fresh.result(), again
+
+    calls, fresh, again = asyncio.run(scenario())
+    assert calls == 2
+    assert fresh == again == {"call": 2}
+
+
+def test_invalidate_is_per_dut_unless_global():
+    async def scenario():
+        cache = InventoryCache()
+        fetch = Fetcher()
+        fetch.release.set()
+        await cache.get("dut-1", "license", fetch)
+        await cache.get("dut-2", "license", fetch)
+        cache.invalidate("dut-1")
+        await cache.get("dut-1", "license", fetch)
+        await cache.get("dut-2", "license", fetch)
+        after_one = fetch.calls
+        cache.invalidate()
+        await cache.get("dut-2", "license", fetch)
+        return after_one, fetch.calls
+
+    assert asyncio.run(scenario()) == (3, 4)
+
+
+@pytest.mark.parametrize("answer", [{}, []])
+def test_empty_answers_are_not_cached(answer):
+    async def scenario():
+        cache = InventoryCache()
+        fetch = Fetcher(answers=[answer, {"ok": True}])
+        fetch.release.set()
+        first = await cache.get("dut-1", "controller", fetch)
+        second = await cache.get("dut-1", "controller", fetch)
+        return first, second, fetch.calls
+
+    assert asyncio.run(scenario()) == (answer, {"ok": True}, 2)
+
+
+def test_failures_reach_every_waiter_and_are_not_cached():
+    async def scenario():
+        cache = InventoryCache()
+        calls = []
+
+        async def broken():
+            calls.append(1)
+            raise ConnectionError("DUT unreachable")
+
+        results = await asyncio.gather(cache.get("dut-1", "gpu", broken), cache.get("dut-1", "gpu", broken),
+                                       return_exceptions=True)
+        with pytest.raises(ConnectionError):
+            await cache.get("dut-1", "gpu", broken)
+        return results, len(calls)
+
+    results, calls = asyncio.run(scenario())
+    assert all(isinstance(result, ConnectionError) for result in results)
+    assert calls == 2
@@ -0,0 +1,443 @@
+import io
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+for _module in ("paramiko", "scp"):
+    pytest.importorskip(_module)
+
+import paramiko  # noqa: E402
+
+import config  # noqa: E402
+import manager  # noqa: E402
+import monitor  # noqa: E402
+from state import ResumableRuns  # noqa: E402
+
+
+class Recorder:
+    def __init__(self):
+        self.events = []
+
+    def emit(self, event, data=None, room=None, **kwargs):
+        self.events.append((event, data, room))
+
+    def named(self, event):
+        return [data for name, data, _ in self.events if name == event]
+
+
+class FakeProcess:
+    def __init__(self, lines=(), returncode=0):
+        self.stdout = io.StringIO("".join(f"{line}\n" for line in lines))
+        self.pid = 4242
+        self.returncode = None
+        self._exit = returncode
+
+    def poll(self):
+        if self.stdout.tell() == len(self.stdout.getvalue()):
+            self.returncode = self._exit
+        return self.returncode
+
+    def wait(self, timeout=None):
+        self.returncode = self._exit
+        return self.returncode
+
+    def terminate(self):
+        pass
+
+    def kill(self):
+        pass
+
+
+class FakeExecutor:
+    """Local executor whose benchmark process prints `lines` and exits
+    with `returncode`; giostat prints nothing."""
+
+    is_remote = False
+
+    def __init__(self, lines=(), returncode=0):
+        self.lines = lines
+        self.returncode = returncode
+        self.commands = []
+
+    @staticmethod
+    def _to_remote_path(path):
+        return path
+
+    def run(self, cmd, **kwargs):
+        self.commands.append(cmd)
+        return SimpleNamespace(returncode=1, stdout="", stderr="")
+
+    def Popen(self, cmd, **kwargs):
+        self.commands.append(cmd)
+        if cmd[0] == "giostat":
+            return FakeProcess()
+        return FakeProcess(self.lines, self.returncode)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def sandbox(tmp_path, monkeypatch):
+    recorder = Recorder()
+    monkeypatch.setattr(config, "socketio", recorder)
+    monkeypatch.setattr(config, "LOGS_DIR", tmp_path)
+    monkeypatch.setattr(config, "CONFIG_FILE", tmp_path / "graid-bench.conf")
+    monkeypatch.setattr(config, "ACTIVE_STATE_FILE", tmp_path / "active_benchmark.json")
+    monkeypatch.setattr(config, "RESUMABLE_FILE", tmp_path / "resumable_benchmark.json")
+    monkeypatch.setattr(manager, "LOGS_DIR", tmp_path)
+    monkeypatch.setattr(manager, "RUN_CONF_DIR", tmp_path / ".run-conf")
+    monkeypatch.setattr(monitor, "LOGS_DIR", tmp_path)
+    return recorder
+
+
+def _slot(executor, dut=manager.LOCAL_SLOT, tmp_path=None):
+    return manager.BenchmarkManager(executor_factory=lambda config: executor, dut=dut,
+                                    state_file=tmp_path / f"state-{dut}.json" if tmp_path else None)
+
+
+def _run(slot, config=None, run_id="run-1"):
+    config = config or {"NVME_INFO": "MODEL"}
+    thread = slot.try_start(config, "default", run_id)
+    assert thread is not None
+    thread.join(timeout=10)
+    assert not thread.is_alive()
+
+
+@pytest.mark.parametrize("returncode, resumable", [(1, False), (-1, True)])
+def test_only_a_lost_process_is_recorded_as_resumable(tmp_path, returncode, resumable):
+    slot = _slot(FakeExecutor(["STATUS: TOTAL_STEPS: 4", "STATUS: TICK"], returncode), tmp_path=tmp_path)
+    _run(slot)
+    assert (manager.LOCAL_SLOT in ResumableRuns.load()) is resumable
+
+
+def test_connection_errors_are_recorded_as_resumable(tmp_path):
+    class DroppingExecutor(FakeExecutor):
+        def Popen(self, cmd, **kwargs):
+            if cmd[0] == "giostat":
+                return FakeProcess()
+            raise EOFError("channel closed")
+
+    slot = _slot(DroppingExecutor(), tmp_path=tmp_path)
+    _run(slot)
+    record = ResumableRuns.load()[manager.LOCAL_SLOT]
+    assert (record["run_id"], record["reason"]) == ("run-1", "lost")
+
+
+def test_resumable_records_of_concurrent_slots_are_all_kept(tmp_path):
+    barrier = threading.Barrier(8)
+
+    def save(index):
+        barrier.wait()
+        ResumableRuns.save(f"10.0.0.{index}", {"run_id": f"run-{index}"})
+
+    threads = [threading.Thread(target=save, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(ResumableRuns.load()) == sorted(f"10.0.0.{index}" for index in range(8))
+    assert ResumableRuns.pop("10.0.0.3") == {"run_id": "run-3"}
+    assert len(ResumableRuns.load()) == 7
+
+
+class GatedStream:
+    """Process stdout that holds its lines back until `gate` is set."""
+
+    def __init__(self, lines, gate):
+        self._stream = io.StringIO("".join(f"{line}\n" for line in lines))
+        self._gate = gate
+
+    def readline(self):
+        self._gate.wait(timeout=10)
+        return self._stream.readline()
+
+    def tell(self):
+        return self._stream.tell()
+
+    def getvalue(self):
+        return self._stream.getvalue()
+
+
+class GatedExecutor(FakeExecutor):
+    def __init__(self, lines=()):
+        super().__init__(lines)
+        self.gate = threading.Event()
+
+    def Popen(self, cmd, **kwargs):
+        process = super().Popen(cmd, **kwargs)
+        if cmd[0] != "giostat":
+            process.stdout = GatedStream(self.lines, self.gate)
+        return process
+
+
+Fleet = manager.Fleet
+
+
+def _remote(dut):
+    return {"NVME_INFO": "MODEL", "REMOTE_MODE": True, "DUT_IP": dut}
+
+
+def _fleet(executors):
+    return manager.Fleet(manager_factory=lambda **kwargs: manager.BenchmarkManager(
+        executor_factory=lambda config: executors[Fleet.dut_key(config)], **kwargs))
+
+
+def _wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_fleet_keys_slots_by_dut(tmp_path):
+    fleet = Fleet()
+    assert Fleet.dut_key(None) == manager.LOCAL_SLOT
+    assert Fleet.dut_key({"DUT_IP": "10.0.0.1"}) == manager.LOCAL_SLOT  # not remote mode
+    assert fleet.slot_for(_remote("10.0.0.1")) is fleet.slot("10.0.0.1")
+    assert fleet.slot_for({"NVME_INFO": "MODEL"}) is fleet.slot(manager.LOCAL_SLOT)
+    assert fleet.slot("10.0.0.1").dut == "10.0.0.1"
+
+    # The local slot keeps ACTIVE_STATE_FILE; every DUT gets its own file.
+    assert fleet.slot(manager.LOCAL_SLOT).state_file is None
+    paths = {Fleet.state_file("10.0.0.1"), Fleet.state_file("10.0.0.2"), Fleet.state_file("dut/../x")}
+    assert len(paths) == 3
+    assert all(path.parent == tmp_path and path.name.startswith("active_benchmark-") for path in paths)
+
+
+def test_fleet_finds_and_selects_runs():
+    fleet = Fleet()
+    older, newer, idle = fleet.slot("10.0.0.1"), fleet.slot("10.0.0.2"), fleet.slot("10.0.0.3")
+    for slot, run_id, started_at in ((older, "run-1", 100.0), (newer, "run-2", 200.0)):
+        slot.running, slot.active_run_id, slot.started_at = True, run_id, started_at
+    idle.started_at = 300.0
+
+    assert fleet.find_run("run-1") is older
+    assert fleet.find_run("run-9") is None
+    assert fleet.find_run(None) is None
+    assert fleet.select(run_id="run-2") is newer
+    assert fleet.select(run_id="run-9") is None
+    assert fleet.select(dut="10.0.0.1") is older
+    # No key: the most recently started running slot wins over idle ones.
+    assert fleet.select() is newer
+    newer.running = False
+    assert fleet.select() is older
+    older.running = False
+    assert fleet.select() is idle
+    assert Fleet().select().dut == manager.LOCAL_SLOT
+
+
+def test_slots_run_side_by_side_with_their_own_state(tmp_path, sandbox):
+    executors = {"10.0.0.1": GatedExecutor(["STATUS: TOTAL_STEPS: 2", "STATUS: TICK"]),
+                 "10.0.0.2": GatedExecutor(["STATUS: TOTAL_STEPS: 5", "STATUS: TICK"])}
+    fleet = _fleet(executors)
+    first, second = fleet.slot("10.0.0.1"), fleet.slot("10.0.0.2")
+
+    threads = [first.try_start(_remote("10.0.0.1"), "default", "run-1")]
+    assert _wait_for(lambda: Fleet.state_file("10.0.0.1").exists())
+    # A busy slot refuses a second run; another DUT's slot does not.
+    assert first.try_start(_remote("10.0.0.1"), "default", "run-3") is None
+    threads.append(second.try_start(_remote("10.0.0.2"), "default", "run-2"))
+    assert threads[1] is not None
+    assert _wait_for(lambda: Fleet.state_file("10.0.0.2").exists())
+    assert not config.ACTIVE_STATE_FILE.exists()
+    assert [state["run_id"] for _, state in fleet.saved_states()] == ["run-1", "run-2"]
+    assert fleet.active_run_ids() == {"run-1", "run-2"}
+
+    for executor in executors.values():
+        executor.gate.set()
+    for thread in threads:
+        thread.join(timeout=10)
+    assert (first.total_steps, second.total_steps) == (2, 5)
+    assert not (first.running or second.running)
+
+
+def test_slot_events_carry_their_run_and_dut(tmp_path, sandbox):
+    executors = {"10.0.0.1": FakeExecutor(["STATUS: TOTAL_STEPS: 2", "STATUS: TICK", "fio: one"]),
+                 "10.0.0.2": FakeExecutor(["STATUS: TOTAL_STEPS: 2", "STATUS: TICK", "fio: two"])}
+    fleet = _fleet(executors)
+    _run(fleet.slot("10.0.0.1"), _remote("10.0.0.1"), "run-1")
+    _run(fleet.slot("10.0.0.2"), _remote("10.0.0.2"), "run-2")
+
+    tags = {(data["dut"], data["run_id"]) for _, data, _ in sandbox.events}
+    assert tags == {("10.0.0.1", "run-1"), ("10.0.0.2", "run-2")}
+    logs = {data["line"]: data["run_id"] for data in sandbox.named("bench_log")}
+    assert (logs["fio: one"], logs["fio: two"]) == ("run-1", "run-2")
+    # Both share the session room; the run room tells them apart.
+    assert all(room == ["default", f"run:{data['run_id']}"] for _, data, room in sandbox.events)
+
+
+def test_runs_leave_the_saved_config_alone(tmp_path):
+    config.CONFIG_FILE.write_text('{"NVME_INFO": "SAVED"}')
+    _run(_slot(FakeExecutor(["STATUS: TICK"]), tmp_path=tmp_path), {"NVME_INFO": "QUEUED"})
+    assert config.CONFIG_FILE.read_text() == '{"NVME_INFO": "SAVED"}'
+
+
+RECORDED_LOG = "".join(f"{line}\n" for line in [
+    # An aborted earlier run left its lines in output.log (tee -a).
+    "STATUS: TOTAL_STEPS: 99",
+    "STATUS: TICK",
+    "STATUS: ERROR: old failure",
+    "STATUS: TOTAL_STEPS: 10",
+    "STATUS: STAGE_VD_START",
+    "STATUS: WORKLOAD: SR-RAID5-00-randread",
+    "STATUS: TICK",
+    "fio: randread 4k running",
+    "STATUS: TICK",
+    "STATUS: CELL_DONE: SR-RAID5-randread_4k_qd64_8J-Normal output_dir=\"../results/x\"",
+    "STATUS: TICK",
+]) + "STATUS: TI"  # half-written line: left for tail to deliver
+
+
+class ReplayExecutor(FakeExecutor):
+    def __init__(self, log_text, tail_lines=()):
+        super().__init__(tail_lines)
+        self.log_text = log_text
+
+    def run(self, cmd, **kwargs):
+        self.commands.append(cmd)
+        return SimpleNamespace(returncode=0, stdout=self.log_text, stderr="")
+
+
+def _recovered_slot(tmp_path, executor):
+    slot = _slot(executor, tmp_path=tmp_path)
+    slot.running = True
+    slot.active_run_id = "run-1"
+    slot.current_log_file = tmp_path / "recovered.log"
+    run_config = {"NVME_INFO": "MODEL"}
+    ctx = manager._RunContext("run-1", "default", run_config, time.time() - 60, 4242,
+                              manager.run_profile(run_config), manager.phase_plan(run_config),
+                              manager.PhaseTracker(time.time() - 60))
+    return slot, ctx
+
+
+def test_fresh_slots_have_progress_counters():
+    slot = manager.BenchmarkManager()
+    assert (slot.current_step, slot.total_steps, slot.cells_done, slot.last_error) == (0, 0, 0, None)
+    assert slot.status()["progress"]["current_step"] == 0
+
+
+def test_replay_rebuilds_progress_without_emitting_old_lines(tmp_path, sandbox):
+    executor = ReplayExecutor(RECORDED_LOG, ["STATUS: TICK", "fio: still running"])
+    slot, ctx = _recovered_slot(tmp_path, executor)
+
+    slot._follow_remote_log(ctx)
+
+    # Replay counted the current run only (after the last TOTAL_STEPS);
+    # the followed tail added one more tick.
+    assert (slot.current_step, slot.total_steps, slot.cells_done) == (4, 10, 1)
+    assert slot.last_error is None
+    assert slot.current_stage_info["stage"] == "VD"
+    assert slot.current_stage_info["label"].endswith("4k Random Read")
+    assert [data["line"] for data in sandbox.named("bench_log")] == ["STATUS: TICK", "fio: still running"]
+    assert sandbox.named("cell_done") == []
+    # One catch-up status and progress update after the replay, then the tail's tick.
+    assert [data["stage"] for data in sandbox.named("status_update")] == ["VD"]
+    assert [data["current_step"] for data in sandbox.named("progress_update")] == [3, 4]
+    # The tail picks up after the last complete line.
+    assert executor.commands[-1][:3] == ["tail", "-n", "+12"]
+    assert not (tmp_path / "state-local.json").exists()
+    assert "STATUS: TI" not in (tmp_path / "recovered.log").read_text().splitlines()
+
+
+def test_replay_of_a_stopped_run_does_not_follow_the_log(tmp_path):
+    executor = ReplayExecutor(RECORDED_LOG)
+    slot, ctx = _recovered_slot(tmp_path, executor)
+    slot.running = False
+
+    slot._follow_remote_log(ctx)
+    assert slot.current_step == 3
+    assert not any(cmd[0] == "tail" for cmd in executor.commands)
+
+
+class FakeWaiter:
+    def __init__(self, returncode):
+        self.returncode = None
+        self._exit = returncode
+
+    def wait(self):
+        self.returncode = self._exit
+        return self.returncode
+
+
+class ExitWaitExecutor:
+    """Scripted DUT for wait_for_remote_exit: `waiters` are the `tail --pid`
+    outcomes (an exit code or an exception), `alive` the `kill -0` / pgrep
+    answers in order."""
+
+    def __init__(self, waiters=(), alive=()):
+        self.waiters = list(waiters)
+        self.alive = list(alive)
+        self.commands = []
+        self.closed = 0
+
+    def Popen(self, cmd, **kwargs):
+        self.commands.append(cmd)
+        outcome = self.waiters.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return FakeWaiter(outcome)
+
+    def run(self, cmd, **kwargs):
+        self.commands.append(cmd)
+        outcome = self.alive.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return SimpleNamespace(returncode=0 if outcome else 1, stdout="", stderr="")
+
+    def close(self):
+        self.closed += 1
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr(manager.time, "sleep", delays.append)
+    return delays
+
+
+def test_exit_wait_returns_when_the_waiter_sees_the_process_exit(sleeps):
+    executor = ExitWaitExecutor(waiters=[0], alive=[False])
+    manager.wait_for_remote_exit(executor, saved_pid=4242)
+    assert executor.commands == [["tail", "--pid=4242", "-f", "/dev/null"], ["kill", "-0", "4242"]]
+    assert sleeps == []
+
+
+def test_exit_wait_reconnects_after_a_dropped_channel(sleeps):
+    executor = ExitWaitExecutor(
+        waiters=[paramiko.SSHException("channel closed"), EOFError(), 0],
+        alive=[False],
+    )
+    manager.wait_for_remote_exit(executor, saved_pid=4242, poll_interval=10)
+    assert executor.closed == 2
+    assert sleeps == [10, 20]  # exponential backoff between reconnects
+    assert [cmd[0] for cmd in executor.commands] == ["tail", "tail", "tail", "kill"]
+
+
+def test_exit_wait_gives_up_after_repeated_drops(sleeps):
+    executor = ExitWaitExecutor(waiters=[OSError("no route")] * 5)
+    with pytest.raises(OSError):
+        manager.wait_for_remote_exit(executor, saved_pid=4242, poll_interval=10, max_failures=5)
+    assert sleeps == [10, 20, 40, manager.EXIT_WAIT_MAX_BACKOFF]
+
+
+def test_exit_wait_for_a_process_that_is_already_gone(sleeps):
+    # `tail --pid` returns at once for a dead PID; kill -0 confirms it.
+    executor = ExitWaitExecutor(waiters=[0], alive=[False])
+    manager.wait_for_remote_exit(executor, saved_pid=4242)
+    assert sleeps == []
+
+    # Legacy state without a PID: a single pgrep probe.
+    executor = ExitWaitExecutor(alive=[False])
+    manager.wait_for_remote_exit(executor)
+    assert executor.commands == [["pgrep", "-f", "graid-bench.sh"]]
+
+
+def test_exit_wait_polls_when_the_dut_has_no_tail_pid(sleeps):
+    # The waiter fails at once while the PID still lives: poll instead.
+    executor = ExitWaitExecutor(waiters=[1], alive=[True, True, False])
+    manager.wait_for_remote_exit(executor, saved_pid=4242, poll_interval=10)
+    assert [cmd[0] for cmd in executor.commands] == ["tail", "kill", "kill", "kill"]
+    assert sleeps == [10, 10]
@@ -0,0 +1,116 @@
+import pytest
+
+pytest.importorskip("pandas")
+
+from query import QueryError, ResultFrameCache, run_query  # noqa: E402
+
+ROWS = {
+    "run-a": [
+        {"RAID_type": "RAID5", "Queue Depth": "32", "IOPS(K)": "100", "controller": "SR-1000"},
+        {"RAID_type": "RAID5", "Queue Depth": "64", "IOPS(K)": "150", "controller": "SR-1000"},
+        {"RAID_type": "RAID10", "Queue Depth": "64", "IOPS(K)": "200", "controller": "SR-1000"},
+    ],
+    "run-b": [
+        {"RAID_type": "RAID5", "Queue Depth": "64", "IOPS(K)": "N/A", "controller": "SR-1010"},
+        {"RAID_type": "RAID5", "Queue Depth": "64", "IOPS(K)": "170", "controller": "SR-1010"},
+    ],
+}
+
+
+class Loader:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, result_name, req_type):
+        self.calls += 1
+        return [dict(row) for row in ROWS[result_name]]
+
+
+@pytest.fixture
+def cache():
+    return ResultFrameCache(Loader())
+
+
+def test_frames_are_cached_typed_and_invalidated():
+    loader = Loader()
+    cache = ResultFrameCache(loader)
+    frame = cache.get("run-a")
+    assert cache.get("run-a") is frame
+    assert loader.calls == 1
+    assert frame["IOPS(K)"].dtype.kind == "i"
+    assert (frame["result"] == "run-a").all()
+
+    cache.invalidate("run-a")
+    cache.get("run-a")
+    assert loader.calls == 2
+
+
+def test_filters_and_projection(cache):
+    answer = run_query(cache, ["run-a", "run-b"], columns=["result", "IOPS(K)"],
+                       filters={"RAID_type": "RAID5", "Queue Depth": [64]})
+    assert answer["length"] == 3
+    assert answer["columns"]["result"] == ["run-a", "run-b", "run-b"]
+
+
+def test_group_by_aggregates_mixed_numeric_columns(cache):
+    answer = run_query(cache, ["run-a", "run-b"], filters={"RAID_type": ["RAID5"]},
+                       group_by=["result"], aggregations={"IOPS(K)": "sum"})
+    assert answer["columns"]["result"] == ["run-a", "run-b"]
+    assert answer["columns"]["IOPS(K)"] == [250.0, 170.0]
+    assert answer["columns"]["samples"] == [2, 2]
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"filters": {"Bogus": "x"}},
+    {"group_by": ["Bogus"]},
+    {"group_by": ["result"], "aggregations": {"IOPS(K)": "median"}},
+    {"group_by": ["result"], "aggregations": {"controller": "sum"}},
+    {"columns": ["Bogus"]},
+])
+def test_invalid_queries_raise_query_error(cache, kwargs):
+    with pytest.raises(QueryError):
+        run_query(cache, ["run-a"], **kwargs)
+
+
+def test_arrow_export_is_written_once_and_dropped_on_invalidate(tmp_path):
+    feather = pytest.importorskip("pyarrow.feather")
+    cache = ResultFrameCache(Loader(), export_dir=tmp_path / "arrow")
+
+    path = cache.export_arrow("run-a")
+    assert path.name.endswith(".arrow")
+    assert cache.export_arrow("run-a") == path
+    table = feather.read_table(path)
+    assert table.num_rows == 3
+    assert str(table.schema.field("IOPS(K)").type) == "int64"
+    assert str(table.schema.field("controller").type) in ("string", "large_string")
+
+    cache.invalidate("run-a")
+    assert not path.exists()
+
+
+def test_arrow_exports_are_keyed_by_the_exact_name_and_rows(tmp_path):
+    pytest.importorskip("pyarrow.feather")
+    rows = {
+        "a b": [{"IOPS(K)": "1"}],
+        "a_b": [{"IOPS(K)": "2"}],
+        "foo": [{"IOPS(K)": "3"}],
+        "foo--bar": [{"IOPS(K)": "4"}],
+    }
+    cache = ResultFrameCache(lambda name, req_type: [dict(row) for row in rows[name]],
+                             export_dir=tmp_path / "arrow")
+
+    paths = {name: cache.export_arrow(name) for name in rows}
+    assert len(set(paths.values())) == 4
+
+    cache.invalidate("foo")
+    assert not paths["foo"].exists()
+    assert paths["foo--bar"].exists()
+
+    # An export left behind by an earlier process with older rows is
+    # replaced, not served.
+    rows["a b"] = [{"IOPS(K)": "5"}]
+    restarted = ResultFrameCache(lambda name, req_type: [dict(row) for row in rows[name]],
+                                 export_dir=tmp_path / "arrow")
+    fresh = restarted.export_arrow("a b")
+    assert fresh != paths["a b"]
+    assert fresh.exists() and not paths["a b"].exists()
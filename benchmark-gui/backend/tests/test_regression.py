@@ -0,0 +1,68 @@
+from regression import DEFAULT_THRESHOLDS, compare_runs
+
+
+def _row(qd, iops, latency=None, raid="RAID5"):
+    row = {
+        "controller": "SR-1000",
+        "RAID_type": raid,
+        "Workload": "4k Random Read",
+        "BlockSize": "4",
+        "Queue Depth": str(qd),
+        "Threads": "8",
+        "stage": "afterdiscard",
+        "IOPS(K)": str(iops),
+    }
+    if latency is not None:
+        row["Read Latency (us)"] = str(latency)
+    return row
+
+
+def test_changes_are_classified_against_the_group_thresholds():
+    baseline = [_row(32, 100, 50), _row(64, 100, 50), _row(128, 100, 50)]
+    candidate = [_row(32, 94, 50), _row(64, 104, 56), _row(128, 110, 44)]
+    report = compare_runs(baseline, candidate)
+
+    regressions = {(entry["Queue Depth"], entry["metric"]) for entry in report["regressions"]}
+    improvements = {(entry["Queue Depth"], entry["metric"]) for entry in report["improvements"]}
+    # -6 % IOPS is past the 5 % limit; +12 % latency past the 10 % one.
+    assert regressions == {("32", "IOPS(K)"), ("64", "Read Latency (us)")}
+    assert improvements == {("128", "IOPS(K)"), ("128", "Read Latency (us)")}
+    assert report["unchanged"] == 2
+    assert report["thresholds"] == DEFAULT_THRESHOLDS
+
+
+def test_threshold_boundary_counts_and_overrides_apply():
+    report = compare_runs([_row(32, 100)], [_row(32, 95)])
+    assert [entry["delta_pct"] for entry in report["regressions"]] == [-5.0]
+
+    report = compare_runs([_row(32, 100)], [_row(32, 95)], thresholds={"iops": 10, "bogus": 1})
+    assert report["regressions"] == []
+    assert report["thresholds"]["iops"] == 10.0
+    assert "bogus" not in report["thresholds"]
+
+
+def test_rows_of_a_cell_are_aggregated_before_comparing():
+    # Two PDs per cell: IOPS summed, latency averaged.
+    baseline = [_row(32, 50, 40), _row(32, 50, 60)]
+    candidate = [_row(32, 40, 80), _row(32, 40, 40)]
+    report = compare_runs(baseline, candidate)
+
+    (entry,) = [entry for entry in report["regressions"] if entry["metric"] == "IOPS(K)"]
+    assert (entry["baseline"], entry["candidate"], entry["delta_pct"]) == (100.0, 80.0, -20.0)
+    (latency,) = [entry for entry in report["regressions"] if entry["metric"] == "Read Latency (us)"]
+    assert (latency["baseline"], latency["candidate"]) == (50.0, 60.0)
+
+
+def test_regressions_are_ordered_worst_first_and_unmatched_counted():
+    baseline = [_row(32, 100), _row(64, 100), _row(16, 100, raid="RAID6")]
+    candidate = [_row(32, 90), _row(64, 50), _row(16, 100, raid="RAID10")]
+    report = compare_runs(baseline, candidate)
+
+    assert [entry["Queue Depth"] for entry in report["regressions"]] == ["64", "32"]
+    assert report["unmatched"] == {"baseline_only": 1, "candidate_only": 1}
+
+
+def test_missing_or_zero_baselines_are_skipped():
+    report = compare_runs([_row(32, 0), _row(64, "N/A")], [_row(32, 10), _row(64, 10)])
+    assert report["regressions"] == report["improvements"] == []
+    assert report["unchanged"] == 0
@@ -0,0 +1,146 @@
+import json
+
+import pytest
+
+import config
+import run_queue as run_queue_module
+from run_queue import QueueError, RunQueue
+from state import ResumableRuns
+
+
+class FakeSlot:
+    def __init__(self, running=False, accept=True):
+        self.running = running
+        self.accept = accept
+        self.started = []
+
+    def try_start(self, config, session_id, run_id):
+        if not self.accept:
+            return None
+        self.started.append((config, session_id, run_id))
+        self.running = True
+        return run_id
+
+
+class FakeFleet:
+    def __init__(self):
+        self.slots = {}
+
+    @staticmethod
+    def dut_key(config):
+        return config.get("DUT_IP") or "local"
+
+    def slot(self, dut):
+        return self.slots.setdefault(dut, FakeSlot())
+
+
+@pytest.fixture(autouse=True)
+def quiet_audit(monkeypatch):
+    events = []
+    monkeypatch.setattr(run_queue_module, "audit_event", lambda *args, **kwargs: events.append((args, kwargs)))
+    return events
+
+
+@pytest.fixture(autouse=True)
+def resumable_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "LOGS_DIR", tmp_path)
+    monkeypatch.setattr(config, "RESUMABLE_FILE", tmp_path / "resumable_benchmark.json")
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return RunQueue(tmp_path / "run_queue.json")
+
+
+def _ids(entries):
+    return [entry["id"] for entry in entries]
+
+
+def test_reorder_moves_queued_entries_and_keeps_the_rest_in_place(queue):
+    a, b, c = (queue.enqueue({"NVME_INFO": name}) for name in "abc")
+    queue.cancel(b["id"])
+
+    entries = queue.reorder([c["id"], a["id"]])
+    assert _ids(entries) == [c["id"], b["id"], a["id"]]
+    with pytest.raises(QueueError):
+        queue.reorder([b["id"]])
+
+
+def test_partial_reorder_appends_the_unlisted_entries(queue):
+    a, b, c = (queue.enqueue({"NVME_INFO": name}) for name in "abc")
+    assert _ids(queue.reorder([b["id"]])) == [b["id"], a["id"], c["id"]]
+
+
+def test_dispatch_runs_one_entry_per_idle_dut_in_order(queue):
+    fleet = FakeFleet()
+    first = queue.enqueue({"DUT_IP": "10.0.0.1"})
+    second = queue.enqueue({"DUT_IP": "10.0.0.1"})
+    other = queue.enqueue({"DUT_IP": "10.0.0.2"})
+
+    started = queue.dispatch(fleet)
+    assert _ids(started) == [first["id"], other["id"]]
+    assert queue.dispatch(fleet) == []
+
+    run_id = started[0]["run_id"]
+    assert queue.on_run_finished(run_id, succeeded=True)["status"] == "completed"
+    fleet.slot("10.0.0.1").running = False
+    assert _ids(queue.dispatch(fleet)) == [second["id"]]
+
+
+def test_passwords_stay_in_memory_and_hold_the_dut_after_a_restart(tmp_path, queue):
+    remote = {"DUT_IP": "10.0.0.1", "REMOTE_MODE": True, "DUT_PASSWORD": "secret"}
+    entry = queue.enqueue(remote)
+    queue.enqueue({"DUT_IP": "10.0.0.1"})
+    assert not entry["needs_password"]
+    assert "secret" not in (tmp_path / "run_queue.json").read_text()
+
+    restarted = RunQueue(tmp_path / "run_queue.json")
+    assert restarted.list()[0]["needs_password"]
+    fleet = FakeFleet()
+    # The password-less entry holds its DUT; the one behind it waits.
+    assert restarted.dispatch(fleet) == []
+
+    restarted.resume(entry["id"], password="secret")
+    (started,) = restarted.dispatch(fleet)
+    assert started["id"] == entry["id"]
+    assert fleet.slot("10.0.0.1").started[0][0]["DUT_PASSWORD"] == "secret"
+
+
+def test_reconcile_marks_lost_runs_interrupted_and_resume_requeues_them(queue):
+    fleet = FakeFleet()
+    kept = queue.enqueue({"DUT_IP": "10.0.0.1"})
+    lost = queue.enqueue({"DUT_IP": "10.0.0.2"})
+    started = {entry["id"]: entry["run_id"] for entry in queue.dispatch(fleet)}
+
+    queue.reconcile({started[kept["id"]]})
+    statuses = {entry["id"]: entry["status"] for entry in queue.list()}
+    assert statuses == {kept["id"]: "running", lost["id"]: "interrupted"}
+
+    resumed = queue.resume(lost["id"])
+    assert (resumed["status"], resumed["run_id"]) == ("queued", None)
+    with pytest.raises(QueueError):
+        queue.resume(kept["id"])
+    with pytest.raises(QueueError):
+        queue.cancel(kept["id"])
+
+
+def test_finished_history_is_capped(tmp_path, queue, monkeypatch):
+    monkeypatch.setattr(run_queue_module, "HISTORY_LIMIT", 2)
+    entries = [queue.enqueue({"NVME_INFO": str(index)}) for index in range(4)]
+    for entry in entries:
+        queue.cancel(entry["id"])
+    saved = json.loads((tmp_path / "run_queue.json").read_text())
+    assert [entry["id"] for entry in saved["entries"]] == _ids(entries[2:])
+
+
+def test_a_resumable_run_holds_its_duts_queue(queue):
+    fleet = FakeFleet()
+    held = queue.enqueue({"DUT_IP": "10.0.0.1"})
+    other = queue.enqueue({"DUT_IP": "10.0.0.2"})
+    ResumableRuns.save("10.0.0.1", {"run_id": "r1", "dut": "10.0.0.1"})
+
+    # Starting `held` would wipe the interrupted run's checkpoints.
+    assert _ids(queue.dispatch(fleet)) == [other["id"]]
+
+    ResumableRuns.pop("10.0.0.1")
+    assert _ids(queue.dispatch(fleet)) == [held["id"]]
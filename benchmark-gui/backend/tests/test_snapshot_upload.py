@@ -0,0 +1,66 @@
+import pytest
+
+for _module in ("httpx", "fastapi.testclient", "socketio", "psutil", "paramiko", "scp"):
+    pytest.importorskip(_module)
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import fastapi_app  # noqa: E402
+
+URL = "/api/benchmark/save_snapshot/upload?test_name=iops&output_dir=MODEL-result/VD"
+PNG = b"\x89PNG\r\n\x1a\n" + b"x" * 1000
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(fastapi_app, "RESULTS_DIR", tmp_path)
+    monkeypatch.setattr(fastapi_app, "audit_event", lambda *args, **kwargs: None)
+    return TestClient(fastapi_app.app)
+
+
+def _saved(tmp_path):
+    return tmp_path / "MODEL-result" / "VD" / "report_view" / "iops_report_view.png"
+
+
+def _leftovers(tmp_path):
+    return list((tmp_path / "MODEL-result" / "VD" / "report_view").glob(".upload-*"))
+
+
+def test_octet_stream_upload_is_written_in_place(client, tmp_path):
+    response = client.post(URL, content=PNG, headers={"Content-Type": "application/octet-stream"})
+    assert response.status_code == 200
+    assert response.json()["data"]["bytes"] == len(PNG)
+    assert _saved(tmp_path).read_bytes() == PNG
+    assert not _leftovers(tmp_path)
+
+
+def test_multipart_upload_keeps_only_the_image_part(client, tmp_path):
+    response = client.post(URL, files={"image": ("iops.png", PNG, "image/png")}, data={"note": "ignored"})
+    assert response.status_code == 200
+    assert _saved(tmp_path).read_bytes() == PNG
+
+
+@pytest.mark.parametrize("body, content_type", [
+    (b"--x\r\n\r\n--x--\r\n", "multipart/form-data"),
+    (b'--x\r\nContent-Disposition: form-data; name="other"\r\n\r\nabc\r\n--x--\r\n',
+     "multipart/form-data; boundary=x"),
+])
+def test_multipart_without_boundary_or_image_field_is_rejected(client, tmp_path, body, content_type):
+    response = client.post(URL, content=body, headers={"Content-Type": content_type})
+    assert response.status_code == 400
+    assert not _saved(tmp_path).exists()
+    assert not _leftovers(tmp_path)
+
+
+def test_oversized_uploads_are_refused_with_or_without_a_length(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(fastapi_app, "MAX_SNAPSHOT_BYTES", 100)
+    monkeypatch.setattr(fastapi_app, "SNAPSHOT_CHUNK_BYTES", 10)
+
+    declared = client.post(URL, content=PNG, headers={"Content-Type": "application/octet-stream"})
+    assert declared.status_code == 413
+
+    chunked = client.post(URL, content=iter([PNG[:500], PNG[500:]]),
+                          headers={"Content-Type": "application/octet-stream"})
+    assert chunked.status_code == 413
+    assert not _saved(tmp_path).exists()
+    assert not _leftovers(tmp_path)
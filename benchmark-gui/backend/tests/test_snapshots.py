@@ -0,0 +1,75 @@
+import time
+
+import pytest
+
+import snapshots
+
+
+def _samples(count=4):
+    samples = []
+    for index in range(count):
+        ts = 1000.0 + index * snapshots.SAMPLE_INTERVAL
+        for dev, scale in (("gdg0n1", 1.0), ("gdg0n2", 3.0), ("nvme0n1", 100.0)):
+            samples.append((ts, {
+                "dev": dev,
+                "iops_read": 100.0 * scale, "iops_write": 10.0 * scale,
+                "bw_read": 400.0 * scale, "bw_write": 40.0 * scale,
+                "lat_read": 0.2 * scale, "lat_write": 0.4 * scale,
+            }))
+    return samples
+
+
+def test_aggregate_sums_throughput_and_averages_latency_per_stage():
+    points = snapshots.aggregate_samples(_samples(), stage="VD")
+    assert [point["elapsed"] for point in points] == [0, 5, 10, 15]
+    assert points[0]["iops_read"] == pytest.approx(400.0)
+    assert points[0]["bw_write"] == pytest.approx(160.0)
+    assert points[0]["lat_read"] == pytest.approx(0.4)
+    assert snapshots.aggregate_samples(_samples(), stage="MD") == []
+
+
+def test_render_from_samples_writes_a_png(tmp_path):
+    pytest.importorskip("matplotlib")
+    out_path = tmp_path / "report_view" / "iops_report_view.png"
+    assert snapshots.render_snapshot(_samples(), out_path, "randread 4k", stage="VD")
+    assert out_path.read_bytes()[:8] == b"\x89PNG\r\n\x1a\n"
+    assert not list(out_path.parent.glob("*.tmp"))
+
+    assert not snapshots.render_snapshot([], tmp_path / "empty.png", "empty")
+    assert not (tmp_path / "empty.png").exists()
+
+
+class _Recorder:
+    def __init__(self):
+        self.events = []
+
+    def emit(self, event, data=None, room=None, **kwargs):
+        self.events.append((event, data, room))
+
+
+@pytest.mark.parametrize("renderer", ["missing", "no_samples"])
+def test_manager_relays_to_the_browser_when_it_cannot_render(monkeypatch, renderer):
+    for module in ("paramiko", "scp"):
+        pytest.importorskip(module)
+    import config
+    import manager
+
+    recorder = _Recorder()
+    monkeypatch.setattr(config, "socketio", recorder)
+    if renderer == "missing":
+        monkeypatch.setattr(snapshots, "renderer_available", lambda: False)
+    else:
+        monkeypatch.setattr(snapshots, "renderer_available", lambda: True)
+        monkeypatch.setattr(snapshots, "render_snapshot", lambda *args: False)
+
+    slot = manager.BenchmarkManager()
+    slot.request_snapshot("randread-4k", "MODEL-result/VD", "default")
+
+    deadline = time.monotonic() + 5
+    while not recorder.events and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert recorder.events == [
+        ("snapshot_request",
+         {"test_name": "randread-4k", "output_dir": "MODEL-result/VD", "dut": "local", "run_id": None},
+         "default"),
+    ]
@@ -0,0 +1,68 @@
+import json
+
+import steady_state
+
+
+def _report(elapsed, total_ios):
+    return {"jobs": [{"elapsed": elapsed, "read": {"total_ios": total_ios}, "write": {"total_ios": 0}}]}
+
+
+def test_interval_iops_uses_deltas_and_skips_repeated_reports():
+    reports = [_report(10, 1000), _report(10, 1000), _report(20, 3000), _report(30, 6000)]
+    assert steady_state.interval_iops(reports) == [(10, 100.0), (20, 200.0), (30, 300.0)]
+
+
+def test_flat_window_is_steady():
+    attained, stats = steady_state.check_window([1000, 1010, 990, 1005, 995], 20.0, 10.0)
+    assert attained
+    assert stats["mean_iops"] == 1000.0
+    assert stats["range_pct"] == 2.0
+
+
+def test_range_criterion():
+    # Mean 1000, range 300 = 30 % > 20 %, no trend.
+    attained, stats = steady_state.check_window([850, 1150, 850, 1150, 1000], 20.0, 100.0)
+    assert not attained
+    assert stats["range_pct"] == 30.0
+
+
+def test_slope_criterion_uses_the_excursion_across_the_window():
+    # Least-squares slope 30 IOPS/round over 4 steps: excursion 120 = 12 %.
+    values = [940, 970, 1000, 1030, 1060]
+    attained, stats = steady_state.check_window(values, 20.0, 10.0)
+    assert not attained
+    assert stats["slope_excursion_pct"] == 12.0
+    assert steady_state.check_window(values, 20.0, 15.0)[0]
+
+
+def test_zero_mean_is_never_steady():
+    assert steady_state.check_window([0, 0, 0], 20.0, 10.0) == (
+        False, {"mean_iops": 0.0, "range_pct": None, "slope_excursion_pct": None})
+
+
+def test_status_file_is_split_into_json_and_text_reports(tmp_path):
+    status = tmp_path / "cell.fiostatus"
+    status.write_text(
+        "job: (g=0): rw=randread\n"
+        + json.dumps(_report(10, 1000), indent=1) + "\n"
+        + "read: IOPS=100 {not json}\n"
+        + json.dumps(_report(20, 3000)) + "\n"
+        + '{"jobs": [{"elapsed": 30'  # still being written
+    )
+    assert [report["jobs"][0]["elapsed"] for report in steady_state.read_reports(status)] == [10, 20]
+    text = steady_state.text_reports(status)
+    assert "rw=randread" in text
+    assert "read: IOPS=100 {not json}" in text
+    assert '"total_ios"' not in text.split('{"jobs"')[0]
+    assert steady_state.read_reports(tmp_path / "missing") == []
+    assert steady_state.text_reports(tmp_path / "missing") == ""
+
+
+def test_watch_reports_the_runtime_cap_when_fio_is_gone(tmp_path, monkeypatch):
+    status = tmp_path / "cell.fiostatus"
+    status.write_text("".join(json.dumps(_report(10 * i, 1000 * i * i)) for i in range(1, 4)))
+    monkeypatch.setattr(steady_state, "pid_alive", lambda pid: False)
+
+    result = steady_state.watch(str(status), 12345, window=5, range_pct=20.0, slope_pct=10.0, poll=0)
+    assert result["reason"] == steady_state.REASON_CAP
+    assert [entry["iops"] for entry in result["rounds"]] == [100.0, 300.0, 500.0]
@@ -0,0 +1,153 @@
+import json
+import os
+import threading
+
+import pytest
+
+import transfer
+from transfer import TransferError, pull_files
+
+
+class FakeRemoteFile:
+    def __init__(self, path):
+        self._handle = open(path, "rb")
+
+    def readv(self, ranges):
+        for offset, length in ranges:
+            self._handle.seek(offset)
+            yield self._handle.read(length)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._handle.close()
+
+
+class FakeSFTP:
+    def __init__(self, client):
+        self.client = client
+
+    def open(self, path, mode):
+        with self.client.lock:
+            self.client.opens += 1
+            if self.client.failures.get(path, 0) > 0:
+                self.client.failures[path] -= 1
+                raise OSError("Socket is closed")
+        return FakeRemoteFile(path)
+
+    def close(self):
+        pass
+
+
+class FakeClient:
+    """SSHClient stand-in whose "remote" paths are local files."""
+
+    def __init__(self, failures=None):
+        self.lock = threading.Lock()
+        self.failures = dict(failures or {})
+        self.opens = 0
+        self.connects = 0
+
+    def __call__(self):
+        self.connects += 1
+        return self
+
+    def open_sftp(self):
+        return FakeSFTP(self)
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(transfer, "CHUNK_SIZE", 4096)
+    monkeypatch.setattr(transfer, "READ_SIZE", 1024)
+    monkeypatch.setattr(transfer, "RETRY_DELAY", 0)
+
+
+def _remote_file(tmp_path, name, size, mtime=1_700_000_000):
+    path = tmp_path / "remote" / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(os.urandom(size))
+    return str(path), size, mtime
+
+
+def _job(remote, target):
+    path, size, mtime = remote
+    return path, str(target), size, mtime
+
+
+def test_files_are_reassembled_from_parallel_chunks(tmp_path):
+    big = _remote_file(tmp_path, "atop.raw", 5 * 4096 + 17)
+    small = _remote_file(tmp_path, "cell.json", 100)
+    empty = _remote_file(tmp_path, "empty.log", 0)
+    local = tmp_path / "local"
+    staging = tmp_path / ".transfer-partial"
+
+    stats = pull_files(FakeClient(), [_job(big, local / "atop.raw"), _job(small, local / "c" / "cell.json"),
+                                      _job(empty, local / "empty.log")], str(staging), channels=3)
+
+    for remote, target in ((big, local / "atop.raw"), (small, local / "c" / "cell.json"), (empty, local / "empty.log")):
+        assert target.read_bytes() == open(remote[0], "rb").read()
+        assert target.stat().st_mtime == remote[2]
+    assert stats["files"] == 3
+    assert stats["bytes"] == big[1] + small[1]
+    assert set(stats) == {"files", "bytes", "seconds", "mib_s"}
+    assert not staging.exists()
+
+
+def test_a_failing_file_is_retried_on_a_new_connection(tmp_path):
+    remote = _remote_file(tmp_path, "atop.raw", 3 * 4096)
+    client = FakeClient(failures={remote[0]: 1})
+
+    pull_files(client, [_job(remote, tmp_path / "local" / "atop.raw")], str(tmp_path / "staging"))
+
+    assert (tmp_path / "local" / "atop.raw").read_bytes() == open(remote[0], "rb").read()
+    assert client.connects == 2
+
+
+def test_files_still_missing_after_the_retries_raise(tmp_path):
+    remote = _remote_file(tmp_path, "atop.raw", 3 * 4096)
+    staging = tmp_path / "staging"
+    client = FakeClient(failures={remote[0]: 100})
+
+    with pytest.raises(TransferError):
+        pull_files(client, [_job(remote, tmp_path / "local" / "atop.raw")], str(staging))
+    assert client.connects == transfer.RETRIES + 1
+    assert not (tmp_path / "local" / "atop.raw").exists()
+    # The pieces stay staged for the next attempt.
+    assert list(staging.glob("*.part"))
+
+
+def test_an_interrupted_pull_resumes_from_its_recorded_chunks(tmp_path):
+    remote = _remote_file(tmp_path, "atop.raw", 4 * 4096)
+    target = tmp_path / "local" / "atop.raw"
+    staging = tmp_path / "staging"
+    state = transfer._FileState(remote[0], target, remote[1], remote[2], staging)
+    state.prepare()
+    with open(remote[0], "rb") as source, open(state.part, "r+b") as part:
+        part.write(source.read(2 * 4096))
+    state.done = {0, 1}
+    state.save_meta()
+    assert json.loads(state.meta.read_text())["done"] == [0, 1]
+
+    client = FakeClient()
+    stats = pull_files(client, [_job(remote, target)], str(staging))
+
+    assert target.read_bytes() == open(remote[0], "rb").read()
+    assert stats["bytes"] == 2 * 4096
+    assert client.opens == 2
+
+
+def test_a_changed_remote_file_starts_over(tmp_path):
+    remote = _remote_file(tmp_path, "atop.raw", 2 * 4096)
+    target = tmp_path / "local" / "atop.raw"
+    staging = tmp_path / "staging"
+    stale = transfer._FileState(remote[0], target, remote[1], remote[2] - 60, staging)
+    stale.prepare()
+    stale.done = {0}
+    stale.save_meta()
+
+    stats = pull_files(FakeClient(), [_job(remote, target)], str(staging))
+
+    assert stats["bytes"] == 2 * 4096
+    assert target.read_bytes() == open(remote[0], "rb").read()
@@ -0,0 +1,69 @@
+import threading
+import time
+
+import pytest
+
+import watcher
+from watcher import ResultsWatcher
+
+
+class Recorder:
+    def __init__(self):
+        self.names = []
+        self.event = threading.Event()
+
+    def __call__(self, name):
+        self.names.append(name)
+        self.event.set()
+
+
+@pytest.fixture
+def polling_watcher(tmp_path, monkeypatch):
+    """A watcher on tmp_path that polls (no watchdog) every 50 ms."""
+    monkeypatch.setattr(watcher, "Observer", None)
+    monkeypatch.setattr(watcher, "DEBOUNCE_SECONDS", 0.2)
+    monkeypatch.setattr(watcher, "MAX_DELAY_SECONDS", 0.6)
+    recorder = Recorder()
+    instance = ResultsWatcher(tmp_path, poll_interval=0.05)
+    instance.register(recorder)
+    instance.start()
+    yield instance, recorder
+    instance.stop()
+
+
+def test_notify_invalidates_the_named_entry(polling_watcher):
+    instance, recorder = polling_watcher
+    instance.notify("run-a")
+    assert recorder.event.wait(2)
+    assert recorder.names == ["run-a"]
+
+
+def test_poll_reports_new_top_level_entries_only(tmp_path, polling_watcher):
+    _, recorder = polling_watcher
+    (tmp_path / ".test-temp-data" / "key").mkdir(parents=True)
+    (tmp_path / ".cache").mkdir()
+    (tmp_path / "run-a").mkdir()
+    assert recorder.event.wait(2)
+    time.sleep(0.3)
+    assert recorder.names == ["run-a"]
+
+
+def test_changes_inside_ignored_trees_are_dropped(tmp_path):
+    instance = ResultsWatcher(tmp_path)
+    instance._mark_path(str(tmp_path / ".transfer-partial" / "abc.part"))
+    instance._mark_path(str(tmp_path / "run-a" / "big.log.part"))
+    instance._mark_path(str(tmp_path / ".test-temp-data" / "key" / "x.csv"))
+    assert instance._pending == set()
+    instance._mark_path(str(tmp_path / "run-a" / "stage" / "x.csv"))
+    assert instance._pending == {"run-a"}
+
+
+def test_a_steady_event_stream_is_flushed_after_the_max_delay(tmp_path, polling_watcher):
+    instance, recorder = polling_watcher
+    started = time.monotonic()
+    # Events every 50 ms never leave the 200 ms debounce window open.
+    while not recorder.event.is_set() and time.monotonic() - started < 3:
+        instance._mark_path(str(tmp_path / "busy" / "cell.json"))
+        time.sleep(0.05)
+    assert recorder.names[:1] == ["busy"]
+    assert time.monotonic() - started < 2
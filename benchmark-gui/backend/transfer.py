@@ -0,0 +1,196 @@
+"""Parallel SFTP pulls for RemoteExecutor syncs.
+
+One SCP/SFTP stream over a high-latency link is capped by its channel
+window, well below link speed. pull_files spreads the work over several
+SFTP channels of the DUT's transport (settings.transfer_channels): every
+file is cut into CHUNK_SIZE pieces, and the pieces of all files are handed
+to the channel workers as they free up, so one big atop capture or raw fio
+log is fetched by all channels at once.
+
+Pieces land in a `.part` file at their offset, kept in a hidden staging
+directory (STAGING_DIR_NAME, on the same filesystem as the targets) rather
+than next to the result. For chunked files, the pieces already written are
+recorded in a `.part.json` (with the remote size and mtime), so a pull
+interrupted by a dropped connection or a backend restart resumes where it
+stopped instead of starting over. A finished file is renamed into place and
+given the remote mtime; an emptied staging directory is removed.
+
+Files that fail are retried (RETRIES passes, reconnecting through
+`connect`); pull_files raises TransferError if any are still missing, so
+the caller can fall back to SCP.
+"""
+
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+
+from config import logger
+
+CHUNK_SIZE = 16 * 1024 * 1024
+# readv request size inside a chunk; paramiko pipelines these.
+READ_SIZE = 1024 * 1024
+# Extra passes over files that failed, and the pause before each.
+RETRIES = 2
+RETRY_DELAY = 2.0
+STAGING_DIR_NAME = '.transfer-partial'
+
+
+class TransferError(IOError):
+    """Some files could not be fetched after all retries."""
+
+
+class _FileState:
+    def __init__(self, remote_path, target, size, mtime, staging_dir):
+        self.remote_path = remote_path
+        self.target = Path(target)
+        # Flat names in the staging dir, one per target path.
+        key = hashlib.sha1(str(self.target).encode()).hexdigest()
+        self.part = Path(staging_dir) / f"{key}.part"
+        self.meta = Path(staging_dir) / f"{key}.part.json"
+        self.size = size
+        self.mtime = mtime
+        self.chunks = max(1, -(-size // CHUNK_SIZE))
+        self.done = set()
+        self.complete = False
+
+    def prepare(self):
+        """Create the .part file, keeping pieces of an earlier attempt at
+        the same remote version. A file whose pieces all arrived before the
+        interruption is finished right away."""
+        self.target.parent.mkdir(parents=True, exist_ok=True)
+        self.part.parent.mkdir(parents=True, exist_ok=True)
+        if self.chunks > 1 and self.part.exists():
+            try:
+                meta = json.loads(self.meta.read_text())
+                if meta.get('size') == self.size and meta.get('mtime') == self.mtime:
+                    self.done = set(meta.get('done', [])) & set(range(self.chunks))
+            except (OSError, ValueError):
+                pass
+        if not self.done:
+            with open(self.part, 'wb') as f:
+                f.truncate(self.size)
+        elif len(self.done) == self.chunks:
+            self.finish()
+
+    def save_meta(self):
+        if self.chunks > 1:
+            self.meta.write_text(json.dumps({'size': self.size, 'mtime': self.mtime, 'done': sorted(self.done)}))
+
+    def finish(self):
+        os.replace(self.part, self.target)
+        os.utime(self.target, (self.mtime, self.mtime))
+        try:
+            self.meta.unlink()
+        except FileNotFoundError:
+            pass
+        self.complete = True
+
+
+def pull_files(connect, jobs, staging_dir, channels=4, throttle=None):
+    """Fetch jobs [(remote_path, local_path, size, mtime)] over `channels`
+    concurrent SFTP channels. `connect()` returns a connected paramiko
+    SSHClient (reconnecting if needed) and is called again for each retry.
+
+    `throttle` (executor._Throttle) caps the combined rate. Returns
+    {'files', 'bytes', 'seconds', 'mib_s'}; raises TransferError when files
+    are still missing after RETRIES extra passes.
+    """
+    states = [_FileState(*job, staging_dir) for job in jobs]
+    lock = threading.Lock()
+    moved = [0]
+    started = time.monotonic()
+
+    def fetch(sftp, state, index):
+        offset = index * CHUNK_SIZE
+        length = min(CHUNK_SIZE, state.size - offset)
+        ranges = [(pos, min(READ_SIZE, offset + length - pos)) for pos in range(offset, offset + length, READ_SIZE)]
+        with sftp.open(state.remote_path, 'rb') as remote, open(state.part, 'r+b') as local:
+            local.seek(offset)
+            for data in remote.readv(ranges):
+                local.write(data)
+                with lock:
+                    moved[0] += len(data)
+                if throttle is not None:
+                    throttle.add(len(data))
+
+    def worker(ssh, work, failed):
+        try:
+            sftp = ssh.open_sftp()
+        except Exception as e:
+            logger.warning("opening an SFTP channel failed: %s", e)
+            return
+        try:
+            while True:
+                try:
+                    state, index = work.get_nowait()
+                except queue.Empty:
+                    return
+                if state in failed:
+                    continue
+                try:
+                    if state.size:
+                        fetch(sftp, state, index)
+                    with lock:
+                        state.done.add(index)
+                        complete = len(state.done) == state.chunks
+                        state.save_meta()
+                    if complete:
+                        state.finish()
+                except Exception as e:
+                    logger.warning("pull of %s (piece %d) failed: %s", state.remote_path, index, e)
+                    with lock:
+                        failed.add(state)
+        finally:
+            sftp.close()
+
+    def run_pass(pending):
+        work = queue.Queue()
+        for state in pending:
+            for index in range(state.chunks):
+                if index not in state.done:
+                    work.put((state, index))
+        if work.empty():
+            return
+        ssh = connect()
+        failed = set()
+        threads = [threading.Thread(target=worker, args=(ssh, work, failed), daemon=True)
+                   for _ in range(max(1, min(channels, work.qsize())))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    for state in states:
+        state.prepare()
+    pending = [state for state in states if not state.complete]
+    for attempt in range(RETRIES + 1):
+        if attempt:
+            logger.info("retrying %d unfinished file(s) (attempt %d of %d)", len(pending), attempt, RETRIES)
+            time.sleep(RETRY_DELAY * attempt)
+        try:
+            run_pass(pending)
+        except Exception as e:
+            logger.warning("transfer pass failed: %s", e)
+        pending = [state for state in states if not state.complete]
+        if not pending:
+            break
+
+    if pending:
+        raise TransferError(f"{len(pending)} of {len(states)} file(s) could not be fetched, "
+                            f"e.g. {pending[0].remote_path}")
+    try:
+        # Only goes once no other pull (another DUT) has pieces staged.
+        os.rmdir(staging_dir)
+    except OSError:
+        pass
+    seconds = max(time.monotonic() - started, 1e-6)
+    return {
+        'files': len(states),
+        'bytes': moved[0],
+        'seconds': round(seconds, 2),
+        'mib_s': round(moved[0] / seconds / (1024 * 1024), 2),
+    }
@@ -0,0 +1,217 @@
+"""RESULTS_DIR watcher driving cache invalidation.
+
+Caches used to learn about new or changed results only through the manual
+`POST /api/results/{name}/clear-cache`, which drops everything for a result. Changes are reduced to the top-level
+RESULTS_DIR entry they belong to ("EPW5970-3200GB-result",
+"graid_bench_result_....tar.gz") and handed to every registered
+invalidator once the burst settles, so a sync_from_remote that writes
+thousands of files produces one callback per result.
+
+Uses the `watchdog` package (inotify on Linux) when installed; otherwise
+polls a shallow signature of each top-level entry. Deep changes the
+shallow poll cannot see are covered by notify(), which
+BenchmarkManager calls after every sync_from_remote.
+"""
+
+import os
+import threading
+import time
+
+from config import RESULTS_DIR, logger
+from settings import settings
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # pragma: no cover - optional dependency
+    FileSystemEventHandler = object
+    Observer = None
+
+# Our own cache writes (derivatives, extracted images, catalog.json) must
+# not feed back into invalidation, nor may the bench.sh staging area or the
+# .part/.part.json files of a transfer in progress (transfer.py).
+IGNORED_NAMES = (".cache", ".test-temp-data", ".transfer-partial")
+IGNORED_SUFFIXES = (".part", ".part.json")
+DEBOUNCE_SECONDS = 1.0
+# A steady stream of writes (a long sync) keeps resetting the debounce;
+# pending invalidations are flushed at least this often regardless.
+MAX_DELAY_SECONDS = 15.0
+
+
+def _ignored(name):
+    return name in IGNORED_NAMES or name.endswith(IGNORED_SUFFIXES)
+
+
+class _EventHandler(FileSystemEventHandler):
+    def __init__(self, watcher):
+        super().__init__()
+        self._watcher = watcher
+
+    def on_any_event(self, event):
+        for attr in ("src_path", "dest_path"):
+            path = getattr(event, attr, None)
+            if path:
+                self._watcher._mark_path(path)
+
+
+class ResultsWatcher:
+    def __init__(self, root, poll_interval=10.0):
+        self.root = root
+        self.poll_interval = poll_interval
+        self._callbacks = []
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._last_event = 0.0
+        # monotonic time the oldest pending name was queued
+        self._first_pending = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._observer = None
+        self._signatures = {}
+
+    def register(self, callback):
+        """Add `callback(name)`; called with the top-level entry name."""
+        self._callbacks.append(callback)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        if Observer is not None:
+            try:
+                observer = Observer()
+                observer.schedule(_EventHandler(self), str(self.root), recursive=True)
+                observer.daemon = True
+                observer.start()
+                self._observer = observer
+                logger.info("results watcher: watchdog observer on %s", self.root)
+            except Exception as exc:
+                logger.warning("results watcher: watchdog unavailable (%s), polling instead", exc)
+                self._observer = None
+        if self._observer is None:
+            self._signatures = self._scan()
+            logger.info("results watcher: polling %s every %ss", self.root, self.poll_interval)
+        self._thread = threading.Thread(target=self._run, name="results-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, join_timeout=3):
+        self._stop.set()
+        self._wake.set()
+        if self._observer is not None:
+            try:
+                self._observer.stop()
+                self._observer.join(timeout=join_timeout)
+            except Exception as exc:
+                logger.debug("results watcher observer stop failed: %s", exc)
+            self._observer = None
+        if self._thread is not None:
+            self._thread.join(timeout=join_timeout)
+            self._thread = None
+
+    def notify(self, name=None):
+        """Report a change made by the backend itself.
+
+        With a name, that entry is invalidated; without one, the next cycle
+        rescans every top-level entry (used after sync_from_remote, which
+        may touch any result).
+        """
+        with self._lock:
+            if name is None:
+                self._signatures = {}
+                for entry in self._entry_names():
+                    self._queue(entry)
+            else:
+                self._queue(name)
+            self._last_event = 0.0
+        self._wake.set()
+
+    def _entry_names(self):
+        try:
+            with os.scandir(self.root) as it:
+                return {entry.name for entry in it if not _ignored(entry.name)}
+        except OSError:
+            return set()
+
+    def _top_level_name(self, path):
+        try:
+            relative = os.path.relpath(path, self.root)
+        except ValueError:
+            return None
+        head = relative.split(os.sep, 1)[0]
+        if head in ("", ".", "..") or _ignored(head):
+            return None
+        return head
+
+    def _mark_path(self, path):
+        if os.path.basename(path).endswith(IGNORED_SUFFIXES):
+            return
+        name = self._top_level_name(path)
+        if name is None:
+            return
+        with self._lock:
+            self._queue(name)
+            self._last_event = time.monotonic()
+        self._wake.set()
+
+    def _queue(self, name):
+        # Caller holds self._lock.
+        if self._first_pending is None:
+            self._first_pending = time.monotonic()
+        self._pending.add(name)
+
+    def _scan(self):
+        signatures = {}
+        try:
+            entries = list(os.scandir(self.root))
+        except OSError:
+            return signatures
+        for entry in entries:
+            if _ignored(entry.name):
+                continue
+            try:
+                stat = entry.stat()
+                signature = [stat.st_size, stat.st_mtime_ns]
+                if entry.is_dir():
+                    with os.scandir(entry.path) as it:
+                        signature.extend(sorted((child.name, child.stat().st_mtime_ns) for child in it))
+            except OSError:
+                continue
+            signatures[entry.name] = signature
+        return signatures
+
+    def _poll(self):
+        current = self._scan()
+        with self._lock:
+            previous = self._signatures
+            self._signatures = current
+            for name in set(previous) | set(current):
+                if previous.get(name) != current.get(name):
+                    self._queue(name)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(timeout=DEBOUNCE_SECONDS if self._observer is not None else self.poll_interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            if self._observer is None:
+                self._poll()
+            with self._lock:
+                if not self._pending:
+                    continue
+                now = time.monotonic()
+                if (now - self._last_event < DEBOUNCE_SECONDS
+                        and now - self._first_pending < MAX_DELAY_SECONDS):
+                    continue
+                names, self._pending = self._pending, set()
+                self._first_pending = None
+            for name in sorted(names):
+                for callback in list(self._callbacks):
+                    try:
+                        callback(name)
+                    except Exception as exc:
+                        logger.warning("results watcher callback failed for %s: %s", name, exc)
+
+
+results_watcher = ResultsWatcher(RESULTS_DIR, settings.results_poll_interval)
@@ -93,6 +93,7 @@ function App() {
   const [configRef, setConfigRef] = useState(config); // Ref to access latest config in callbacks (Use state for reactivity if needed, or useRef)
   const configRefObj = React.useRef(config); // Renamed to avoid confusion with useState
   const [benchmarkRunning, setBenchmarkRunning] = useState(false);
+  const [resumableRuns, setResumableRuns] = useState([]);
   const [status, setStatus] = useState('');
   const [currentStage, setCurrentStage] = useState(null); // { stage: 'PD'|'VD', label: '...' }
   const currentStageRef = React.useRef(null);
@@ -331,6 +332,56 @@ function App() {
     return null;
   };
 
+  const loadResumableRuns = async () => {
+    try {
+      const res = await apiClient.get(apiUrl('/api/benchmark/resumable'));
+      if (res.data.success) {
+        setResumableRuns(res.data.data?.runs || []);
+      }
+    } catch (err) {
+      console.error('Loading resumable runs failed:', err);
+    }
+  };
+
+  const handleResumeTest = async (run) => {
+    try {
+      setAdvancedLogs([]);
+      let password = config.DUT_PASSWORD;
+      if (run.needs_password && !password) {
+        // The backend keeps no DUT passwords across restarts.
+        password = window.prompt(`SSH password for ${run.dut}`);
+        if (!password) return;
+      }
+      const response = await apiClient.post(apiUrl('/api/benchmark/resume'), {
+        dut: run.dut,
+        password: password || undefined
+      });
+      if (response.data.success) {
+        setStatus(response.data.data?.reattached
+          ? '✅ Reattached to the benchmark still running on ' + run.dut
+          : '✅ Benchmark resumed from its last completed cell');
+        setBenchmarkRunning(true);
+        setActiveRunId(response.data.data?.run_id || '');
+        setResumableRuns(runs => runs.filter(item => item.dut !== run.dut));
+        setError('');
+      }
+    } catch (err) {
+      const errorMsg = err.response?.data?.error || err.message;
+      setError('❌ Resuming benchmark failed: ' + errorMsg);
+    }
+  };
+
+  const handleDiscardResumable = async (run) => {
+    if (!window.confirm(`Discard the interrupted run on ${run.dut}? Its completed cells are not kept for resuming.`)) return;
+    try {
+      await apiClient.post(apiUrl(`/api/benchmark/resumable/${encodeURIComponent(run.dut)}/discard`));
+      setResumableRuns(runs => runs.filter(item => item.dut !== run.dut));
+    } catch (err) {
+      const errorMsg = err.response?.data?.error || err.message;
+      setError('❌ Discarding resumable run failed: ' + errorMsg);
+    }
+  };
+
   const handleSnapshot = async (data = {}) => {
     try {
       // 1. Save current UI state
@@ -397,7 +448,9 @@ function App() {
         windowWidth: document.documentElement.offsetWidth,
         windowHeight: document.documentElement.offsetHeight
       });
-      const imgData = canvas.toDataURL('image/png');
+      // Binary blob instead of a base64 data URL: ~33% smaller and streamed
+      // to disk by the backend rather than decoded in memory.
+      const blob = await new Promise(resolve => canvas.toBlob(resolve, 'image/png'));
 
       // 3. Restore original UI state
       if (stateChanged) {
@@ -406,12 +459,18 @@ function App() {
         setShowAdvancedLog(previousShowLog);
       }
 
-      const response = await apiClient.post(apiUrl('/api/benchmark/save_snapshot'), {
-        image: imgData,
-        test_name: data.test_name,
-        output_dir: data.output_dir,
-        session_id: data.session_id || 'default',
-        run_id: data.run_id || activeRunId || undefined
+      if (!blob) {
+        console.warn('Snapshot failed: canvas produced no image');
+        return;
+      }
+
+      const response = await apiClient.post(apiUrl('/api/benchmark/save_snapshot/upload'), blob, {
+        headers: { 'Content-Type': 'application/octet-stream' },
+        params: {
+          test_name: data.test_name,
+          output_dir: data.output_dir || undefined,
+          run_id: data.run_id || activeRunId || undefined
+        }
       });
 
       if (response.data.success) {
@@ -519,6 +578,11 @@ function App() {
   // Sync refs to avoid closure traps in socket listeners
   const updateRealTimeDataRef = React.useRef(updateRealTimeData);
   const handleSnapshotRef = React.useRef(handleSnapshot);
+  // Socket handlers are bound once per socket, so read the selection via a ref.
+  const selectedResultsRef = React.useRef(selectedResults);
+  // Runs on several DUTs share the session room; slot events carry run_id
+  // and dut, and only the followed run's events update this view.
+  const activeRunIdRef = React.useRef(activeRunId);
 
   useEffect(() => {
     configRefObj.current = config;
@@ -532,6 +596,10 @@ function App() {
     handleSnapshotRef.current = handleSnapshot;
   }, [handleSnapshot]);
 
+  useEffect(() => {
+    selectedResultsRef.current = selectedResults;
+  }, [selectedResults]);
+
   useEffect(() => {
     // Skip socket creation when the user has no API key configured.
     // The handshake would fail, socket.io-client would retry forever, and the
@@ -551,13 +619,20 @@ function App() {
       newSocket.emit('join_session', { session_id: sessionId });
     });
 
+    // Another DUT's run: its events must not touch this run's view.
+    const fromOtherRun = (data) => Boolean(
+      data && data.run_id && activeRunIdRef.current && data.run_id !== activeRunIdRef.current
+    );
+
     newSocket.on('connect_error', (err) => {
       setError(`🔐 ${err?.message || 'Socket connection failed. Check the API key and allowed origin settings.'}`);
     });
 
     newSocket.on('status', (data) => {
+      if (fromOtherRun(data)) return;
       setStatus(`[${data.timestamp}] ${data.message}`);
       if (data.run_id) {
+        activeRunIdRef.current = data.run_id;
         setActiveRunId(data.run_id);
       }
       if (data.status === 'completed' || data.status === 'failed' || data.status === 'stopped') {
@@ -565,6 +640,7 @@ function App() {
         setCurrentStage(null);
         currentStageRef.current = null;
         setStuckDevices([]);
+        activeRunIdRef.current = '';
         setActiveRunId('');
       } else if (data.status === 'started') {
         setBenchmarkRunning(true);
@@ -579,10 +655,12 @@ function App() {
     });
 
     newSocket.on('progress_update', (data) => {
+      if (fromOtherRun(data)) return;
       setProgress(data);
     });
 
     newSocket.on('status_update', (data) => {
+      if (fromOtherRun(data)) return;
       setCurrentStage({ stage: data.stage, label: data.label });
       currentStageRef.current = { stage: data.stage, label: data.label };
       // If benchmark started while we were on config tab, maybe we should switch?
@@ -590,10 +668,12 @@ function App() {
     });
 
     newSocket.on('run_status_update', (data) => {
+      if (fromOtherRun(data)) return;
       setRunStatus(data.status.toUpperCase());
     });
 
     newSocket.on('device_stuck', (data) => {
+      if (fromOtherRun(data)) return;
       setStuckDevices(prev => {
         if (prev.some(d => d.device === data.device)) return prev;
         return [...prev, { device: data.device, timestamp: data.timestamp }];
@@ -601,27 +681,46 @@ function App() {
     });
 
     newSocket.on('device_unstuck', (data) => {
+      if (fromOtherRun(data)) return;
       setStuckDevices(prev => prev.filter(d => d.device !== data.device));
     });
 
     newSocket.on('giostat_data_v2', (data) => {
+      if (fromOtherRun(data)) return;
       if (updateRealTimeDataRef.current) {
         updateRealTimeDataRef.current(data);
       }
     });
 
     newSocket.on('giostat_data', (data) => {
+      if (fromOtherRun(data)) return;
       console.log('Got raw giostat data:', data);
     });
 
     // Listen for snapshot trigger
     newSocket.on('snapshot_request', (data) => {
+      if (fromOtherRun(data)) return;
       if (handleSnapshotRef.current) {
         handleSnapshotRef.current(data);
       }
     });
 
+    // Archived results extract their images in the background; refresh the
+    // gallery once the job for the selected result finishes.
+    newSocket.on('result_images_ready', async (data) => {
+      if (!data || data.result_name !== selectedResultsRef.current[0]) return;
+      try {
+        const res = await apiClient.get(apiUrl(`/api/results/${data.result_name}/images`));
+        if (res.data.success) {
+          setReportImages(res.data.images);
+        }
+      } catch (err) {
+        console.error('Failed to refresh result images:', err);
+      }
+    });
+
     newSocket.on('bench_log', (data) => {
+      if (fromOtherRun(data)) return;
       // Sniff FIO status-interval lines
       if (data.line.includes('Jobs:') && data.line.toLowerCase().includes('eta')) {
         setFioStatus(data.line);
@@ -714,6 +813,8 @@ function App() {
       if (status && status.running) {
         setActiveTab('benchmark');
         fetchLogs();
+      } else {
+        loadResumableRuns();
       }
     };
 
@@ -751,6 +852,7 @@ function App() {
   }, [config]);
 
   useEffect(() => {
+    activeRunIdRef.current = activeRunId;
     if (activeRunId) {
       localStorage.setItem('activeRunId', activeRunId);
     } else {
@@ -881,6 +983,39 @@ function App() {
     }
   };
 
+  const handleQueueTest = async () => {
+    const processedConfig = processArrayFields(config);
+    const errors = validateConfig(processedConfig);
+    setValidationErrors(errors);
+
+    if (errors.length > 0) {
+      setError('❌ Configuration validation failed. Please fix the errors below.');
+      return;
+    }
+
+    try {
+      const response = await apiClient.post(apiUrl('/api/queue'), {
+        config: processedConfig
+      });
+      if (response.data.success) {
+        const entry = response.data.data?.entry;
+        if (entry?.status === 'running') {
+          setAdvancedLogs([]);
+          setStatus('✅ Benchmark started');
+          setBenchmarkRunning(true);
+          setActiveRunId(entry.run_id || '');
+        } else {
+          setStatus('🕒 Benchmark queued; it starts when the current run finishes');
+        }
+        setError('');
+        setValidationErrors([]);
+      }
+    } catch (err) {
+      const errorMsg = err.response?.data?.error || err.message;
+      setError('❌ Queueing benchmark failed: ' + errorMsg);
+    }
+  };
+
   const handleStopTest = async () => {
     try {
       const response = await apiClient.post(apiUrl('/api/benchmark/stop'), {
@@ -971,6 +1106,10 @@ function App() {
       const response = await apiClient.get(apiUrl('/api/results'));
       if (response.data.success) {
         setResults(response.data.data);
+        // The backend is still (re)building its catalog; ask again shortly.
+        if (response.data.building) {
+          setTimeout(loadResults, 3000);
+        }
       }
     } catch (err) {
       setError('Loading results failed: ' + err.message);
@@ -1799,6 +1938,8 @@ function App() {
                           { key: 'RUN_MD', label: 'Run MD Test' },
                           { key: 'RUN_PD_ALL', label: 'Test All PDs' },
                           { key: 'USE_BENCH_FIO', label: '⚡ Use bench-fio' },
+                          { key: 'STEADY_STATE', label: 'Stop at Steady State' },
+                          { key: 'ADAPTIVE_SWEEP', label: 'Adaptive QD Sweep' },
                         ].map(sw => (
                           <label key={sw.key} className="switch-label">
                             <input
@@ -1929,6 +2070,17 @@ function App() {
                               placeholder="10"
                             />
                           </div>
+                          {/* Repeat iterations per cell */}
+                          <div className="form-group">
+                            <label>Iterations per cell:</label>
+                            <input
+                              type="number"
+                              min="1"
+                              value={config.ITERATIONS ?? 1}
+                              onChange={(e) => handleConfigChange('ITERATIONS', Math.max(1, parseInt(e.target.value) || 1))}
+                              placeholder="1"
+                            />
+                          </div>
                         </div>
                       </div>
                       )}
@@ -2048,7 +2200,16 @@ function App() {
                     </div>
                     <div className="progress-time">
                       <span>Elapsed: {formatTime(progress.elapsed)}</span>
-                      <span>Remaining: {formatTime(progress.remaining)}</span>
+                      <span
+                        title={progress.phases
+                          ? Object.entries(progress.phases)
+                              .filter(([, seconds]) => seconds > 0)
+                              .map(([phase, seconds]) => `${phase}: ${formatTime(seconds)}`)
+                              .join('\n')
+                          : undefined}
+                      >
+                        Remaining: {formatTime(progress.remaining)}
+                      </span>
                     </div>
                   </div>
                   <div className="progress-bar-container">
@@ -2067,6 +2228,32 @@ function App() {
                 >
                   ▶️ Start Benchmark
                 </button>
+                <button
+                  className="btn btn-secondary"
+                  onClick={handleQueueTest}
+                  disabled={validateConfig(processArrayFields(config)).length > 0}
+                  title="Run after the current benchmark (and any earlier queued runs) finish"
+                >
+                  🕒 Add to Queue
+                </button>
+                {!benchmarkRunning && resumableRuns.map(run => (
+                  <React.Fragment key={run.dut}>
+                    <button
+                      className="btn btn-primary"
+                      onClick={() => handleResumeTest(run)}
+                      title={`Interrupted ${run.interrupted_at} (${run.reason}); completed cells are skipped${run.needs_password ? '; needs the DUT password' : ''}`}
+                    >
+                      ⏯️ Resume {run.config?.NVME_INFO || 'run'} on {run.dut}
+                    </button>
+                    <button
+                      className="btn btn-secondary"
+                      onClick={() => handleDiscardResumable(run)}
+                      title="Forget this interrupted run; queued runs for this DUT wait until it is resumed or discarded"
+                    >
+                      ✖️ Discard
+                    </button>
+                  </React.Fragment>
+                ))}
                 <button
                   className="btn btn-danger"
                   onClick={handleStopTest}
@@ -2157,7 +2344,7 @@ function App() {
                   >
                     <option value="">-- Select Result --</option>
                     {results.map((r, i) => (
-                      <option key={i} value={r.name}>{r.name} ({r.created})</option>
+                      <option key={i} value={r.name}>{r.name} ({r.created}){r.partial ? ' [in progress]' : ''}</option>
                     ))}
                   </select>
 
@@ -2286,7 +2473,7 @@ function App() {
                           }).map((img, idx) => (
                             <div key={idx} className="gallery-item">
                               <img
-                                src={`${API_BASE_URL}${img.url}`}
+                                src={`${API_BASE_URL}${img.thumb_url || img.url}`}
                                 alt={img.name}
                                 loading="lazy"
                                 onClick={() => window.open(`${API_BASE_URL}${img.url}`, '_blank')}
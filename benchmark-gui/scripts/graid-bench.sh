@@ -294,7 +294,11 @@ function get_basic_para() {
         . graid-bench-advanced.conf
     fi
     
-    . graid-bench.conf
+    # GRAID_BENCH_CONF: the backend writes one conf per run slot and points
+    # every script at it, so concurrent slots never source each other's.
+    GRAID_BENCH_CONF=${GRAID_BENCH_CONF:-./graid-bench.conf}
+    export GRAID_BENCH_CONF
+    . "$GRAID_BENCH_CONF"
 
     # Initialize missing variables with defaults if not set in config
     export SCAN=${SCAN:-"false"}
@@ -323,7 +327,44 @@ function get_basic_para() {
     # USE_BENCH_FIO: set to "true" to use bench-fio for main test runs,
     # "false" to fall back to direct fio job files (legacy mode).
     USE_BENCH_FIO=${USE_BENCH_FIO:-true}
-    export FIO_MODES FIO_BLOCK_SIZES FIO_IODEPTH FIO_NUMJOBS FIO_ENGINE FIO_RWMIX FIO_DIRECT FIO_EXTRA_OPTS USE_BENCH_FIO
+    # ITERATIONS: repeat each bench-fio cell N times; fio_parser reports
+    # mean/stddev/min/max/CI95 across the repeats.
+    ITERATIONS=${ITERATIONS:-1}
+    # STEADY_STATE: end bench-fio cells and the sustain write once IOPS
+    # settle instead of always running the full runtime (runtime becomes
+    # the cap). Sustain uses the SNIA range/slope window in
+    # src/steady_state.py; cells use fio's own steadystate= option.
+    STEADY_STATE=${STEADY_STATE:-false}
+    SS_WINDOW=${SS_WINDOW:-5}
+    SS_INTERVAL=${SS_INTERVAL:-60}
+    SS_RANGE_PCT=${SS_RANGE_PCT:-20}
+    SS_SLOPE_PCT=${SS_SLOPE_PCT:-10}
+    SS_MAX_SUSTAIN=${SS_MAX_SUSTAIN:-7200}
+    SS_CELL_CRITERION=${SS_CELL_CRITERION:-iops_slope:0.3%}
+    SS_CELL_DURATION=${SS_CELL_DURATION:-30}
+    # SS_CELL_MAX_RUNTIME: cap (seconds) for a steady-state cell; empty
+    # keeps RUN_TIME as the cap.
+    SS_CELL_MAX_RUNTIME=${SS_CELL_MAX_RUNTIME:-}
+    export FIO_MODES FIO_BLOCK_SIZES FIO_IODEPTH FIO_NUMJOBS FIO_ENGINE FIO_RWMIX FIO_DIRECT FIO_EXTRA_OPTS USE_BENCH_FIO ITERATIONS
+    # ADAPTIVE_SWEEP: per (mode, bs, numjobs) let src/adaptive_sweep.py
+    # choose queue depths around the IOPS/latency knee instead of running
+    # every FIO_IODEPTH value. ADAPTIVE_BUDGET (seconds, 0 = none) caps
+    # each sweep.
+    ADAPTIVE_SWEEP=${ADAPTIVE_SWEEP:-false}
+    ADAPTIVE_GAIN_PCT=${ADAPTIVE_GAIN_PCT:-10}
+    ADAPTIVE_BUDGET=${ADAPTIVE_BUDGET:-0}
+    export ADAPTIVE_SWEEP ADAPTIVE_GAIN_PCT ADAPTIVE_BUDGET
+    export STEADY_STATE SS_WINDOW SS_INTERVAL SS_RANGE_PCT SS_SLOPE_PCT SS_MAX_SUSTAIN SS_CELL_CRITERION SS_CELL_DURATION SS_CELL_MAX_RUNTIME
+    # STAGING_DIR: results collect here until they are packaged. The backend
+    # sets STAGING_KEY (one per DUT) so runs of two DUTs with the same SSD
+    # model stay apart once synced into one results dir.
+    export STAGING_KEY
+    STAGING_DIR="../results/.test-temp-data/${STAGING_KEY:+$STAGING_KEY/}$NVME_INFO-result"
+    # RESUME: continue an interrupted run in its .test-temp-data dir;
+    # bench.sh skips cells and invocations already marked in CHECKPOINT_DIR.
+    RESUME=${RESUME:-false}
+    CHECKPOINT_DIR="$STAGING_DIR/.checkpoints"
+    export RESUME CHECKPOINT_DIR
     timestamp=$(date '+%Y-%m-%d-%s')
     result="$NVME_INFO-result"
     killall -q atop fio
@@ -409,9 +450,12 @@ main() {
         B_CNT=$(( ${#FIO_BLOCK_SIZES[@]} > 0 ? ${#FIO_BLOCK_SIZES[@]} : 1 ))
         Q_CNT=$(( ${#FIO_IODEPTH[@]} > 0 ? ${#FIO_IODEPTH[@]} : 1 ))
         J_CNT=$(( ${#FIO_NUMJOBS[@]} > 0 ? ${#FIO_NUMJOBS[@]} : 1 ))
-        WL_COUNT_VD=$(( M_CNT * B_CNT * Q_CNT * J_CNT ))
+        WL_COUNT_VD=$(( M_CNT * B_CNT * Q_CNT * J_CNT * ${ITERATIONS:-1} ))
         WL_COUNT_PD=$WL_COUNT_VD
     else
+        if [[ ${ITERATIONS:-1} -gt 1 ]]; then
+            log_info "ITERATIONS=$ITERATIONS only applies to bench-fio runs; legacy fio-loop runs each cell once"
+        fi
         if [[ "$QUICK_TEST" == "true" ]]; then
             WL_COUNT_VD=4
             if [[ "$DUMMY" == "true" ]]; then WL_COUNT_PD=4; else WL_COUNT_PD=7; fi
@@ -462,6 +506,14 @@ main() {
         done
     fi
     
+    if [[ "$RESUME" == "true" ]]; then
+        DONE_CELLS=$(find "$CHECKPOINT_DIR/cells" -name '*.done' 2>/dev/null | wc -l)
+        log_info "RESUME: $DONE_CELLS cells already completed in $STAGING_DIR"
+        TOTAL_BENCH_STEPS=$(( TOTAL_BENCH_STEPS > DONE_CELLS ? TOTAL_BENCH_STEPS - DONE_CELLS : 0 ))
+    else
+        rm -rf "$CHECKPOINT_DIR"
+    fi
+
     log_info "STATUS: TOTAL_STEPS: $TOTAL_BENCH_STEPS"
     bash src/est_time.sh
     
@@ -594,6 +646,7 @@ main() {
     #pip3 install pandas
     #pip3 install pathlib
     #python3 parser.py
+    log_info "STATUS: STATE: PARSING"
     python_paser
     bash ./src/graid-log-collector.sh -y -U
 
@@ -605,7 +658,7 @@ main() {
     KERNEL_VER=$(uname -r)
     OS_INFO=$(cat /etc/os-release | grep "PRETTY_NAME" | cut -d= -f2 | tr -d '"')
     
-    cat <<EOF > "../results/.test-temp-data/$NVME_INFO-result/system_info.json"
+    cat <<EOF > "$STAGING_DIR/system_info.json"
 {
     "graid_version": "$GRAID_VER",
     "os_info": "$OS_INFO",
@@ -614,20 +667,28 @@ main() {
 }
 EOF
     
+    rm -rf "$CHECKPOINT_DIR"
+
     # Create the archive with files from different locations but clean paths
     # We use -C to change directory context for specific items
-    tar czf "$tar_name" ./graid_log_* ./output.log -C "../results/.test-temp-data" "$NVME_INFO-result"
+    tar czf "$tar_name" ./graid_log_* ./output.log -C "$(dirname "$STAGING_DIR")" "$NVME_INFO-result"
 
     echo "Moving results to ../results/"
     mv "$tar_name" ../results/
-    rm -rf "../results/.test-temp-data/$NVME_INFO-result" ./graid_log_* ./output.log
+    # Tells the backend which archive this run produced (before output.log,
+    # which a recovered backend follows, is removed).
+    log_info "STATUS: RESULT: $tar_name"
+    rm -rf "$STAGING_DIR" ./graid_log_* ./output.log
+    if [[ -n "$STAGING_KEY" ]]; then
+        rmdir "$(dirname "$STAGING_DIR")" 2>/dev/null
+    fi
 }
 
 python_paser(){
     PYTHON_SCRIPT="src/fio_parser.py"
     timestamp=$(date '+%Y-%m-%d')
     # Point parser to the hidden temporary results directory
-    result_path="../results/.test-temp-data/$NVME_INFO-result"
+    result_path="$STAGING_DIR"
     
     python3 $PYTHON_SCRIPT "$result_path"
 
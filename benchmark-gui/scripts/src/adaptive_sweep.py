@@ -0,0 +1,202 @@
+"""Adaptive queue-depth sweep: pick the next QD around the IOPS/latency knee.
+
+With ADAPTIVE_SWEEP=true, bench.sh does not run every FIO_IODEPTH value of
+a (mode, block size, numjobs) cell. It asks this script which QD to run
+next and stops when the script answers DONE:
+
+    python3 src/adaptive_sweep.py <fio_dir> <mode> <bs> <numjobs> \
+        --qd-min 1 --qd-max 256 --gain-pct 10
+
+The points measured so far are read from bench-fio's output under
+<fio_dir> (<device>/<bs>/<mode>-<qd>-<nj>.json, IOPS summed and latency
+averaged across devices). The sweep
+
+  1. climbs a coarse ladder (powers of 4 from qd-min, plus qd-max) until
+     the knee shows up: the first step whose IOPS gain per QD doubling is
+     below `--gain-pct` % while mean latency still rises;
+  2. bisects (geometrically, on powers of two) the intervals on both sides
+     of the knee point until neighbouring QDs are adjacent powers of two.
+
+Output is one line: `NEXT <qd>`, or `DONE knee=<qd> peak=<qd>` after the
+sweep summary has been merged into <fio_dir>/adaptive-sweep.json.
+
+bench.sh passes the QDs it already ran in `--attempted`. A QD that would
+come up again (it ran but left no JSON, e.g. fio failed) ends the sweep
+with reason `error` instead of being retried forever.
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+from pathlib import Path
+
+SUMMARY_NAME = "adaptive-sweep.json"
+
+
+def _job_metrics(path):
+    try:
+        with open(path) as fh:
+            jobs = json.load(fh).get("jobs", [])
+    except (OSError, ValueError):
+        return None
+    if not jobs:
+        return None
+    iops = 0.0
+    latencies = []
+    for job in jobs:
+        for direction in ("read", "write"):
+            stats = job.get(direction, {})
+            iops += stats.get("iops", 0.0)
+            lat = stats.get("lat_ns", stats.get("clat_ns", {})).get("mean", 0.0)
+            if stats.get("iops"):
+                latencies.append(lat / 1000.0)
+    return iops, latencies
+
+
+def measured_points(fio_dir, mode, bs, numjobs):
+    """Return {qd: (iops, mean_latency_us)} from bench-fio output."""
+    per_qd = {}
+    pattern = f"{mode}-*-{numjobs}.json"
+    for path in Path(fio_dir).rglob(pattern):
+        rel = path.relative_to(fio_dir)
+        if path.parent.name != bs or any(part.startswith(".") for part in rel.parts):
+            continue
+        try:
+            qd = int(path.stem.split("-")[-2])
+        except (IndexError, ValueError):
+            continue
+        metrics = _job_metrics(path)
+        if metrics is None:
+            continue
+        iops, latencies = per_qd.setdefault(qd, [0.0, []])
+        per_qd[qd][0] = iops + metrics[0]
+        latencies.extend(metrics[1])
+    return {
+        qd: (iops, sum(latencies) / len(latencies) if latencies else 0.0)
+        for qd, (iops, latencies) in per_qd.items()
+    }
+
+
+def coarse_ladder(qd_min, qd_max):
+    ladder = []
+    qd = qd_min
+    while qd < qd_max:
+        ladder.append(qd)
+        qd *= 4
+    ladder.append(qd_max)
+    return ladder
+
+
+def find_knee(points, gain_pct):
+    """Return the index (into sorted QDs) of the knee point, or None."""
+    qds = sorted(points)
+    for i in range(1, len(qds)):
+        iops_a, lat_a = points[qds[i - 1]]
+        iops_b, lat_b = points[qds[i]]
+        if iops_a <= 0:
+            continue
+        # Normalise to the gain per QD doubling so coarse (4x) and refined
+        # (2x) steps are judged alike.
+        doublings = math.log2(qds[i] / qds[i - 1])
+        gain = ((iops_b / iops_a) ** (1 / doublings) - 1) * 100
+        if gain < gain_pct and lat_b > lat_a:
+            return i - 1
+    return None
+
+
+def _midpoint(low, high):
+    """Power of two strictly between low and high, nearest the geometric mean."""
+    candidates = [2 ** e for e in range(int(math.log2(low)) + 1, int(math.log2(high)) + 1)
+                  if low < 2 ** e < high]
+    if not candidates:
+        return None
+    target = math.sqrt(low * high)
+    return min(candidates, key=lambda qd: abs(math.log2(qd) - math.log2(target)))
+
+
+def next_qd(points, qd_min, qd_max, gain_pct):
+    """Return (next_qd, knee_qd). next_qd is None when the sweep is done."""
+    qds = sorted(points)
+    knee = find_knee(points, gain_pct)
+    if knee is None:
+        for qd in coarse_ladder(qd_min, qd_max):
+            if qd not in points:
+                return qd, None
+        # Never flattened: the highest QD is both knee and peak.
+        return None, qds[-1] if qds else None
+    # Refine both sides of the knee point.
+    for low, high in ((knee - 1, knee), (knee, knee + 1)):
+        if low < 0 or high >= len(qds):
+            continue
+        mid = _midpoint(qds[low], qds[high])
+        if mid is not None and mid not in points:
+            return mid, qds[knee]
+    return None, qds[knee]
+
+
+def write_summary(fio_dir, mode, bs, numjobs, points, knee, reason):
+    path = Path(fio_dir) / SUMMARY_NAME
+    try:
+        summary = json.loads(path.read_text())
+    except (OSError, ValueError):
+        summary = {}
+    peak = max(points, key=lambda qd: points[qd][0]) if points else None
+    summary[f"{mode}-{bs}-{numjobs}"] = {
+        "mode": mode,
+        "block_size": bs,
+        "numjobs": numjobs,
+        "knee_qd": knee,
+        "peak_qd": peak,
+        "stop_reason": reason,
+        "points": [
+            {"qd": qd, "iops": round(points[qd][0], 2), "lat_us": round(points[qd][1], 2)}
+            for qd in sorted(points)
+        ],
+    }
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(summary, indent=2))
+    os.replace(tmp, path)
+    return peak
+
+
+def _qd_list(value):
+    return {int(qd) for qd in value.replace(",", " ").split() if qd.strip()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("fio_dir")
+    parser.add_argument("mode")
+    parser.add_argument("bs")
+    parser.add_argument("numjobs")
+    parser.add_argument("--qd-min", type=int, default=1)
+    parser.add_argument("--qd-max", type=int, default=256)
+    parser.add_argument("--gain-pct", type=float, default=10.0,
+                        help="IOPS gain per QD doubling below which the curve is flat")
+    parser.add_argument("--finish", metavar="REASON",
+                        help="record the sweep as stopped for REASON (e.g. budget) and print DONE")
+    parser.add_argument("--attempted", type=_qd_list, default=set(), metavar="QD,...",
+                        help="QDs already run; asking for one of them again ends the sweep (error)")
+    args = parser.parse_args(argv)
+
+    qd_min = max(1, args.qd_min)
+    qd_max = max(qd_min, args.qd_max)
+    points = measured_points(args.fio_dir, args.mode, args.bs, args.numjobs)
+    qd, knee = next_qd(points, qd_min, qd_max, args.gain_pct)
+    finish = args.finish
+    if qd is not None and qd in args.attempted and not finish:
+        print(f"QD {qd} was run but produced no result", file=sys.stderr)
+        finish = "error"
+    if qd is not None and not finish:
+        print(f"NEXT {qd}")
+        return 0
+    reason = finish or ("knee" if find_knee(points, args.gain_pct) is not None else "qd_max")
+    peak = write_summary(args.fio_dir, args.mode, args.bs, args.numjobs, points, knee, reason)
+    print(f"DONE knee={knee} peak={peak} reason={reason}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
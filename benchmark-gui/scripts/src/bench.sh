@@ -18,7 +18,7 @@ log_info() {
     echo "[$(date '+%Y-%m-%d %H:%M:%S')] $@"
 }
 
-. graid-bench.conf
+. "${GRAID_BENCH_CONF:-./graid-bench.conf}"
 trap cleanup INT TERM EXIT
 
 SNAPSHOT_COUNT=0
@@ -396,7 +396,7 @@ function output_name_dic() {
     # graid-a2000-ntfs-1vd-12pd-randread-j32b4kd32
     timestamp=$(date '+%Y-%m-%d')
     # Use hidden directory for temporary/active test data
-    result=".test-temp-data/$NVME_INFO-result"
+    result=".test-temp-data/${STAGING_KEY:+$STAGING_KEY/}$NVME_INFO-result"
     out_dir=../results/$result/$NVME_INFO/${STAG}/${DEV_NAME}
     mkdir -p ${out_dir}
     out_dir_tmp=../results/$result/$NVME_INFO/
@@ -644,6 +644,10 @@ function prestat() {
     vid=$(echo $vid | tr -d '[:space:]')
     if [[ $DUMMY == "false" ]]; then
         sustain_time=3600
+        if [[ "$STEADY_STATE" == "true" ]]; then
+            # steady_state.py usually ends sustain well before the cap.
+            sustain_time=${SS_MAX_SUSTAIN:-7200}
+        fi
         #Micron 7450
         tvid="0x1344"
         local common_args="--size=${runsize}g --offset_increment=${runsize}g --iodepth=${IODEPTH:-1} --status-interval=60"
@@ -703,8 +707,10 @@ function prestat() {
         log_info "STATUS: STATE: SUSTAINING"
         log_info "STATUS: WORKLOAD: Sustain Write"
         if [[ "$DEV_NAME" != "PD" ]]; then
-            fio src/fio-loop/09-randwrite-graid --filename="/dev/$FIO_NAME" --runtime=$sustain_time --numjobs="$CPUJOBS" --cpus_allowed="$CPU_ALLOWED_SEQ" --status-interval=60 --iodepth=${IODEPTH} --output="$out_dir/$OUTPUT_NAME-sustain.log" &
+            local sustain_log="$out_dir/$OUTPUT_NAME-sustain.log"
+            fio src/fio-loop/09-randwrite-graid --filename="/dev/$FIO_NAME" --runtime=$sustain_time --numjobs="$CPUJOBS" --cpus_allowed="$CPU_ALLOWED_SEQ" --iodepth=${IODEPTH} $(sustain_output_args "$sustain_log") &
             fio_pid=$!
+            watch_steady_state $fio_pid "$sustain_log"
             
             # Use polling instead of static sleep
             if (( sustain_time > 15 )); then
@@ -712,7 +718,10 @@ function prestat() {
                 start_wait=$(date +%s)
                 while (( $(date +%s) - start_wait < wait_time )); do
                     if ! kill -0 $fio_pid 2>/dev/null; then
-                        log_info "WARNING: fio sustain process ended early."
+                        wait_steady_state
+                        if ! stopped_at_steady_state "$sustain_log"; then
+                            log_info "WARNING: fio sustain process ended early."
+                        fi
                         break
                     fi
                     sleep 10
@@ -723,6 +732,7 @@ function prestat() {
             
             trigger_snapshot "${OUTPUT_NAME}-${STAG}-sustain" "${fio_dir:-$out_dir}"
             wait $fio_pid
+            wait_steady_state
             sleep 2
         elif [[ "$DEV_NAME" == "PD" ]]; then
             if [[ $RUN_PD_ALL == "true" ]]; then
@@ -731,12 +741,16 @@ function prestat() {
                 for PD_NAME in "${NVME_LIST[@]}"; do
                     printf "[${PD_NAME}]\nfilename=/dev/${PD_NAME}\n" >> tfie
                 done
-                fio tfie --runtime=$sustain_time --numjobs=8 --iodepth=${IODEPTH} --status-interval=60 --output="$result/$OUTPUT_NAME-PD_ALL-sustain.log" &
+                local sustain_log="$result/$OUTPUT_NAME-PD_ALL-sustain.log"
+                fio tfie --runtime=$sustain_time --numjobs=8 --iodepth=${IODEPTH} $(sustain_output_args "$sustain_log") &
                 fio_pid=$!
+                watch_steady_state $fio_pid "$sustain_log"
                 rm -rf tfie
             else
-                fio "$src_path/09-randwrite-graid" --filename=/dev/"$PD_NAME" --runtime=$sustain_time --numjobs=8 --iodepth=${IODEPTH} --status-interval=60 --output="$out_dir/$OUTPUT_NAME-$PD_NAME-sustain.log" &
+                local sustain_log="$out_dir/$OUTPUT_NAME-$PD_NAME-sustain.log"
+                fio "$src_path/09-randwrite-graid" --filename=/dev/"$PD_NAME" --runtime=$sustain_time --numjobs=8 --iodepth=${IODEPTH} $(sustain_output_args "$sustain_log") &
                 fio_pid=$!
+                watch_steady_state $fio_pid "$sustain_log"
             fi
             
             # Use polling instead of static sleep
@@ -745,7 +759,10 @@ function prestat() {
                 start_wait=$(date +%s)
                 while (( $(date +%s) - start_wait < wait_time )); do
                     if ! kill -0 $fio_pid 2>/dev/null; then
-                        log_info "WARNING: fio sustain process ended early."
+                        wait_steady_state
+                        if ! stopped_at_steady_state "$sustain_log"; then
+                            log_info "WARNING: fio sustain process ended early."
+                        fi
                         break
                     fi
                     sleep 10
@@ -756,6 +773,7 @@ function prestat() {
             
             trigger_snapshot "${OUTPUT_NAME}-${STAG}-sustain" "${fio_dir:-$out_dir}"
             wait $fio_pid
+            wait_steady_state
             sleep 2
         fi
     fi
@@ -765,8 +783,10 @@ function prestat() {
         log_info "STATUS: STATE: SUSTAINING"
         log_info "STATUS: WORKLOAD: Sustain Write"
         if [[ "$DEV_NAME" != "PD" ]]; then
-            fio src/fio-loop/09-randwrite-graid --filename="/dev/$FIO_NAME" --runtime=$sustain_time --numjobs="$CPUJOBS" --cpus_allowed="$CPU_ALLOWED_SEQ" --iodepth=${IODEPTH:-1} --status-interval=60 --output="$out_dir/$OUTPUT_NAME-sustain.log" &
+            local sustain_log="$out_dir/$OUTPUT_NAME-sustain.log"
+            fio src/fio-loop/09-randwrite-graid --filename="/dev/$FIO_NAME" --runtime=$sustain_time --numjobs="$CPUJOBS" --cpus_allowed="$CPU_ALLOWED_SEQ" --iodepth=${IODEPTH:-1} $(sustain_output_args "$sustain_log") &
             fio_pid=$!
+            watch_steady_state $fio_pid "$sustain_log"
             
             # Use polling instead of static sleep
             if (( sustain_time > 15 )); then
@@ -774,7 +794,10 @@ function prestat() {
                 start_wait=$(date +%s)
                 while (( $(date +%s) - start_wait < wait_time )); do
                     if ! kill -0 $fio_pid 2>/dev/null; then
-                        log_info "WARNING: fio sustain process ended early."
+                        wait_steady_state
+                        if ! stopped_at_steady_state "$sustain_log"; then
+                            log_info "WARNING: fio sustain process ended early."
+                        fi
                         break
                     fi
                     sleep 10
@@ -785,6 +808,7 @@ function prestat() {
             
             trigger_snapshot "${OUTPUT_NAME}-${STAG}-sustain" "${fio_dir:-$out_dir}"
             wait $fio_pid
+            wait_steady_state
             sleep 2
         elif [[ "$DEV_NAME" == "PD" ]]; then
             if [[ $RUN_PD_ALL == "true" ]]; then
@@ -793,10 +817,18 @@ function prestat() {
                 for PD_NAME in "${NVME_LIST[@]}"; do
                     printf "[${PD_NAME}]\nfilename=/dev/${PD_NAME}\n" >> tfie
                 done
-                fio tfie --runtime=$sustain_time --numjobs=8 --iodepth=${IODEPTH:-1} --status-interval=60 --output="$result/$OUTPUT_NAME-PD_ALL-sustain.log"
+                fio tfie --runtime=$sustain_time --numjobs=8 --iodepth=${IODEPTH:-1} $(sustain_output_args "$result/$OUTPUT_NAME-PD_ALL-sustain.log") &
+                fio_pid=$!
+                watch_steady_state $fio_pid "$result/$OUTPUT_NAME-PD_ALL-sustain.log"
+                wait $fio_pid
+                wait_steady_state
                 rm -rf tfie
             else
-                fio "$src_path/09-randwrite-graid" --filename=/dev/"$PD_NAME" --runtime=$sustain_time --numjobs=8 --iodepth=${IODEPTH:-1} --status-interval=60 --output="$out_dir/$OUTPUT_NAME-$PD_NAME-sustain.log"
+                fio "$src_path/09-randwrite-graid" --filename=/dev/"$PD_NAME" --runtime=$sustain_time --numjobs=8 --iodepth=${IODEPTH:-1} $(sustain_output_args "$out_dir/$OUTPUT_NAME-$PD_NAME-sustain.log") &
+                fio_pid=$!
+                watch_steady_state $fio_pid "$out_dir/$OUTPUT_NAME-$PD_NAME-sustain.log"
+                wait $fio_pid
+                wait_steady_state
             fi
         fi
     fi
@@ -805,6 +837,47 @@ function prestat() {
 }
 
 
+# fio output arguments for a sustain run logging to <log_file>. With
+# STEADY_STATE=true fio writes its text and JSON reports every SS_INTERVAL
+# seconds to <log_file>.fiostatus; watch_steady_state follows the JSON and
+# steady_state.py copies the text reports to <log_file> once fio exits.
+function sustain_output_args() {
+    local log_file=$1
+    if [[ "$STEADY_STATE" == "true" ]]; then
+        echo "--status-interval=${SS_INTERVAL:-60} --output-format=normal,json --output=${log_file%.log}.fiostatus"
+    else
+        echo "--status-interval=60 --output=$log_file"
+    fi
+}
+
+# Run src/steady_state.py against fio <pid>; it stops fio once IOPS meet
+# the SNIA range/slope criteria over SS_WINDOW rounds. Sets ss_pid.
+function watch_steady_state() {
+    local pid=$1
+    local log_file=$2
+    ss_pid=""
+    if [[ "$STEADY_STATE" == "true" ]]; then
+        python3 src/steady_state.py "${log_file%.log}.fiostatus" $pid --text-log "$log_file" \
+            --window ${SS_WINDOW:-5} --range-pct ${SS_RANGE_PCT:-20} --slope-pct ${SS_SLOPE_PCT:-10} \
+            | while read -r line; do log_info "$line"; done &
+        ss_pid=$!
+    fi
+}
+
+function wait_steady_state() {
+    if [[ -n "$ss_pid" ]]; then
+        wait $ss_pid
+        ss_pid=""
+    fi
+}
+
+# Whether steady_state.py ended the sustain run logging to <log_file>
+# because IOPS settled, rather than fio stopping on its own.
+function stopped_at_steady_state() {
+    local log_file=$1
+    grep -q '"reason": "steady_state"' "${log_file%.log}-steady-state.json" 2>/dev/null
+}
+
 function kill_pid(){
     kill -9 $1 >/dev/null 2>&1
     wait $1 2>/dev/null
@@ -959,6 +1032,16 @@ function run_task(){
                 bench_extra_space="${bench_extra_space} cpus_allowed=$cpu"
             fi
 
+            # STEADY_STATE: fio ends each cell once its IOPS settle
+            # (SS_CELL_CRITERION over SS_CELL_DURATION seconds); the runtime
+            # stays the cap unless SS_CELL_MAX_RUNTIME raises it. fio_parser
+            # records the outcome as "Stop Reason".
+            local bench_runtime=$run_time
+            if [[ "$STEADY_STATE" == "true" ]]; then
+                bench_extra_space="${bench_extra_space} steadystate=${SS_CELL_CRITERION:-iops_slope:0.3%} steadystate_duration=${SS_CELL_DURATION:-30}"
+                bench_runtime=${SS_CELL_MAX_RUNTIME:-$run_time}
+            fi
+
             local bench_extra_flags=""
             bench_extra_space=$(echo "$bench_extra_space" | xargs)
             if [[ -n "$bench_extra_space" ]]; then
@@ -979,7 +1062,7 @@ function run_task(){
                 --block-size $bench_bs \\
                 --iodepth   $bench_iodepth \\
                 --numjobs   $bench_numjobs \\
-                --runtime   \"$run_time\" \\
+                --runtime   \"$bench_runtime\" \\
                 --engine    \"$bench_engine\" \\
                 --direct    \"$bench_direct\" \\
                 --rwmixread $bench_rwmix \\
@@ -995,7 +1078,7 @@ function run_task(){
                 --block-size $bench_bs \
                 --iodepth   $bench_iodepth \
                 --numjobs   $bench_numjobs \
-                --runtime   "$run_time" \
+                --runtime   "$bench_runtime" \
                 --engine    "$bench_engine" \
                 --direct    "$bench_direct" \
                 --rwmixread $bench_rwmix \
@@ -1076,6 +1159,154 @@ function run_task(){
 
 }
 
+# RESUME support. Finished work is marked under CHECKPOINT_DIR, next to
+# the partial results in .test-temp-data:
+#   cells/<cell>.done  one bench-fio cell (iteration) whose JSON landed
+#   runs/<run>.done    a whole bench.sh invocation, all cells checkpointed
+# With RESUME=true both are skipped, so an interrupted matrix continues
+# where it stopped.
+CHECKPOINT_DIR=${CHECKPOINT_DIR:-../results/.test-temp-data/${STAGING_KEY:+$STAGING_KEY/}$NVME_INFO-result/.checkpoints}
+CELLS_MISSED=0
+
+function checkpoint_suffix() {
+    # Per-device PD invocations share OUTPUT_NAME; tell them apart.
+    if [[ "$DEV_NAME" == "PD" && "$RUN_PD_ALL" != "true" ]]; then
+        echo "-${PD_NAME}"
+    fi
+}
+
+function cell_checkpoint() {
+    echo "${CHECKPOINT_DIR}/cells/$1$(checkpoint_suffix).done"
+}
+
+function run_checkpoint() {
+    echo "${CHECKPOINT_DIR}/runs/${OUTPUT_NAME}-${STAS}-QD${IODEPTH}$(checkpoint_suffix).done"
+}
+
+function mark_checkpoint() {
+    mkdir -p "$(dirname "$1")"
+    echo "finished=$(date '+%Y-%m-%d %H:%M:%S') stage=${STAG} dev=${DEV_NAME} raid=${RAID_MODE} status=${STAS}" > "$1"
+}
+
+# Run one bench-fio cell (mode, block size, queue depth, numjobs), repeated
+# ITERATIONS times.
+function run_benchfio_cell() {
+    local mode=$1
+    local bs=$2
+    local qd=$3
+    local job=$4
+
+    # Temporarily limit globals so run_task generates a single FIO command for bench-fio
+    # Must use array syntax to overwrite the entire array instead of just index 0
+    FIO_MODES=("$mode")
+    FIO_BLOCK_SIZES=("$bs")
+    FIO_IODEPTH=("$qd")
+    FIO_NUMJOBS=("$job")
+
+    # CPU Allowing mechanism mirroring the legacy loops
+    cpu_seq=""
+    cpu_lst_node=$(cat /sys/devices/system/node/online | awk -F'-' '{print $NF}')
+    for node in $(seq 0 $cpu_lst_node); do
+        cpu_list=$(find_cpu_list_by_numa_node $node)
+        cpu_value=($(cut_cpu_list $cpu_list))
+        cpu_node_start_loc="${cpu_value[0]}"
+        cpu_seq=$cpu_seq,"$cpu_node_start_loc-$(($cpu_node_start_loc+$job-1))"
+    done
+    
+    if [[ "$job" -eq 1 ]]; then
+        CPU_ALLOWED=0
+    elif [[ "$job" -ge "$cpus_counts" ]]; then
+        CPU_ALLOWED=$CPU_ALLOWED_SEQ
+    else
+        CPU_ALLOWED=${cpu_seq:1}
+    fi
+
+    local benchmark_id="${mode}_${bs}_qd${qd}_${job}J"
+
+    # ITERATIONS > 1 repeats the cell. Iteration 1 keeps the usual
+    # layout; repeats go to hidden .iterN dirs that fio_parser folds
+    # back into per-cell statistics.
+    for iter in $(seq 1 ${ITERATIONS:-1}); do
+        local iter_dir=$fio_dir
+        local iter_suffix=""
+        if [[ $iter -gt 1 ]]; then
+            iter_dir="${fio_dir}/.iter${iter}"
+            iter_suffix="-iter${iter}"
+            mkdir -p $iter_dir
+        fi
+        local OUTPUT_NAME_NEW="${OUTPUT_NAME}-${benchmark_id}-${STAS}${iter_suffix}"
+        local checkpoint=$(cell_checkpoint "$OUTPUT_NAME_NEW")
+        if [[ "$RESUME" == "true" && -f "$checkpoint" ]]; then
+            log_info "RESUME: skipping completed cell $OUTPUT_NAME_NEW"
+            continue
+        fi
+        local cell_stamp=$(mktemp)
+
+        if [[ ${ITERATIONS:-1} -gt 1 ]]; then
+            log_info "STATUS: WORKLOAD: $benchmark_id (iteration $iter/${ITERATIONS})"
+        else
+            log_info "STATUS: WORKLOAD: $benchmark_id"
+        fi
+        update_progress
+
+        collect_log $OUTPUT_NAME_NEW $iter_dir
+
+        # Call run_task to encapsulate all the monitor/snapshot behavior per 30s workload
+        run_task "bench_fio" $FIO_NAME $RUNTIME $job $CPU_ALLOWED $iter_dir $OUTPUT_NAME_NEW $qd
+
+        # Checkpoint only once bench-fio's JSON for this cell has landed.
+        if [[ -n $(find "$iter_dir" -path "*/${bs}/${mode}-${qd}-${job}.json" -newer "$cell_stamp" -size +0 -print -quit 2>/dev/null) ]]; then
+            mark_checkpoint "$checkpoint"
+            # Refresh the CSVs so the partial results are readable mid-run.
+            python3 src/fio_parser.py --cells "$fio_dir" >/dev/null 2>&1 \
+                || log_info "WARNING: fio_parser could not refresh the CSVs in $fio_dir"
+            log_info "STATUS: CELL_DONE: $OUTPUT_NAME_NEW output_dir=\"$fio_dir\""
+        else
+            CELLS_MISSED=$((CELLS_MISSED + 1))
+            log_info "No result file for $OUTPUT_NAME_NEW; cell not checkpointed"
+        fi
+        rm -f "$cell_stamp"
+
+        if [[ $WCD == "true" ]]; then
+            wait_for_low_cpu_temp
+        fi
+    done
+}
+
+# ADAPTIVE_SWEEP: instead of every FIO_IODEPTH value, let
+# src/adaptive_sweep.py pick queue depths between ADAPTIVE_QD_MIN and
+# ADAPTIVE_QD_MAX (default: smallest/largest FIO_IODEPTH) until the IOPS/latency knee is bracketed, or until
+# ADAPTIVE_BUDGET seconds have been spent on this (mode, bs, numjobs).
+function run_adaptive_qd_sweep() {
+    local mode=$1
+    local bs=$2
+    local job=$3
+    local qd_sorted=($(printf '%s\n' "${G_QD[@]}" | sort -n))
+    local qd_min=${ADAPTIVE_QD_MIN:-${qd_sorted[0]}}
+    local qd_max=${ADAPTIVE_QD_MAX:-${qd_sorted[-1]}}
+    local sweep_args="$fio_dir $mode $bs $job --qd-min $qd_min --qd-max $qd_max --gain-pct ${ADAPTIVE_GAIN_PCT:-10}"
+    local budget=${ADAPTIVE_BUDGET:-0}
+    local sweep_start=$(date +%s)
+    local answer
+    # QDs run so far; adaptive_sweep.py stops with reason=error if it asks
+    # for one again (the cell left no JSON), instead of looping on it.
+    local attempted=()
+
+    while true; do
+        answer=$(python3 src/adaptive_sweep.py $sweep_args --attempted "$(IFS=,; echo "${attempted[*]}")")
+        if [[ "$answer" != NEXT* ]]; then
+            break
+        fi
+        if (( budget > 0 && $(date +%s) - sweep_start + RUNTIME > budget )); then
+            answer=$(python3 src/adaptive_sweep.py $sweep_args --finish budget)
+            break
+        fi
+        attempted+=("${answer#NEXT }")
+        run_benchfio_cell $mode $bs ${answer#NEXT } $job
+    done
+    log_info "adaptive sweep ${mode}_${bs}_${job}J: ${answer:-no answer from adaptive_sweep.py}"
+}
+
 function run_benchfio_matrix() {
     fio_dir=${out_dir}/${STAS}
     get_cpu_count
@@ -1110,52 +1341,23 @@ function run_benchfio_matrix() {
 
     for mode in "${bench_modes_arr[@]}"; do
         for bs in "${bench_bs_arr[@]}"; do
-            for qd in "${bench_qd_arr[@]}"; do
+            if [[ "$ADAPTIVE_SWEEP" == "true" ]]; then
                 for job in "${bench_jobs_arr[@]}"; do
                     # Smart evaluation of MAX directly into physical core counts
                     if [[ "${job^^}" == "MAX" ]]; then
                         job="$cpus_counts"
                     fi
-
-                    # Temporarily limit globals so run_task generates a single FIO command for bench-fio
-                    # Must use array syntax to overwrite the entire array instead of just index 0
-                    FIO_MODES=("$mode")
-                    FIO_BLOCK_SIZES=("$bs")
-                    FIO_IODEPTH=("$qd")
-                    FIO_NUMJOBS=("$job")
-
-                    # CPU Allowing mechanism mirroring the legacy loops
-                    cpu_seq=""
-                    cpu_lst_node=$(cat /sys/devices/system/node/online | awk -F'-' '{print $NF}')
-                    for node in $(seq 0 $cpu_lst_node); do
-                        cpu_list=$(find_cpu_list_by_numa_node $node)
-                        cpu_value=($(cut_cpu_list $cpu_list))
-                        cpu_node_start_loc="${cpu_value[0]}"
-                        cpu_seq=$cpu_seq,"$cpu_node_start_loc-$(($cpu_node_start_loc+$job-1))"
-                    done
-                    
-                    if [[ "$job" -eq 1 ]]; then
-                        CPU_ALLOWED=0
-                    elif [[ "$job" -ge "$cpus_counts" ]]; then
-                        CPU_ALLOWED=$CPU_ALLOWED_SEQ
-                    else
-                        CPU_ALLOWED=${cpu_seq:1}
-                    fi
-
-                    local benchmark_id="${mode}_${bs}_qd${qd}_${job}J"
-                    local OUTPUT_NAME_NEW="${OUTPUT_NAME}-${benchmark_id}-${STAS}"
-
-                    log_info "STATUS: WORKLOAD: $benchmark_id"
-                    update_progress
-                    
-                    collect_log $OUTPUT_NAME_NEW $fio_dir
-                    
-                    # Call run_task to encapsulate all the monitor/snapshot behavior per 30s workload
-                    run_task "bench_fio" $FIO_NAME $RUNTIME $job $CPU_ALLOWED $fio_dir $OUTPUT_NAME_NEW $qd
-
-                    if [[ $WCD == "true" ]]; then
-                        wait_for_low_cpu_temp
+                    run_adaptive_qd_sweep $mode $bs $job
+                done
+                continue
+            fi
+            for qd in "${bench_qd_arr[@]}"; do
+                for job in "${bench_jobs_arr[@]}"; do
+                    # Smart evaluation of MAX directly into physical core counts
+                    if [[ "${job^^}" == "MAX" ]]; then
+                        job="$cpus_counts"
                     fi
+                    run_benchfio_cell $mode $bs $qd $job
                 done
             done
         done
@@ -1651,11 +1853,19 @@ function update_progress() {
 detect_dev
 
 output_name_dic
+if [[ "$RESUME" == "true" && -f "$(run_checkpoint)" ]]; then
+    log_info "RESUME: skipping completed ${OUTPUT_NAME}-${STAS}"
+    trap - INT TERM EXIT
+    exit 0
+fi
 discard_dev
 create_vd
 get_disk_size
 list_file
 graid_bench
+if [[ $CELLS_MISSED -eq 0 ]]; then
+    mark_checkpoint "$(run_checkpoint)"
+fi
 
 
 
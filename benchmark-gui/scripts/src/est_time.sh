@@ -52,7 +52,7 @@ get_disk_size() {
 if [ -f "graid-bench-advanced.conf" ]; then
     . ./graid-bench-advanced.conf
 fi
-. ./graid-bench.conf
+. "${GRAID_BENCH_CONF:-./graid-bench.conf}"
 
 # Define counts based on the configuration arrays
 NVME_COUNT=${#NVME_LIST[@]} 
@@ -123,7 +123,7 @@ if [[ "${USE_BENCH_FIO:-true}" == "true" ]]; then
     B_CNT=$(( ${#FIO_BLOCK_SIZES[@]} > 0 ? ${#FIO_BLOCK_SIZES[@]} : 1 ))
     Q_CNT=$(( ${#FIO_IODEPTH[@]} > 0 ? ${#FIO_IODEPTH[@]} : 1 ))
     J_CNT=$(( ${#FIO_NUMJOBS[@]} > 0 ? ${#FIO_NUMJOBS[@]} : 1 ))
-    TOTAL_BENCHMARKS=$(( M_CNT * B_CNT * Q_CNT * J_CNT ))
+    TOTAL_BENCHMARKS=$(( M_CNT * B_CNT * Q_CNT * J_CNT * ${ITERATIONS:-1} ))
     
     # 1. PD Test Phase
     if [[ "$PD_RUN" == 1 ]]; then
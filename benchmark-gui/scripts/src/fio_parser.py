@@ -1030,6 +1030,22 @@ def parse_bench_fio_json(json_path):
             read_lat_sd  += (r_lat.get("stddev", 0.0) / 1000.0) / num_jobs
             write_lat_sd += (w_lat.get("stddev", 0.0) / 1000.0) / num_jobs
 
+    # clat percentiles (usec) for the dominant direction, averaged across jobs.
+    # Mirrors the legacy text parser's '1.00th'..'99.99th' columns.
+    direction = "write" if write_iops_k > read_iops_k else "read"
+    pct_sums = {}
+    pct_counts = {}
+    for job in jobs:
+        pct = job.get(direction, {}).get("clat_ns", {}).get("percentile", {}) or {}
+        for key, value in pct.items():
+            try:
+                label = f"{float(key):.2f}th"
+                pct_sums[label] = pct_sums.get(label, 0.0) + float(value) / 1000.0
+                pct_counts[label] = pct_counts.get(label, 0) + 1
+            except (TypeError, ValueError):
+                continue
+    percentiles = {k: round(pct_sums[k] / pct_counts[k], 2) for k in pct_sums}
+
     # Extract CPU usage from the first job if available (fio reports it per job or globally)
     usr_cpu = 0.0
     sys_cpu = 0.0
@@ -1037,6 +1053,17 @@ def parse_bench_fio_json(json_path):
         usr_cpu = jobs[0].get("usr_cpu", 0.0)
         sys_cpu = jobs[0].get("sys_cpu", 0.0)
 
+    # Why the run ended: fio reports a 'steadystate' block per job when the
+    # steadystate= option was set (STEADY_STATE=true in bench.sh).
+    ss_blocks = [job["steadystate"] for job in jobs if isinstance(job.get("steadystate"), dict)]
+    if not ss_blocks:
+        stop_reason = "runtime"
+    elif any(block.get("attained") for block in ss_blocks):
+        stop_reason = "steady_state"
+    else:
+        stop_reason = "runtime_cap"
+    runtime_s = max(job.get("job_runtime", 0) for job in jobs) / 1000.0
+
     # Normalise blocksize string to numeric KiB for the 'BlockSize' column.
     bs_numeric = 0.0
     bs_clean   = bs_str.strip().lower()
@@ -1071,15 +1098,81 @@ def parse_bench_fio_json(json_path):
         "User CPU":               round(usr_cpu, 2),
         "System CPU":             round(sys_cpu, 2),
         "Idle CPU":               "0.00",
+        "Stop Reason":            stop_reason,
+        "Runtime (s)":            round(runtime_s, 2),
+        "percentiles":            percentiles,
     }
 
 
+# Two-sided 95% Student-t critical values by degrees of freedom; above 30
+# the normal approximation (1.96) is close enough.
+T_CRITICAL_95 = {
+    1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365,
+    8: 2.306, 9: 2.262, 10: 2.228, 11: 2.201, 12: 2.179, 13: 2.160, 14: 2.145,
+    15: 2.131, 16: 2.120, 17: 2.110, 18: 2.101, 19: 2.093, 20: 2.086,
+    21: 2.080, 22: 2.074, 23: 2.069, 24: 2.064, 25: 2.060, 26: 2.056,
+    27: 2.052, 28: 2.048, 29: 2.045, 30: 2.042,
+}
+
+# Columns that get mean/stddev/min/max/CI95 companions when ITERATIONS > 1.
+ITERATION_STAT_COLUMNS = [
+    "Bandwidth (GB/s)", "IOPS(K)", "Read Latency (us)", "Write Latency (us)",
+]
+
+ITERATION_DIR_RE = re.compile(r"^\.iter(\d+)$")
+
+
+def iteration_stats(values):
+    """Return (mean, stddev, min, max, ci95 half-width) of *values*.
+
+    stddev is the sample standard deviation; with a single value the
+    spread columns are 0.
+    """
+    n = len(values)
+    mean = sum(values) / n
+    if n < 2:
+        return mean, 0.0, mean, mean, 0.0
+    stddev = (sum((v - mean) ** 2 for v in values) / (n - 1)) ** 0.5
+    t = T_CRITICAL_95.get(n - 1, 1.96)
+    return mean, stddev, min(values), max(values), t * stddev / n ** 0.5
+
+
+def find_iteration_roots(bench_fio_root):
+    """Return [(iteration, root)] for a bench-fio output dir.
+
+    With ITERATIONS > 1 bench.sh writes repeat N of a cell to a hidden
+    `.iterN` dir next to the first run's output, so the repeat of
+    <stage>/<device> lives at <stage>/.iterN/<device>. Repeats placed
+    directly inside *bench_fio_root* are picked up as well.
+    """
+    bench_fio_root = Path(bench_fio_root)
+    roots = [(1, bench_fio_root)]
+    candidates = []
+    for parent in (bench_fio_root.parent, bench_fio_root):
+        if not parent.is_dir():
+            continue
+        for d in parent.iterdir():
+            m = ITERATION_DIR_RE.match(d.name)
+            if not m or not d.is_dir():
+                continue
+            target = d / bench_fio_root.name if parent == bench_fio_root.parent else d
+            if target.is_dir():
+                candidates.append((int(m.group(1)), target))
+    roots.extend(sorted(candidates))
+    return roots
+
+
 def collect_bench_fio_results(bench_fio_root, output_prefix, result_dir):
     """Walk a bench-fio output directory tree and emit a summary CSV.
 
     bench-fio tree layout:
         <bench_fio_root>/<mode>/<blocksize>/iodepth_<qd>_numjobs_<nj>.json
 
+    When the run was repeated (ITERATIONS > 1, see find_iteration_roots),
+    each row averages the cell's iterations and carries an `Iterations`
+    count plus `<metric> mean/stddev/min/max/CI95` columns for the
+    ITERATION_STAT_COLUMNS metrics.
+
     Parameters
     ----------
     bench_fio_root : str | Path
@@ -1186,61 +1279,47 @@ def collect_bench_fio_results(bench_fio_root, output_prefix, result_dir):
         raid_type = "BASELINE"
 
     rows = []
-    # Recursively find all JSON files. 
+    # Recursively find all JSON files, grouped per cell (path relative to
+    # its iteration root) so repeats of the same cell end up together.
     # Use a set to avoid processing the same file multiple times if overlapping rglob calls occur.
-    json_files = sorted(set(bench_fio_root.rglob("*.json")))
-    if not json_files:
+    iteration_roots = find_iteration_roots(bench_fio_root)
+    cells = {}
+    for _, root in iteration_roots:
+        for jf in sorted(set(root.rglob("*.json"))):
+            rel = jf.relative_to(root)
+            if any(ITERATION_DIR_RE.match(part) for part in rel.parts):
+                continue
+            cells.setdefault(rel, []).append(jf)
+    if not cells:
         print(f"collect_bench_fio_results: no JSON files found under {bench_fio_root}")
         return None
-
-    for jf in json_files:
-        metrics = parse_bench_fio_json(jf)
-        if metrics is None:
+    repeated = any(len(files) > 1 for files in cells.values())
+
+    for rel in sorted(cells):
+        iteration_rows = []
+        for jf in cells[rel]:
+            row = _bench_fio_row(jf, model, controller, device, stage, write_cache,
+                                 tasks_number, raid_type, pd_count)
+            if row is not None:
+                iteration_rows.append(row)
+        if not iteration_rows:
             continue
-
-        total_bw_gbs  = metrics["BW(read)-GB/s"]  + metrics["BW(write)-GB/s"]
-        total_bw_gibs = metrics["BW(read)-GiB/s"] + metrics["BW(write)-GiB/s"]
-        total_iops_k  = metrics["IOPs(read)"]      + metrics["IOPs(write)"]
-        lat_us        = (metrics["lat_avg(read)[usec]"] or 0.0) + \
-                        (metrics["lat_avg(write)[usec]"] or 0.0)
-        lat_sd        = (metrics["lat_stdev(read)[usec]"] or 0.0) + \
-                        (metrics["lat_stdev(write)[usec]"] or 0.0)
-
-        row = {
-            # --- Metadata columns (match existing CSV schema) ---
-            "Model":               model,
-            "controller":          controller,
-            "fio-version":         metrics["fio-version"],
-            "SSD":                 device,
-            "Ben_type":            "bench-fio",
-            "Type":                metrics["Type"],
-            "RAID_status":         stage,
-            "WriteCache":          write_cache,
-            "Tasks_number":        tasks_number,
-            "RAID_type":           raid_type,
-            "PD_count":            pd_count,
-            "stage":               stage,
-            "Threads":             metrics["Threads"],
-            "BlockSize":           metrics["BlockSize"],
-            "Queue Depth":         metrics["Queue Depth"],
-            # --- Performance columns ---
-            "Bandwidth (GB/s)":    round(total_bw_gbs,  4),
-            "IOPS(K)":             round(total_iops_k,  2),
-            "Read Latency (us)":   round(metrics["lat_avg(read)[usec]"],  2),
-            "Write Latency (us)":  round(metrics["lat_avg(write)[usec]"], 2),
-            "System CPU":          metrics["System CPU"],
-            "User CPU":            metrics["User CPU"],
-            "Idle CPU":            metrics["Idle CPU"],
-            "Bandwidth (GiB/s)":   round(total_bw_gibs, 4),
-            # Percentile columns (not available from bench-fio; fill with 0)
-            **{col: 0.0 for col in [
-                "1.00th","5.00th","10.00th","20.00th","30.00th","40.00th",
-                "50.00th","60.00th","70.00th","80.00th","90.00th","95.00th",
-                "99.00th","99.50th","99.90th","99.95th","99.99th",
-            ]},
-            # Extra raw columns for downstream compatibility
-            "filename":            str(jf),
-        }
+        row = dict(iteration_rows[0])
+        if len(iteration_rows) > 1:
+            # Every numeric column reports the mean across iterations.
+            for col, value in iteration_rows[0].items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool) and col not in (
+                        "Threads", "BlockSize", "Queue Depth"):
+                    row[col] = round(sum(r[col] for r in iteration_rows) / len(iteration_rows), 4)
+        if repeated:
+            row["Iterations"] = len(iteration_rows)
+            for col in ITERATION_STAT_COLUMNS:
+                mean, stddev, lo, hi, ci95 = iteration_stats([r[col] for r in iteration_rows])
+                row[f"{col} mean"] = round(mean, 4)
+                row[f"{col} stddev"] = round(stddev, 4)
+                row[f"{col} min"] = round(lo, 4)
+                row[f"{col} max"] = round(hi, 4)
+                row[f"{col} CI95"] = round(ci95, 4)
         rows.append(row)
 
     if not rows:
@@ -1254,6 +1333,61 @@ def collect_bench_fio_results(bench_fio_root, output_prefix, result_dir):
     return out
 
 
+def _bench_fio_row(jf, model, controller, device, stage, write_cache,
+                   tasks_number, raid_type, pd_count):
+    """Build one summary CSV row from a bench-fio JSON file (None if unreadable)."""
+    metrics = parse_bench_fio_json(jf)
+    if metrics is None:
+        return None
+
+    total_bw_gbs  = metrics["BW(read)-GB/s"]  + metrics["BW(write)-GB/s"]
+    total_bw_gibs = metrics["BW(read)-GiB/s"] + metrics["BW(write)-GiB/s"]
+    total_iops_k  = metrics["IOPs(read)"]      + metrics["IOPs(write)"]
+    lat_us        = (metrics["lat_avg(read)[usec]"] or 0.0) + \
+                    (metrics["lat_avg(write)[usec]"] or 0.0)
+    lat_sd        = (metrics["lat_stdev(read)[usec]"] or 0.0) + \
+                    (metrics["lat_stdev(write)[usec]"] or 0.0)
+
+    row = {
+        # --- Metadata columns (match existing CSV schema) ---
+        "Model":               model,
+        "controller":          controller,
+        "fio-version":         metrics["fio-version"],
+        "SSD":                 device,
+        "Ben_type":            "bench-fio",
+        "Type":                metrics["Type"],
+        "RAID_status":         stage,
+        "WriteCache":          write_cache,
+        "Tasks_number":        tasks_number,
+        "RAID_type":           raid_type,
+        "PD_count":            pd_count,
+        "stage":               stage,
+        "Threads":             metrics["Threads"],
+        "BlockSize":           metrics["BlockSize"],
+        "Queue Depth":         metrics["Queue Depth"],
+        # --- Performance columns ---
+        "Bandwidth (GB/s)":    round(total_bw_gbs,  4),
+        "IOPS(K)":             round(total_iops_k,  2),
+        "Read Latency (us)":   round(metrics["lat_avg(read)[usec]"],  2),
+        "Write Latency (us)":  round(metrics["lat_avg(write)[usec]"], 2),
+        "System CPU":          metrics["System CPU"],
+        "User CPU":            metrics["User CPU"],
+        "Idle CPU":            metrics["Idle CPU"],
+        "Bandwidth (GiB/s)":   round(total_bw_gibs, 4),
+        "Stop Reason":         metrics["Stop Reason"],
+        "Runtime (s)":         metrics["Runtime (s)"],
+        # Percentile columns (clat, usec); 0 when fio did not report them
+        **{col: metrics["percentiles"].get(col, 0.0) for col in [
+            "1.00th","5.00th","10.00th","20.00th","30.00th","40.00th",
+            "50.00th","60.00th","70.00th","80.00th","90.00th","95.00th",
+            "99.00th","99.50th","99.90th","99.95th","99.99th",
+        ]},
+        # Extra raw columns for downstream compatibility
+        "filename":            str(jf),
+    }
+    return row
+
+
 def is_bench_fio_output(path):
     """Return True if *path* looks like it contains bench-fio output.
     Now more inclusive: checks for any .json file with a 'fio version' key.
@@ -1284,10 +1418,45 @@ def is_bench_fio_output(path):
     return False
 
 
+def find_bench_fio_roots(parse_file):
+    """Return the shallowest bench-fio output directories under *parse_file*,
+    so each gets one consolidated report."""
+    all_potential = []
+    for entry in Path(parse_file).rglob("*"):
+        if entry.is_dir() and is_bench_fio_output(entry):
+            all_potential.append(entry)
+
+    # Filter: if A is parent of B, keep only A.
+    all_potential.sort(key=lambda p: len(p.parts))
+    roots = []
+    for p in all_potential:
+        if not any(p.name == r.name or str(p).startswith(str(r) + "/") for r in roots):
+            roots.append(p)
+    return roots
+
+
+def convert_bench_fio_roots(roots):
+    """Write the summary CSV of each bench-fio root into its sibling
+    `result` dir; returns how many were converted."""
+    for entry in roots:
+        # Derive a clean prefix from the directory name.
+        collect_bench_fio_results(entry, entry.name, entry.parent / "result")
+    return len(roots)
+
+
 if __name__ == '__main__':
 
+    if len(sys.argv) == 3 and sys.argv[1] == "--cells":
+        # bench.sh calls this after every finished cell so the partial
+        # results carry CSVs while the run goes on. The CSVs are rewritten
+        # in place; the end-of-run pass below replaces them wholesale.
+        converted = convert_bench_fio_roots(find_bench_fio_roots(sys.argv[2]))
+        print(f"fio_parser: refreshed {converted} bench-fio CSV(s) in {sys.argv[2]}.")
+        sys.exit(0)
+
     if len(sys.argv) < 2 or len(sys.argv) > 3:
         print("Usage: python3 fio_parser.py <path_to_fio_logs> [bench_fio_output_prefix]")
+        print("       python3 fio_parser.py --cells <bench_fio_output_dir>")
         sys.exit(1)
 
     parse_file = sys.argv[1]
@@ -1300,26 +1469,7 @@ if __name__ == '__main__':
     
     # --- Auto-detect bench-fio output directories inside the result tree ---
     # We walk the whole result tree and convert any bench-fio directories we find.
-    # We want to pick the SHALLOWEST directories to get consolidated reports.
-    bench_fio_dirs_converted = 0
-    all_potential = []
-    for entry in Path(parse_file).rglob("*"):
-        if entry.is_dir() and is_bench_fio_output(entry):
-            all_potential.append(entry)
-            
-    # Filter: if A is parent of B, keep only A.
-    all_potential.sort(key=lambda p: len(p.parts))
-    roots = []
-    for p in all_potential:
-        if not any(p.name == r.name or str(p).startswith(str(r) + "/") for r in roots):
-            roots.append(p)
-            
-    for entry in roots:
-        # Derive a clean prefix from the directory name.
-        prefix = entry.name
-        result_subdir = entry.parent / "result"
-        collect_bench_fio_results(entry, prefix, result_subdir)
-        bench_fio_dirs_converted += 1
+    bench_fio_dirs_converted = convert_bench_fio_roots(find_bench_fio_roots(parse_file))
 
     if bench_fio_dirs_converted:
         print(f"fio_parser: converted {bench_fio_dirs_converted} bench-fio output dir(s) to CSV.")
@@ -0,0 +1,189 @@
+"""Steady-state controller for long fio runs (SNIA PTS style).
+
+bench.sh starts fio with `--output-format=normal,json --status-interval=N`,
+so fio appends one cumulative report in both formats every N seconds to a
+.fiostatus file, and then runs this script next to it:
+
+    python3 src/steady_state.py <status_file> <fio_pid> --text-log <log> [options]
+
+Each report is turned into one measurement round: the IOPS of the interval,
+computed from the delta of total_ios over the delta of elapsed time. Over a
+rolling window of the last `--window` rounds, steady state is reached when
+both SNIA PTS criteria hold:
+
+  - range: max - min of the window is within `--range-pct` % of its mean
+  - slope: the excursion of the least-squares line across the window
+           (|slope| * (window - 1)) is within `--slope-pct` % of the mean
+
+On success fio is sent SIGINT, which ends the job and still writes the
+final report. If fio exits first, its --runtime (the cap) was reached.
+Either way the stop reason and the rounds are written to
+<status_file minus .fiostatus>-steady-state.json and printed as a
+`STEADY_STATE:` line for the log. Once fio has exited, the plain-text
+reports are copied out of the status file into `--text-log`, so the sustain
+log reads as it does without steady-state control.
+"""
+
+import argparse
+import json
+import os
+import signal
+import sys
+import time
+from pathlib import Path
+
+REASON_STEADY = "steady_state"
+REASON_CAP = "runtime_cap"
+
+
+def _split_reports(text):
+    """Yield (start, end, report) for each complete JSON report in *text*;
+    the plain-text reports around them and a half-written last one are
+    skipped."""
+    decoder = json.JSONDecoder()
+    pos = 0
+    while True:
+        start = text.find("{", pos)
+        if start < 0:
+            return
+        try:
+            report, end = decoder.raw_decode(text, start)
+        except ValueError:
+            pos = start + 1
+            continue
+        pos = end
+        if isinstance(report, dict) and report.get("jobs"):
+            yield start, end, report
+
+
+def read_reports(status_file):
+    """Return every complete JSON report in *status_file* (the last one may
+    still be half written)."""
+    try:
+        text = Path(status_file).read_text(errors="replace")
+    except OSError:
+        return []
+    return [report for _, _, report in _split_reports(text)]
+
+
+def text_reports(status_file):
+    """Return *status_file* with the JSON reports cut out: fio's normal
+    output."""
+    try:
+        text = Path(status_file).read_text(errors="replace")
+    except OSError:
+        return ""
+    pieces = []
+    last = 0
+    for start, end, _ in _split_reports(text):
+        pieces.append(text[last:start])
+        last = end
+    pieces.append(text[last:])
+    return "".join(piece.strip("\n") + "\n" for piece in pieces if piece.strip())
+
+
+def interval_iops(reports):
+    """Return [(elapsed_s, iops)] for each interval between reports."""
+    rounds = []
+    previous = (0, 0)
+    for report in reports:
+        jobs = report["jobs"]
+        elapsed = max(job.get("elapsed", 0) for job in jobs)
+        total_ios = sum(
+            job.get(direction, {}).get("total_ios", 0)
+            for job in jobs for direction in ("read", "write")
+        )
+        if elapsed <= previous[0]:
+            continue
+        rounds.append((elapsed, (total_ios - previous[1]) / (elapsed - previous[0])))
+        previous = (elapsed, total_ios)
+    return rounds
+
+
+def check_window(values, range_pct, slope_pct):
+    """Return (attained, stats) for a measurement window of IOPS values."""
+    n = len(values)
+    mean = sum(values) / n
+    x_mean = (n - 1) / 2
+    denom = sum((x - x_mean) ** 2 for x in range(n)) or 1
+    slope = sum((x - x_mean) * (v - mean) for x, v in enumerate(values)) / denom
+    value_range = max(values) - min(values)
+    excursion = abs(slope) * (n - 1)
+    stats = {
+        "mean_iops": round(mean, 2),
+        "range_pct": round(value_range / mean * 100, 2) if mean else None,
+        "slope_excursion_pct": round(excursion / mean * 100, 2) if mean else None,
+    }
+    attained = bool(mean) and value_range <= mean * range_pct / 100 and excursion <= mean * slope_pct / 100
+    return attained, stats
+
+
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def watch(status_file, pid, window, range_pct, slope_pct, poll):
+    result = {"reason": REASON_CAP, "window": window, "range_limit_pct": range_pct,
+              "slope_limit_pct": slope_pct, "attained_at_s": None, "window_stats": None}
+    rounds = []
+    while pid_alive(pid):
+        rounds = interval_iops(read_reports(status_file))
+        if len(rounds) >= window:
+            attained, stats = check_window([iops for _, iops in rounds[-window:]], range_pct, slope_pct)
+            result["window_stats"] = stats
+            if attained:
+                result["reason"] = REASON_STEADY
+                result["attained_at_s"] = rounds[-1][0]
+                try:
+                    os.kill(pid, signal.SIGINT)
+                except ProcessLookupError:
+                    pass
+                break
+        time.sleep(poll)
+    if result["reason"] == REASON_CAP:
+        rounds = interval_iops(read_reports(status_file)) or rounds
+    result["rounds"] = [{"elapsed_s": elapsed, "iops": round(iops, 2)} for elapsed, iops in rounds]
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("status_file")
+    parser.add_argument("pid", type=int)
+    parser.add_argument("--window", type=int, default=5, help="rounds per measurement window")
+    parser.add_argument("--range-pct", type=float, default=20.0)
+    parser.add_argument("--slope-pct", type=float, default=10.0)
+    parser.add_argument("--poll", type=float, default=10.0, help="seconds between status file reads")
+    parser.add_argument("--text-log", help="write fio's plain-text reports here once it exits")
+    args = parser.parse_args(argv)
+
+    result = watch(args.status_file, args.pid, max(args.window, 2),
+                   args.range_pct, args.slope_pct, args.poll)
+    status_path = Path(args.status_file)
+    out = status_path.with_name(status_path.name.replace(".fiostatus", "") + "-steady-state.json")
+    try:
+        out.write_text(json.dumps(result, indent=2))
+    except OSError as exc:
+        print(f"steady_state: cannot write {out}: {exc}", file=sys.stderr)
+    attained_at = result["attained_at_s"]
+    print(f"STEADY_STATE: {result['reason']}"
+          + (f" after {attained_at}s" if attained_at is not None else "")
+          + f" ({len(result['rounds'])} rounds)", flush=True)
+    if args.text_log:
+        while pid_alive(args.pid):
+            time.sleep(1)
+        try:
+            Path(args.text_log).write_text(text_reports(args.status_file))
+        except OSError as exc:
+            print(f"steady_state: cannot write {args.text_log}: {exc}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())